@@ -0,0 +1,39 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+# Usage: python -m benchmarks.bench_cards [cards]
+import sys
+import time
+import asyncio
+from PIL import ImageFont
+from bot.helpers.cards import FONT_REGULAR, FONT_BOLD, render_card
+from bot.modules.token import render_crypto_card
+from bot.modules.time import render_clock_image
+
+PRICE_ARGS = ("BTCUSDT", "2.41%", "67012.10", "68110.00", "65502.33", "18233.1", "1221033912.5")
+CLOCK_ARGS = ("Bangladesh", "10:42 PM", "October 19, 2026", "Monday")
+
+def load_fonts():
+    for path, size in ((FONT_BOLD, 70), (FONT_REGULAR, 50), (FONT_REGULAR, 40)):
+        ImageFont.truetype(path, size)
+
+async def render_concurrently(count):
+    await asyncio.gather(*(
+        render_card(render_crypto_card, *PRICE_ARGS) if index % 2 else render_card(render_clock_image, *CLOCK_ARGS)
+        for index in range(count)
+    ))
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    func()
+    print(f"{label:<30} {(time.perf_counter() - start) / count * 1000:.2f} ms/card")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    timed("font load per card (old path)", count, lambda: [load_fonts() for _ in range(count)])
+    timed("price card, one thread", count, lambda: [render_crypto_card(*PRICE_ARGS) for _ in range(count)])
+    timed("clock card, one thread", count, lambda: [render_clock_image(*CLOCK_ARGS) for _ in range(count)])
+    timed("mixed cards, card executor", count, lambda: asyncio.run(render_concurrently(count)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+# Usage: python -m benchmarks.bench_logger [records]
+import logging
+import os
+import queue
+import sys
+import tempfile
+import time
+from logging.handlers import QueueListener, RotatingFileHandler
+from bot.helpers.logger import LOG_FORMAT, LOG_DATEFMT, SmartFormatter, JsonFormatter, SmartQueueHandler, ContextFilter, RateLimitFilter
+
+def file_handler(path, formatter):
+    handler = RotatingFileHandler(path, maxBytes=1 << 30, backupCount=1)
+    handler.setFormatter(formatter)
+    return handler
+
+def run(label, records, handler, listener=None):
+    logger = logging.getLogger(f"bench.{label}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    if listener:
+        listener.start()
+    start = time.perf_counter()
+    for index in range(records):
+        logger.info("processed request %d for chat %d", index, index % 97)
+    caller = time.perf_counter() - start
+    if listener:
+        listener.stop()
+    total = time.perf_counter() - start
+    logger.removeHandler(handler)
+    print(f"{label:<28} caller {caller / records * 1e6:7.2f} us/record, drained {total:.3f} s")
+
+def queued(path, formatter, *filters):
+    log_queue = queue.SimpleQueue()
+    handler = SmartQueueHandler(log_queue)
+    for log_filter in filters:
+        handler.addFilter(log_filter)
+    return handler, QueueListener(log_queue, file_handler(path, formatter), respect_handler_level=True)
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    text = SmartFormatter(LOG_FORMAT, LOG_DATEFMT)
+    with tempfile.TemporaryDirectory() as directory:
+        path = lambda name: os.path.join(directory, name)
+        print(f"{records} records")
+        run("direct file handler", records, file_handler(path("direct.txt"), text))
+        run("queued, text", records, *queued(path("text.txt"), text, ContextFilter()))
+        run("queued, json", records, *queued(path("json.txt"), JsonFormatter(), ContextFilter()))
+        run("queued, text, rate limit 20", records, *queued(path("limited.txt"), text, RateLimitFilter(20, 60), ContextFilter()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+# Usage: python -m benchmarks.bench_mpdf [files] [megabytes_per_file]
+import os
+import sys
+import time
+import tempfile
+from io import BytesIO
+from PIL import Image
+from pypdf import PdfReader, PdfWriter
+from reportlab import rl_config
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from bot.modules.mpdf import merge_pdfs_sync
+
+def build_pdf(path, target_bytes):
+    rl_config.useA85 = 0
+    pdf = canvas.Canvas(path, pagesize=(1200, 1600))
+    written = 0
+    while written < target_bytes:
+        buffer = BytesIO()
+        Image.effect_noise((1200, 1600), 30).convert("RGB").save(buffer, "JPEG", quality=70)
+        written += buffer.tell()
+        buffer.seek(0)
+        pdf.drawImage(ImageReader(buffer), 0, 0, width=1200, height=1600)
+        pdf.showPage()
+    pdf.save()
+
+def merge_pdfs_baseline(pdfs, output_path):
+    merger = PdfWriter()
+    for pdf in pdfs:
+        for page in PdfReader(pdf['path']).pages:
+            merger.add_page(page)
+    with open(output_path, "wb") as output_file:
+        merger.write(output_file)
+    merger.close()
+
+def main():
+    files, megabytes = (int(arg) for arg in (sys.argv[1:] + ["20", "50"][len(sys.argv[1:]):]))
+    with tempfile.TemporaryDirectory() as workdir:
+        pdfs = []
+        for index in range(files):
+            path = os.path.join(workdir, f"input_{index}.pdf")
+            build_pdf(path, megabytes * 1024 * 1024)
+            pdfs.append({'path': path, 'name': os.path.basename(path), 'pages': None})
+        size = sum(os.path.getsize(pdf['path']) for pdf in pdfs)
+        print(f"inputs: {files} files, {size / 1024 / 1024:.1f} MB total")
+        output = os.path.join(workdir, "merged.pdf")
+        start = time.perf_counter()
+        merge_pdfs_baseline(pdfs, output)
+        print(f"baseline add_page loop: {time.perf_counter() - start:.2f}s, {os.path.getsize(output) / 1024 / 1024:.1f} MB")
+        start = time.perf_counter()
+        total_pages = merge_pdfs_sync(pdfs, output)
+        print(f"merge_pdfs_sync:        {time.perf_counter() - start:.2f}s, {os.path.getsize(output) / 1024 / 1024:.1f} MB, {total_pages} pages")
+        for pdf in pdfs:
+            pdf['pages'] = "1-5"
+        start = time.perf_counter()
+        total_pages = merge_pdfs_sync(pdfs, output)
+        print(f"merge_pdfs_sync 1-5:    {time.perf_counter() - start:.2f}s, {total_pages} pages")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+# Usage: python -m benchmarks.bench_pdf [images] [scaling_pages]
+import os
+import sys
+import time
+import shutil
+import tempfile
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from PIL import Image, ImageDraw
+from pypdf import PdfReader, PdfWriter
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+from bot.modules.pdf import prepare_page, generate_pdf_sync, load_watermark_font, WATERMARK_FONT_SIZE
+
+SETTINGS = {"page_size": "a4", "dpi": 150, "fit_mode": "shrink", "cover_page": "minimal", "title": "Bench", "password": "secret"}
+
+def generate_pdf_baseline(data, images):
+    intermediate = 0
+    page_width, page_height = A4
+    dpi = data["dpi"]
+    fd, temp_path = tempfile.mkstemp(suffix='.pdf')
+    os.close(fd)
+    c = canvas.Canvas(temp_path, pagesize=(page_width, page_height))
+    for img_data in images:
+        img = Image.open(BytesIO(img_data))
+        if data.get("watermark"):
+            font = load_watermark_font.__wrapped__(WATERMARK_FONT_SIZE)
+            bbox = ImageDraw.Draw(img).textbbox((0, 0), data["watermark"], font=font)
+            watermark_img = Image.new('RGBA', (bbox[2] - bbox[0] + 40, bbox[3] - bbox[1] + 40), (255, 255, 255, 0))
+            ImageDraw.Draw(watermark_img).text((20, 20), data["watermark"], font=font, fill=(128, 128, 128, 128))
+            watermark_img = watermark_img.rotate(45, expand=True)
+            img = img.convert('RGBA')
+            img.paste(watermark_img, ((img.width - watermark_img.width) // 2, (img.height - watermark_img.height) // 2), watermark_img)
+            img = img.convert('RGB')
+        img_buffer = BytesIO()
+        img.save(img_buffer, format='JPEG', dpi=(dpi, dpi))
+        img_buffer.seek(0)
+        width, height = img.width * 72 / dpi, img.height * 72 / dpi
+        ratio = min(1, page_width / width, page_height / height)
+        c.drawImage(ImageReader(img_buffer), (page_width - width * ratio) / 2, (page_height - height * ratio) / 2, width=width * ratio, height=height * ratio)
+        c.showPage()
+    c.save()
+    intermediate += os.path.getsize(temp_path)
+    fd, cover_path = tempfile.mkstemp(suffix='.pdf')
+    os.close(fd)
+    cover_canvas = canvas.Canvas(cover_path, pagesize=(page_width, page_height))
+    cover_canvas.setFont("Helvetica-Bold", 48)
+    cover_canvas.drawString(100, page_height / 2, data["title"])
+    cover_canvas.setFont("Helvetica", 16)
+    cover_canvas.drawString(100, page_height / 2 - 60, datetime.now().strftime("%B %d, %Y"))
+    cover_canvas.save()
+    intermediate += os.path.getsize(cover_path)
+    fd, final_path = tempfile.mkstemp(suffix='.pdf')
+    os.close(fd)
+    writer = PdfWriter()
+    with open(cover_path, 'rb') as cover_file:
+        writer.add_page(PdfReader(cover_file).pages[0])
+    with open(temp_path, 'rb') as content_file:
+        for page in PdfReader(content_file).pages:
+            writer.add_page(page)
+    writer.encrypt(data["password"])
+    with open(final_path, 'wb') as output_file:
+        writer.write(output_file)
+    os.unlink(cover_path)
+    os.unlink(temp_path)
+    return final_path, intermediate
+
+def spool(workdir, sources):
+    spooled = []
+    for index, source in enumerate(sources):
+        path = os.path.join(workdir, f"spool_{index}.jpg")
+        shutil.copyfile(source, path)
+        spooled.append(path)
+    return spooled
+
+def run_current(workdir, sources, watermark):
+    spooled = spool(workdir, sources)
+    spooled_bytes = sum(os.path.getsize(path) for path in spooled)
+    wall, cpu = time.perf_counter(), time.process_time()
+    pages = [
+        prepare_page(path, os.path.join(workdir, f"page_{index}.jpg"), watermark, SETTINGS["dpi"])
+        for index, path in enumerate(spooled)
+    ]
+    intermediate = sum(os.path.getsize(page["path"]) for page in pages) if watermark else 0
+    output = generate_pdf_sync(dict(SETTINGS, watermark=watermark), pages)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    output_bytes = os.path.getsize(output)
+    os.remove(output)
+    return wall, cpu, spooled_bytes, intermediate, output_bytes
+
+def run_baseline(sources, watermark):
+    images = []
+    for source in sources:
+        with open(source, "rb") as file:
+            images.append(file.read())
+    wall, cpu = time.perf_counter(), time.process_time()
+    output, intermediate = generate_pdf_baseline(dict(SETTINGS, watermark=watermark), images)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    output_bytes = os.path.getsize(output)
+    os.remove(output)
+    return wall, cpu, 0, intermediate, output_bytes
+
+def run_scaling(workdir, sources, workers):
+    spooled = spool(workdir, sources)
+    pages = [os.path.join(workdir, f"page_{index}.jpg") for index in range(len(spooled))]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(abs, range(workers)))
+        start = time.perf_counter()
+        list(pool.map(prepare_page, spooled, pages, ["Smart Tool"] * len(spooled), [SETTINGS["dpi"]] * len(spooled)))
+        return time.perf_counter() - start
+
+def mb(size):
+    return f"{size / 1024 / 1024:.1f}"
+
+def make_sources(workdir, count):
+    sources = []
+    for index in range(count):
+        path = os.path.join(workdir, f"source_{index}.jpg")
+        Image.effect_noise((1280, 960), 40).convert("RGB").save(path, "JPEG", quality=85)
+        sources.append(path)
+    return sources
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    scaling_pages = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    with tempfile.TemporaryDirectory() as workdir:
+        sources = make_sources(workdir, max(count, scaling_pages))
+        print(f"inputs: {count} Telegram-style JPEGs at 1280x960, cover page and password set")
+        for label, watermark in (("no watermark", ""), ("watermark", "Smart Tool")):
+            for path_label, (wall, cpu, spooled, intermediate, output) in (
+                ("baseline", run_baseline(sources[:count], watermark)),
+                ("current", run_current(workdir, sources[:count], watermark))
+            ):
+                print(
+                    f"{label:<13} {path_label:<9} wall {wall:.2f}s, cpu {cpu:.2f}s, spooled {mb(spooled)} MB, "
+                    f"intermediate temp {mb(intermediate)} MB, output {mb(output)} MB"
+                )
+        print(f"\nprepare_page scaling: {scaling_pages} watermarked pages")
+        for workers in sorted({1, 2, 4, os.cpu_count() or 1}):
+            print(f"{workers:>3} workers  {run_scaling(workdir, sources[:scaling_pages], workers):.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+# Usage: python -m benchmarks.bench_rs_gif [frames] [width] [height]
+import os
+import sys
+import time
+import asyncio
+import resource
+import tempfile
+from PIL import Image, ImageDraw
+from bot.modules.rs import resize_gif
+
+def build_gif(path, frames, width, height):
+    images = []
+    for index in range(frames):
+        image = Image.new("RGB", (width, height), (index * 7 % 256, 40, 90))
+        ImageDraw.Draw(image).ellipse((index % width, 10, index % width + 80, 90), fill=(250, 200, 30))
+        images.append(image)
+    images[0].save(path, save_all=True, append_images=images[1:], duration=40, loop=0)
+
+def resize_gif_pil(input_path, output_path, width, height):
+    with Image.open(input_path) as img:
+        frames = []
+        for index in range(img.n_frames):
+            img.seek(index)
+            frames.append(img.copy().convert("RGBA").resize((width, height), Image.Resampling.LANCZOS))
+    frames[0].save(output_path, save_all=True, append_images=frames[1:], duration=40, loop=0, optimize=True)
+
+def peak_rss_mb(who):
+    return resource.getrusage(who).ru_maxrss / 1024
+
+def main():
+    frames, width, height = (int(arg) for arg in (sys.argv[1:] + ["300", "1280", "720"][len(sys.argv[1:]):]))
+    os.makedirs("./downloads", exist_ok=True)
+    with tempfile.TemporaryDirectory() as workdir:
+        source = os.path.join(workdir, "source.gif")
+        build_gif(source, frames, 640, 360)
+        print(f"source: {frames} frames, {os.path.getsize(source) / 1024:.0f} KB -> {width}x{height}")
+        start = time.perf_counter()
+        output = asyncio.run(resize_gif(source, width, height, 0))
+        print(f"ffmpeg two-pass: {time.perf_counter() - start:.2f}s, {os.path.getsize(output) / 1024:.0f} KB, ffmpeg peak RSS {peak_rss_mb(resource.RUSAGE_CHILDREN):.0f} MB")
+        os.remove(output)
+        start = time.perf_counter()
+        resize_gif_pil(source, os.path.join(workdir, "pil.gif"), width, height)
+        print(f"PIL frame list:  {time.perf_counter() - start:.2f}s, bot peak RSS {peak_rss_mb(resource.RUSAGE_SELF):.0f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+# Usage: python -m benchmarks.bench_style [length] [rounds]
+import sys
+import time
+from bot.modules.style import fonts, convert_text, get_keyboard, render_all_fonts
+
+def convert_text_baseline(text, font_data):
+    maps = {}
+    for key, first, count in (("fontLower", 97, 26), ("fontUpper", 65, 26), ("fontDigits", 48, 10)):
+        chars = font_data.get(key, "")
+        maps[key] = {chr(first + i): chars[i] for i in range(min(len(chars), count))}
+    result = []
+    for char in text:
+        if char.islower():
+            result.append(maps["fontLower"].get(char, char))
+        elif char.isupper():
+            result.append(maps["fontUpper"].get(char, char))
+        elif char.isdigit():
+            result.append(maps["fontDigits"].get(char, char))
+        else:
+            result.append(char)
+    return "".join(result)
+
+def timed(label, rounds, func):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    print(f"{label:<28} {(time.perf_counter() - start) / rounds * 1000:.3f} ms")
+
+def main():
+    length, rounds = (int(arg) for arg in (sys.argv[1:] + ["1000", "50"][len(sys.argv[1:]):]))
+    text = ("The Quick Brown Fox 123 " * (length // 24 + 1))[:length]
+    print(f"{len(fonts)} fonts, {length} chars, {rounds} rounds")
+    timed("baseline convert, all fonts", rounds, lambda: [convert_text_baseline(text, font) for font in fonts])
+    timed("table convert, all fonts", rounds, lambda: [convert_text(text, index) for index in range(len(fonts))])
+    timed("render_all_fonts", rounds, lambda: render_all_fonts(text))
+    timed("get_keyboard", rounds, lambda: get_keyboard(0))
+
+if __name__ == "__main__":
+    main()
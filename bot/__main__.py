@@ -1,12 +1,24 @@
 import asyncio
 import logging
 import os
+import sys
 from bot import SmartAIO, dp, SmartPyro, SmartUserBot
 from bot.core.database import SmartReboot
 from bot.helpers.logger import LOGGER
+from bot.helpers.market import smart_market
+from bot.helpers.watcher import smart_watcher
+from bot.helpers.graph import smart_graph
+from bot.helpers.mailbox import smart_mail
+from bot.helpers.utils import shutdown_process_pool
 from bot.misc.callback import handle_callback_query
 from importlib import import_module
 
+MODULE_SESSIONS = (
+    ("insta", "ig_downloader", "Instagram"),
+    ("sp", "smart_spotify", "Spotify"),
+    ("ss", "smart_screenshot", "screenshot")
+)
+
 async def main():
     try:
         modules_path = "bot.modules"
@@ -46,6 +58,16 @@ async def main():
         except Exception as e:
             LOGGER.warning(f"Could not clear webhook: {e}")
         
+        try:
+            await smart_watcher.start()
+        except Exception as e:
+            LOGGER.error(f"Failed to start price watcher: {e}")
+        
+        try:
+            await smart_mail.start()
+        except Exception as e:
+            LOGGER.error(f"Failed to start temp mail watcher: {e}")
+        
         await asyncio.sleep(1)
         
         await dp.start_polling(
@@ -75,6 +97,47 @@ async def cleanup():
     except Exception as e:
         LOGGER.error(f"Failed to stop SmartUserBot: {e}")
     
+    try:
+        await smart_watcher.stop()
+        LOGGER.info("Stopped price watcher")
+    except Exception as e:
+        LOGGER.error(f"Failed to stop price watcher: {e}")
+    
+    try:
+        await smart_mail.stop()
+        await smart_mail.close()
+        LOGGER.info("Stopped temp mail watcher")
+    except Exception as e:
+        LOGGER.error(f"Failed to stop temp mail watcher: {e}")
+    
+    try:
+        await smart_graph.close()
+        LOGGER.info("Closed Telegraph session")
+    except Exception as e:
+        LOGGER.error(f"Failed to close Telegraph session: {e}")
+    
+    try:
+        await smart_market.close()
+        LOGGER.info("Closed market data session")
+    except Exception as e:
+        LOGGER.error(f"Failed to close market data session: {e}")
+    
+    for module_name, client_name, label in MODULE_SESSIONS:
+        module = sys.modules.get(f"bot.modules.{module_name}")
+        if module is None:
+            continue
+        try:
+            await getattr(module, client_name).close()
+            LOGGER.info(f"Closed {label} session")
+        except Exception as e:
+            LOGGER.error(f"Failed to close {label} session: {e}")
+    
+    try:
+        shutdown_process_pool()
+        LOGGER.info("Stopped worker process pool")
+    except Exception as e:
+        LOGGER.error(f"Failed to stop worker process pool: {e}")
+    
     try:
         await SmartAIO.session.close()
         LOGGER.info("Closed SmartAIO session")
@@ -18,6 +18,9 @@ try:
     SmartGuards = db["SmartGuards"]
     SmartSecurity = db["SmartSecurity"]
     SmartReboot = db["SmartReboot"]
+    SmartAlerts = db["SmartAlerts"]
+    SmartTelegraph = db["SmartTelegraph"]
+    SmartSpotify = db["SmartSpotify"]
     LOGGER.info(f"Database Client Created Successfully!")
 except Exception as e:
     LOGGER.error(f"Database Client Create Error: {e}")
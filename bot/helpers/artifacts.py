@@ -0,0 +1,86 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+import hashlib
+from collections import OrderedDict
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile
+from bot.helpers.cards import render_card
+from bot.helpers.logger import LOGGER
+
+MAX_FILE_IDS = 4096
+MAX_CACHED_BYTES = 64 * 1024 * 1024
+
+def artifact_key(*parts):
+    return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+class SmartArtifacts:
+    def __init__(self, max_file_ids=MAX_FILE_IDS, max_bytes=MAX_CACHED_BYTES):
+        self.max_file_ids = max_file_ids
+        self.max_bytes = max_bytes
+        self.file_ids = OrderedDict()
+        self.blobs = OrderedDict()
+        self.blob_bytes = 0
+
+    def file_id(self, key):
+        file_id = self.file_ids.get(key)
+        if file_id is not None:
+            self.file_ids.move_to_end(key)
+        return file_id
+
+    def data(self, key):
+        data = self.blobs.get(key)
+        if data is not None:
+            self.blobs.move_to_end(key)
+        return data
+
+    def store(self, key, data):
+        if len(data) > self.max_bytes or key in self.blobs:
+            return
+        self.blobs[key] = data
+        self.blob_bytes += len(data)
+        while self.blob_bytes > self.max_bytes:
+            _, evicted = self.blobs.popitem(last=False)
+            self.blob_bytes -= len(evicted)
+
+    def remember(self, key, message):
+        if not message or not getattr(message, "photo", None):
+            return
+        self.file_ids[key] = message.photo[-1].file_id
+        self.file_ids.move_to_end(key)
+        while len(self.file_ids) > self.max_file_ids:
+            self.file_ids.popitem(last=False)
+        data = self.blobs.pop(key, None)
+        if data is not None:
+            self.blob_bytes -= len(data)
+
+    def forget(self, key):
+        self.file_ids.pop(key, None)
+        data = self.blobs.pop(key, None)
+        if data is not None:
+            self.blob_bytes -= len(data)
+
+    async def photo(self, key, filename, render, *args):
+        file_id = self.file_id(key)
+        if file_id is not None:
+            return file_id
+        data = self.data(key)
+        if data is None:
+            data = await render_card(render, *args)
+            self.store(key, data)
+        return BufferedInputFile(data, filename=filename)
+
+    async def deliver(self, key, filename, send, render, *args):
+        media = await self.photo(key, filename, render, *args)
+        try:
+            sent = await send(media)
+        except TelegramBadRequest as e:
+            if not isinstance(media, str):
+                raise
+            LOGGER.warning(f"Cached file_id for {filename} was rejected, re-uploading: {e}")
+            self.forget(key)
+            sent = await send(await self.photo(key, filename, render, *args))
+        self.remember(key, sent)
+        return sent
+
+smart_artifacts = SmartArtifacts()
@@ -0,0 +1,49 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from PIL import Image, ImageFont
+
+FONT_REGULAR = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+FONT_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
+
+executor = ThreadPoolExecutor(max_workers=4)
+font_cache = threading.local()
+
+def get_font(path, size):
+    fonts = getattr(font_cache, "fonts", None)
+    if fonts is None:
+        fonts = font_cache.fonts = {}
+    font = fonts.get((path, size))
+    if font is None:
+        try:
+            font = fonts[(path, size)] = ImageFont.truetype(path, size)
+        except IOError:
+            raise RuntimeError("Fonts not found. Please install DejaVu Sans or update font paths.")
+    return font
+
+def vertical_gradient(size, start, end):
+    width, height = size
+    column = Image.new("RGB", (1, height))
+    column.putdata([
+        tuple(int(start[i] + (end[i] - start[i]) * y / height) for i in range(3))
+        for y in range(height)
+    ])
+    return column.resize((width, height), Image.NEAREST)
+
+def encode_card(img):
+    buffer = BytesIO()
+    img.save(buffer, format="JPEG", quality=95, subsampling=0)
+    return buffer.getvalue()
+
+def encode_png(img):
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+async def render_card(render, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, render, *args)
@@ -0,0 +1,221 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+import os
+import base64
+import binascii
+import codecs
+import string
+import urllib.parse
+
+BLOCK_SIZE = 256 * 1024
+WHITESPACE = string.whitespace.encode()
+NOT_BASE64 = bytes(sorted(set(range(256)) - set((string.ascii_letters + string.digits + "+/=").encode())))
+ROT13_TABLE = bytes.maketrans(
+    (string.ascii_lowercase + string.ascii_uppercase).encode(),
+    (string.ascii_lowercase[13:] + string.ascii_lowercase[:13] + string.ascii_uppercase[13:] + string.ascii_uppercase[:13]).encode()
+)
+BINARY_TABLE = [format(value, "08b") for value in range(256)]
+OCTAL_TABLE = [format(value, "03o") for value in range(256)]
+UNICODE_TABLE = [f"U+{value:04X}" for value in range(256)]
+BINARY_LOOKUP = {code.encode(): chr(value) for value, code in enumerate(BINARY_TABLE)}
+OCTAL_LOOKUP = {code.encode(): chr(value) for value, code in enumerate(OCTAL_TABLE)}
+UNICODE_LOOKUP = {code.encode(): chr(value) for value, code in enumerate(UNICODE_TABLE)}
+
+class GroupCodec:
+    def __init__(self, convert, group=1, delete=None):
+        self.convert = convert
+        self.group = group
+        self.delete = delete
+        self.pending = b""
+
+    def usable(self, data):
+        return len(data) - len(data) % self.group
+
+    def feed(self, data):
+        if self.delete:
+            data = data.translate(None, self.delete)
+        data = self.pending + data
+        usable = self.usable(data)
+        self.pending = data[usable:]
+        return self.convert(data[:usable]) if usable else b""
+
+    def flush(self):
+        data, self.pending = self.pending, b""
+        return self.convert(data) if data else b""
+
+class Ascii85Decoder(GroupCodec):
+    def usable(self, data):
+        start = data.rfind(b"z") + 1
+        return start + (len(data) - start) // 5 * 5
+
+class UrlDecoder(GroupCodec):
+    def usable(self, data):
+        escape = data.rfind(b"%", max(len(data) - 2, 0))
+        return escape if escape >= 0 else len(data)
+
+class TextCodec:
+    def __init__(self, convert, separator=""):
+        self.convert = convert
+        self.separator = separator
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.started = False
+
+    def emit(self, text):
+        piece = self.convert(text) if text else ""
+        if not piece:
+            return b""
+        if self.started and self.separator:
+            piece = self.separator + piece
+        self.started = True
+        return piece.encode("utf-8")
+
+    def feed(self, data):
+        return self.emit(self.decoder.decode(data))
+
+    def flush(self):
+        return self.emit(self.decoder.decode(b"", final=True))
+
+class TokenCodec:
+    def __init__(self, convert):
+        self.convert = convert
+        self.pending = b""
+
+    def feed(self, data):
+        data = self.pending + data
+        cut = max(data.rfind(char) for char in WHITESPACE) + 1
+        self.pending = data[cut:]
+        return self.convert(data[:cut].split()).encode("utf-8")
+
+    def flush(self):
+        data, self.pending = self.pending, b""
+        return self.convert(data.split()).encode("utf-8")
+
+class Utf8Checked:
+    def __init__(self, codec, errors="strict"):
+        self.codec = codec
+        self.errors = errors
+        self.decoder = codecs.getincrementaldecoder("utf-8")(errors)
+
+    def check(self, data, final=False):
+        text = self.decoder.decode(data, final)
+        return text.encode("utf-8") if self.errors != "strict" else data
+
+    def feed(self, data):
+        return self.check(self.codec.feed(data))
+
+    def flush(self):
+        return self.check(self.codec.flush(), final=True)
+
+class TextCounter:
+    def __init__(self):
+        self.words = 0
+        self.characters = 0
+        self.sentences = 0
+        self.newlines = 0
+        self.in_word = False
+
+    def feed(self, text):
+        if not text:
+            return
+        self.words += len(text.split())
+        if self.in_word and not text[0].isspace():
+            self.words -= 1
+        self.in_word = not text[-1].isspace()
+        self.characters += len(text)
+        self.sentences += text.count(".") + text.count("!") + text.count("?")
+        self.newlines += text.count("\n")
+
+    def result(self):
+        return {
+            "words": self.words,
+            "characters": self.characters,
+            "sentences": self.sentences,
+            "paragraphs": self.newlines + 1
+        }
+
+def table_join(table, fallback):
+    def convert(text):
+        try:
+            return " ".join(map(table.__getitem__, text.encode("latin-1")))
+        except UnicodeEncodeError:
+            return " ".join(map(fallback, text))
+    return convert
+
+def token_join(lookup, fallback):
+    def convert(tokens):
+        try:
+            return "".join(map(lookup.__getitem__, tokens))
+        except KeyError:
+            return "".join(map(fallback, tokens))
+    return convert
+
+CODECS = {
+    "b64en": lambda: GroupCodec(lambda data: binascii.b2a_base64(data, newline=False), 3),
+    "b64de": lambda: Utf8Checked(GroupCodec(binascii.a2b_base64, 4, NOT_BASE64)),
+    "b32en": lambda: GroupCodec(base64.b32encode, 5),
+    "b32de": lambda: Utf8Checked(GroupCodec(base64.b32decode, 8, WHITESPACE)),
+    "b85en": lambda: GroupCodec(base64.b85encode, 4),
+    "b85de": lambda: Utf8Checked(GroupCodec(base64.b85decode, 5, WHITESPACE)),
+    "a85en": lambda: GroupCodec(base64.a85encode, 4),
+    "a85de": lambda: Utf8Checked(Ascii85Decoder(base64.a85decode, 5, WHITESPACE)),
+    "hexen": lambda: GroupCodec(binascii.b2a_hex),
+    "hexde": lambda: Utf8Checked(GroupCodec(binascii.a2b_hex, 2, WHITESPACE)),
+    "binen": lambda: TextCodec(table_join(BINARY_TABLE, lambda char: format(ord(char), "08b")), " "),
+    "binde": lambda: TokenCodec(token_join(BINARY_LOOKUP, lambda token: chr(int(token, 2)))),
+    "octen": lambda: TextCodec(table_join(OCTAL_TABLE, lambda char: format(ord(char), "03o")), " "),
+    "octde": lambda: TokenCodec(token_join(OCTAL_LOOKUP, lambda token: chr(int(token, 8)))),
+    "unien": lambda: TextCodec(table_join(UNICODE_TABLE, lambda char: f"U+{ord(char):04X}"), " "),
+    "unide": lambda: TokenCodec(token_join(UNICODE_LOOKUP, lambda token: chr(int(token.replace(b"U+", b""), 16)))),
+    "rot13": lambda: GroupCodec(lambda data: data.translate(ROT13_TABLE)),
+    "urlen": lambda: GroupCodec(lambda data: urllib.parse.quote_from_bytes(data).encode()),
+    "urlde": lambda: Utf8Checked(UrlDecoder(urllib.parse.unquote_to_bytes), "replace"),
+    "tcap": lambda: TextCodec(str.upper),
+    "tsm": lambda: TextCodec(str.lower)
+}
+
+def transform_text(name, text):
+    if name == "trev":
+        return text[::-1]
+    codec = CODECS[name]()
+    return (codec.feed(text.encode("utf-8")) + codec.flush()).decode("utf-8")
+
+def reverse_file(input_path, output_path):
+    with open(input_path, "rb") as source, open(output_path, "wb") as target:
+        position = source.seek(0, os.SEEK_END)
+        carry = b""
+        while position > 0:
+            size = min(BLOCK_SIZE, position)
+            position -= size
+            source.seek(position)
+            block = source.read(size) + carry
+            lead = 0
+            if position > 0:
+                while lead < min(3, len(block)) and block[lead] & 0xC0 == 0x80:
+                    lead += 1
+            carry, block = block[:lead], block[lead:]
+            target.write(block.decode("utf-8")[::-1].encode("utf-8"))
+
+def transform_file(name, input_path, output_path):
+    if name == "trev":
+        reverse_file(input_path, output_path)
+        return
+    codec = CODECS[name]()
+    with open(input_path, "rb") as source, open(output_path, "wb") as target:
+        while block := source.read(BLOCK_SIZE):
+            target.write(codec.feed(block))
+        target.write(codec.flush())
+
+def count_text(text):
+    counter = TextCounter()
+    counter.feed(text)
+    return counter.result()
+
+def count_file(input_path):
+    counter = TextCounter()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(input_path, "rb") as source:
+        while block := source.read(BLOCK_SIZE):
+            counter.feed(decoder.decode(block))
+    counter.feed(decoder.decode(b"", final=True))
+    return counter.result()
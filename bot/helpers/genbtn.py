@@ -141,6 +141,11 @@ responses = {
         " - Example: <code>/losers</code> (Returns a list of cryptos with significant price declines, indicating potential buying opportunities)\n\n"
         "➢ <b>/cx [Amount Token1 Token2]</b> - Token Conversion Tool \n"
         " - Example: <code>/cx 10 ton usdt</code> (Shows how much 10 TON is in USDT)\n\n"
+        "➢ <b>/watch [Token Percent]</b> - Get notified when a token moves by a percentage.\n"
+        " - Example: <code>/watch BTC 5%</code> (Notifies you on every ±5% move of Bitcoin)\n\n"
+        "➢ <b>/alert [Token > or < Price]</b> - One-time alert when a price level is crossed.\n"
+        " - Example: <code>/alert ETH > 4000</code> (Notifies you once ETH trades above $4000)\n\n"
+        "➢ <b>/alerts</b> - List your watches and alerts. Remove one with <code>/unalert 1</code>.\n\n"
         "<b>✨NOTE:</b>\n"
         "1️⃣ Data for prices, P2P trades, gainers, and losers is fetched in real-time using the Binance API.\n\n"
         "<b>🔔 For Bot Update News</b>: <a href='{UPDATE_CHANNEL_URL}'>Join Now</a>".format(UPDATE_CHANNEL_URL=UPDATE_CHANNEL_URL),
@@ -205,7 +210,7 @@ responses = {
         "➢ <b>/wc [text]</b> — Count words\n"
         "   Example: <code>/wc Hello World!</code> → Word Count: 2\n\n"
         "<b>✨ Notes:</b>\n"
-        "• All commands work by replying to a message or directly with text\n"
+        "• All commands work by replying to a message, a .txt file or directly with text\n"
         "• /en and /de keep original text and let you try multiple formats with one click\n"
         "• Ensure input is valid for decoding commands\n"
         "<b>━━━━━━━━━━━━━━━━━━━━━━</b>\n"
@@ -318,7 +323,9 @@ responses = {
         "➢ <b>/tdl [Video URL]</b> - Download a Threads video.\n"
         "   Example: <code>/tdl https://www.threads.com/@abc/post/xxx</code>\n\n"
         "➢ <b>/sp [Track URL]</b> - Download a Spotify track.\n"
-        "   Example: <code>/sp https://spotify.com/track/example</code>\n\n"
+        "   Example: <code>/sp https://spotify.com/track/example</code>\n"
+        "➢ <b>/sp [Album or Playlist URL]</b> - Download every track of an album or playlist.\n"
+        "   Example: <code>/sp https://open.spotify.com/album/example</code>\n\n"
         "➢ <b>/yt [Video URL]</b> - Download a YouTube video.\n"
         "   Example: <code>/yt https://youtube.com/video/example</code>\n\n"
         "➢ <b>/song [Video URL]</b> - Download a YouTube video as an MP3 file.\n"
@@ -489,7 +496,8 @@ responses = {
         " - Example: <code>/cmail abc123token</code> (Displays the last 10 mails for the provided token)\n\n"
         "<b>✨NOTE:</b>\n"
         "1️⃣ When generating an email, a unique mail token is provided. This token is required to check received emails.\n"
-        "2️⃣ Each email has a different token, so keep your tokens private to prevent unauthorized access.\n\n"
+        "2️⃣ Each email has a different token, so keep your tokens private to prevent unauthorized access.\n"
+        "3️⃣ New mails are pushed to your chat automatically for 2 hours after your last check.\n\n"
         "<b>🔔 For Bot Update News</b>: <a href='{UPDATE_CHANNEL_URL}'>Join Now</a>".format(UPDATE_CHANNEL_URL=UPDATE_CHANNEL_URL),
         {'parse_mode': ParseMode.HTML, 'disable_web_page_preview': True}
     ),
@@ -611,7 +619,8 @@ responses = {
         "<b>USAGE:</b>\n"
         "Perform webpage-related tasks like taking screenshots or downloading source code using these commands:\n\n"
         "➢ <b>/ss [Website URL]</b> - Take a screenshot of the specified webpage.\n"
-        " - Example: <code>/ss https://example.com</code> (Captures a screenshot of the given website)\n\n"
+        " - Example: <code>/ss https://example.com</code> (Captures a screenshot of the given website)\n"
+        " - Example: <code>/ss example.com github.com</code> (Sends screenshots of several websites as one album)\n\n"
         "➢ <b>/ws [Website URL]</b> - Download the HTML source code of the specified webpage.\n"
         " - Example: <code>/ws https://example.com</code> (Downloads the source code of the given website)\n\n"
         "<b>✨NOTE:</b>\n"
@@ -653,7 +662,8 @@ responses = {
     "<b>━━━━━━━━━━━━━━━━━━━━━━</b>\n"
     "<b>📋 USAGE:</b>\n"
     "Generate high-quality QR codes with customizable options.\n\n"
-    "➢ <b>/qr</b> — Advanced mode with settings\n\n"
+    "➢ <b>/qr</b> — Advanced mode with settings\n"
+    "➢ <b>/qrbatch</b> — Reply to a .txt/.csv file to build many QR codes as a ZIP or PDF grid\n\n"
     "<b>⚙️ Features:</b>\n"
     "• Size selection: Small / Medium / Large / Extra Large\n"
     "• Styles: Classic, Gradient, Blue, Dark, Green\n"
@@ -702,10 +712,12 @@ responses = {
         " - Example: Reply to a .txt file with:\n"
         " <code>/sptxt 100</code>\n"
         " - The bot will split the text file into parts of 100 lines each.\n\n"
+        "➢ <b>/sptxt [Size]</b> - e.g. <code>/sptxt 2MB</code>\n"
+        "➢ <b>/sptxt [Number] parts</b> - e.g. <code>/sptxt 5 parts</code>\n\n"
         "<b>✨NOTE:</b>\n"
         "1️⃣ This command only works in private chats.\n"
         "2️⃣ Only <b>.txt</b> files are supported.\n"
-        "3️⃣ The bot will return multiple split files if necessary.\n\n"
+        "3️⃣ Up to 10 parts arrive as one album; add <b>zip</b> or exceed 10 parts to get a single archive.\n\n"
         "<b>━━━━━━━━━━━━━━━━━━━━━━</b>\n"
         "<b>🔔 For Bot Update News</b>: <a href='{UPDATE_CHANNEL_URL}'>Join Now</a>".format(UPDATE_CHANNEL_URL=UPDATE_CHANNEL_URL),
         {'parse_mode': ParseMode.HTML, 'disable_web_page_preview': True}
@@ -1,59 +1,119 @@
-from telegraph import Telegraph
-from bot.helpers.logger import LOGGER
+import aiohttp
 import asyncio
+import re
+from bot.core.database import SmartTelegraph
+from bot.helpers.logger import LOGGER
+
+TELEGRAPH_API = "https://api.graph.org"
+TELEGRAPH_CONCURRENCY = 4
+FLOOD_WAIT_PATTERN = re.compile(r"FLOOD_WAIT_(\d+)")
 
 class SmartGraph:
-    def __init__(self):
-        self.telegraph = Telegraph()
+    def __init__(self, short_name="SmartUtilBot", author_name="SmartUtilBot", author_url="https://t.me/abirxdhackz"):
+        self.short_name = short_name
+        self.author_name = author_name
+        self.author_url = author_url
         self.max_retries = 5
         self.retry_delay = 1
-        self.initialized = False
+        self.access_token = None
+        self.session = None
+        self.lock = asyncio.Lock()
+
+    @property
+    def initialized(self):
+        return self.access_token is not None
+
+    async def get_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+        return self.session
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    async def call(self, method, payload):
+        session = await self.get_session()
+        async with session.post(f"{TELEGRAPH_API}/{method}", json=payload) as response:
+            response.raise_for_status()
+            data = await response.json(content_type=None)
+        if not data.get("ok"):
+            raise Exception(data.get("error", "Unknown Telegraph error"))
+        return data["result"]
 
     async def initialize(self):
         if self.initialized:
             return True
+        async with self.lock:
+            if self.initialized:
+                return True
+            stored = await SmartTelegraph.find_one({"_id": self.short_name})
+            if stored and stored.get("access_token"):
+                self.access_token = stored["access_token"]
+                LOGGER.info("Telegraph Client Restored From Database")
+                return True
 
-        LOGGER.info("Creating Telegraph Client From Telegraph")
+            LOGGER.info("Creating Telegraph Client From Telegraph")
 
-        for attempt in range(self.max_retries):
-            try:
-                self.telegraph.create_account(
-                    short_name="SmartUtilBot",
-                    author_name="SmartUtilBot",
-                    author_url="https://t.me/abirxdhackz"
-                )
-                LOGGER.info("Telegraph Client Created Successfully!")
-                self.initialized = True
-                return True
-            except Exception as e:
-                if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay)
-                    continue
-                LOGGER.error("Failed To Create Telegraph Account!")
-                self.initialized = False
-                return False
+            for attempt in range(self.max_retries):
+                try:
+                    account = await self.call("createAccount", {
+                        "short_name": self.short_name,
+                        "author_name": self.author_name,
+                        "author_url": self.author_url
+                    })
+                    self.access_token = account["access_token"]
+                    await SmartTelegraph.update_one(
+                        {"_id": self.short_name},
+                        {"$set": {"access_token": self.access_token}},
+                        upsert=True
+                    )
+                    LOGGER.info("Telegraph Client Created Successfully!")
+                    return True
+                except Exception as e:
+                    if attempt < self.max_retries - 1:
+                        await asyncio.sleep(self.retry_delay)
+                        continue
+                    LOGGER.error(f"Failed To Create Telegraph Account! {e}")
+                    return False
 
-    async def create_page(self, title, content, author_name="SmartUtilBot", author_url="https://t.me/abirxdhackz"):
-        if not self.initialized:
-            if not await self.initialize():
-                return None
+    async def create_page(self, title, content, author_name=None, author_url=None):
+        if not await self.initialize():
+            return None
 
+        payload = {
+            "access_token": self.access_token,
+            "title": title,
+            "content": [{"tag": "pre", "children": [content]}],
+            "author_name": author_name or self.author_name,
+            "author_url": author_url or self.author_url,
+            "return_content": False
+        }
         for attempt in range(self.max_retries):
             try:
-                safe_content = content.replace('<', '&lt;').replace('>', '&gt;')
-                page = self.telegraph.create_page(
-                    title=title,
-                    html_content=f"<pre>{safe_content}</pre>",
-                    author_name=author_name,
-                    author_url=author_url
-                )
+                page = await self.call("createPage", payload)
                 LOGGER.info('HTTP Request: POST https://api.graph.org/createPage/ "HTTP/1.1 200 OK"')
                 return page["url"].replace("telegra.ph", "graph.org")
             except Exception as e:
                 LOGGER.error(f'HTTP Request: POST https://api.graph.org/createPage/ "HTTP/1.1 500 Failed": {e}')
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay)
+                    flood_wait = FLOOD_WAIT_PATTERN.search(str(e))
+                    await asyncio.sleep(int(flood_wait.group(1)) if flood_wait else self.retry_delay)
                     continue
 
         LOGGER.error("Failed to create Telegraph page after maximum retries")
-        return None
\ No newline at end of file
+        return None
+
+    async def create_pages(self, title, contents, author_name=None, author_url=None, concurrency=TELEGRAPH_CONCURRENCY):
+        if not await self.initialize():
+            return []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def publish(content):
+            async with semaphore:
+                return await self.create_page(title, content, author_name, author_url)
+
+        urls = await asyncio.gather(*(publish(content) for content in contents))
+        return urls if all(urls) else []
+
+smart_graph = SmartGraph()
@@ -1,21 +1,116 @@
 # Copyright @ISmartCoder
 #  SmartUtilBot - Telegram Utility Bot for Smart Features Bot 
 #  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack> 
+import atexit
+import contextvars
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from config import LOG_JSON, LOG_RATE_LIMIT, LOG_RATE_WINDOW
+
+LOG_FILE = "botlog.txt"
+LOG_MAX_BYTES = 50000000
+LOG_BACKUPS = 10
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+LOG_DATEFMT = '%Y-%m-%d %H:%M:%S'
+MAX_MESSAGE_LENGTH = 4000
+
+log_context = contextvars.ContextVar("log_context", default={})
+
+def bind_log_context(event):
+    user = getattr(event, "from_user", None)
+    chat = getattr(event, "chat", None) or getattr(getattr(event, "message", None), "chat", None)
+    text = getattr(event, "text", None) or getattr(event, "data", None) or ""
+    log_context.set({
+        "user_id": user.id if user else None,
+        "chat_id": chat.id if chat else None,
+        "command": text.split(maxsplit=1)[0][:64] if text.strip() else None,
+        "request_id": getattr(event, "message_id", None) or getattr(event, "id", None)
+    })
+
+def truncate(message):
+    if len(message) > MAX_MESSAGE_LENGTH:
+        return f"{message[:MAX_MESSAGE_LENGTH]}... [{len(message) - MAX_MESSAGE_LENGTH} chars truncated]"
+    return message
+
+class ContextFilter(logging.Filter):
+    def filter(self, record):
+        record.context = log_context.get()
+        return True
+
+class RateLimitFilter(logging.Filter):
+    def __init__(self, limit=LOG_RATE_LIMIT, window=LOG_RATE_WINDOW):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.sites = {}
+        self.lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or self.limit <= 0:
+            return True
+        key = (record.pathname, record.lineno)
+        with self.lock:
+            started, count, suppressed = self.sites.get(key, (record.created, 0, 0))
+            if record.created - started >= self.window:
+                if suppressed:
+                    record.msg = f"{record.getMessage()} [{suppressed} similar messages suppressed]"
+                    record.args = None
+                started, count, suppressed = record.created, 0, 0
+            count += 1
+            if count > self.limit:
+                self.sites[key] = (started, count, suppressed + 1)
+                return False
+            self.sites[key] = (started, count, suppressed)
+        return True
+
+class SmartQueueHandler(QueueHandler):
+    def prepare(self, record):
+        return record
+
+class SmartFormatter(logging.Formatter):
+    def formatMessage(self, record):
+        record.message = truncate(record.message)
+        return super().formatMessage(record)
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, LOG_DATEFMT),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "message": truncate(record.getMessage())
+        }
+        entry.update({key: value for key, value in getattr(record, "context", {}).items() if value is not None})
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+file_handler = RotatingFileHandler(
+    LOG_FILE,
+    maxBytes=LOG_MAX_BYTES,
+    backupCount=LOG_BACKUPS
+)
+file_handler.setFormatter(JsonFormatter() if LOG_JSON else SmartFormatter(LOG_FORMAT, LOG_DATEFMT))
+stream_handler = logging.StreamHandler()
+stream_handler.setFormatter(SmartFormatter(LOG_FORMAT, LOG_DATEFMT))
+
+log_queue = queue.SimpleQueue()
+queue_handler = SmartQueueHandler(log_queue)
+if LOG_RATE_LIMIT > 0:
+    queue_handler.addFilter(RateLimitFilter())
+queue_handler.addFilter(ContextFilter())
+log_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    datefmt='%Y-%m-%d %H:%M:%S',
-    handlers=[
-        RotatingFileHandler(
-            "botlog.txt",
-            maxBytes=50000000,
-            backupCount=10
-        ),
-        logging.StreamHandler()
-    ]
+    handlers=[queue_handler]
 )
 
 logging.getLogger("aiogram").setLevel(logging.ERROR)
@@ -0,0 +1,170 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+import os
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import deque
+from datetime import datetime, timedelta
+from bot.helpers.logger import LOG_FILE, LOG_BACKUPS
+
+BLOCK_SIZE = 64 * 1024
+CHECKPOINT_LINES = 4096
+MAX_GREP_RESULTS = 50
+RECORD_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) - ([A-Z]+) - ")
+JSON_RECORD_PATTERN = re.compile(r'^\{"time": "(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})", "level": "([A-Z]+)"')
+RECORD_START_PATTERN = re.compile(rb'^(?:\{"time": ")?(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})(?: - [A-Z]+ - |", "level": ")', re.MULTILINE)
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
+SINCE_PATTERN = re.compile(r"^(\d+)([smhd])$")
+SINCE_UNITS = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days"}
+
+def parse_since(value):
+    match = SINCE_PATTERN.match(value.lower())
+    if match:
+        return datetime.now() - timedelta(**{SINCE_UNITS[match.group(2)]: int(match.group(1))})
+    for fmt in ("%Y-%m-%d %H:%M", "%Y-%m-%dT%H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+class SmartLogs:
+    def __init__(self, path=LOG_FILE, backups=LOG_BACKUPS):
+        self.path = path
+        self.backups = backups
+        self.lock = threading.Lock()
+        self.indexes = {}
+
+    def index(self, path):
+        with self.lock:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                return None
+            entry = self.indexes.get(stat.st_ino)
+            if entry is None or stat.st_size < entry["scanned"]:
+                entry = self.indexes[stat.st_ino] = {"scanned": 0, "line_count": 0, "size": 0, "checkpoints": []}
+            with open(path, "rb") as file:
+                file.seek(entry["scanned"])
+                offset = entry["scanned"]
+                while True:
+                    block = file.read(BLOCK_SIZE)
+                    if not block:
+                        break
+                    lines_before = entry["line_count"]
+                    newlines = block.count(b"\n")
+                    if newlines:
+                        line_start = 0 if offset == entry["scanned"] else block.index(b"\n") + 1
+                        entry["line_count"] += newlines
+                        entry["scanned"] = offset + block.rindex(b"\n") + 1
+                        checkpoints = entry["checkpoints"]
+                        if entry["line_count"] - (checkpoints[-1][0] if checkpoints else 0) >= CHECKPOINT_LINES:
+                            record = RECORD_START_PATTERN.search(block, line_start)
+                            if record:
+                                line_number = lines_before + block.count(b"\n", 0, record.start()) + 1
+                                checkpoints.append((line_number, offset + record.start(), record.group(1).decode()))
+                    offset += len(block)
+            entry["size"] = offset
+            return entry
+
+    def refresh(self):
+        entry = self.index(self.path)
+        if entry is None:
+            return 0, 0
+        partial = 1 if entry["size"] > entry["scanned"] else 0
+        return entry["line_count"] + partial, entry["size"]
+
+    def seek_line(self, entry, line_number):
+        position = bisect_right(entry["checkpoints"], (line_number, float("inf"))) - 1
+        return entry["checkpoints"][position][:2] if position >= 0 else (1, 0)
+
+    def seek_time(self, entry, since_text):
+        position = bisect_left([checkpoint[2] for checkpoint in entry["checkpoints"]], since_text) - 1
+        return entry["checkpoints"][position][:2] if position >= 0 else (1, 0)
+
+    def lines(self, start, count, max_bytes=4096):
+        entry = self.index(self.path)
+        if entry is None:
+            return ""
+        line_number, offset = self.seek_line(entry, start)
+        with open(self.path, "rb") as file:
+            file.seek(offset)
+            for _ in range(start - line_number):
+                file.readline()
+            data = b"".join(file.readline() for _ in range(count))
+        return data[-max_bytes:].decode("utf-8", errors="ignore")
+
+    def tail(self, count, max_bytes=4096):
+        if not os.path.exists(self.path):
+            return ""
+        with open(self.path, "rb") as file:
+            position = file.seek(0, os.SEEK_END)
+            data = b""
+            while position > 0 and data.count(b"\n") <= count and len(data) < max_bytes + BLOCK_SIZE:
+                read_size = min(BLOCK_SIZE, position)
+                position -= read_size
+                file.seek(position)
+                data = file.read(read_size) + data
+        lines = data.splitlines(keepends=True)[-count:]
+        return b"".join(lines)[-max_bytes:].decode("utf-8", errors="ignore")
+
+    def head(self, max_chars):
+        if not os.path.exists(self.path):
+            return ""
+        with open(self.path, "r", encoding="utf-8", errors="ignore") as file:
+            return file.read(max_chars)
+
+    def rotated_files(self):
+        files = [f"{self.path}.{index}" for index in range(self.backups, 0, -1)]
+        files.append(self.path)
+        return [path for path in files if os.path.exists(path)]
+
+    def grep(self, pattern, level=None, since=None, limit=MAX_GREP_RESULTS):
+        try:
+            regex = re.compile(pattern, re.IGNORECASE)
+        except re.error:
+            regex = re.compile(re.escape(pattern), re.IGNORECASE)
+        min_level = LEVELS.get(level.upper(), 0) if level else 0
+        since_text = since.strftime("%Y-%m-%d %H:%M:%S") if since else None
+        matches = deque(maxlen=limit)
+        total = 0
+        paths = self.rotated_files()
+        for path in paths:
+            if since and datetime.fromtimestamp(os.path.getmtime(path)) < since:
+                continue
+            record_level = 0
+            record_time = ""
+            start_line, offset = 1, 0
+            entry = self.index(path) if since else None
+            if entry:
+                start_line, offset = self.seek_time(entry, since_text)
+            with open(path, "rb") as file:
+                file.seek(offset)
+                for line_number, raw_line in enumerate(file, start=start_line):
+                    line = raw_line.decode("utf-8", errors="ignore")
+                    record = RECORD_PATTERN.match(line) or JSON_RECORD_PATTERN.match(line)
+                    if record:
+                        record_time = record.group(1)
+                        record_level = LEVELS.get(record.group(2), 0)
+                    if record_level < min_level or (since_text and record_time < since_text):
+                        continue
+                    if regex.search(line):
+                        total += 1
+                        matches.append((os.path.basename(path), line_number, line.rstrip("\n")))
+        self.prune(paths)
+        return total, list(matches)
+
+    def prune(self, paths):
+        inodes = set()
+        for path in paths:
+            try:
+                inodes.add(os.stat(path).st_ino)
+            except FileNotFoundError:
+                continue
+        with self.lock:
+            for inode in [inode for inode in self.indexes if inode not in inodes]:
+                del self.indexes[inode]
+
+smart_logs = SmartLogs()
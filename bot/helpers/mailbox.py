@@ -0,0 +1,325 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+import re
+import html
+import time
+import asyncio
+import hashlib
+import aiohttp
+from collections import OrderedDict
+from bs4 import BeautifulSoup
+from aiogram.enums import ParseMode
+from bot.helpers.botutils import send_message
+from bot.helpers.buttons import SmartButtons
+from bot.helpers.logger import LOGGER
+
+BASE_URL = "https://api.mail.tm"
+HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json"
+}
+POLL_INTERVAL = 20
+REQUEST_INTERVAL = 1 / 6
+POLL_BATCH = int(POLL_INTERVAL / REQUEST_INTERVAL)
+MAX_CONCURRENCY = 4
+DOMAIN_TTL = 600
+MAILBOX_TTL = 2 * 60 * 60
+MAX_MAILBOXES = 2000
+MAX_BODIES = 512
+MAX_NOTIFICATIONS = 5
+SEND_INTERVAL = 1 / 25
+
+def short_id_generator(email):
+    unique_string = email + str(time.time())
+    return hashlib.md5(unique_string.encode()).hexdigest()[:10]
+
+def get_text_from_html(html_content_list):
+    html_content = ''.join(html_content_list)
+    soup = BeautifulSoup(html_content, 'html.parser')
+    for a_tag in soup.find_all('a', href=True):
+        url = a_tag['href']
+        new_content = f"{a_tag.text} [{url}]"
+        a_tag.string = new_content
+    text_content = soup.get_text()
+    cleaned_content = re.sub(r'\s+', ' ', text_content).strip()
+    return cleaned_content
+
+def hydra_members(data):
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        return data.get('hydra:member', [])
+    return []
+
+class SmartMail:
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self.session = None
+        self.domain = None
+        self.domain_fetched = 0
+        self.mailboxes = OrderedDict()
+        self.users = {}
+        self.tokens = {}
+        self.bodies = OrderedDict()
+        self.semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        self.rate_lock = asyncio.Lock()
+        self.next_request = 0
+        self.queue = asyncio.Queue()
+        self.tasks = []
+
+    async def get_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=20))
+        return self.session
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    async def throttle(self):
+        async with self.rate_lock:
+            now = time.monotonic()
+            if self.next_request > now:
+                await asyncio.sleep(self.next_request - now)
+            self.next_request = max(now, self.next_request) + REQUEST_INTERVAL
+
+    async def request(self, method, path, token=None, json=None):
+        headers = dict(HEADERS)
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        session = await self.get_session()
+        async with self.semaphore:
+            await self.throttle()
+            async with session.request(method, f"{BASE_URL}{path}", headers=headers, json=json) as response:
+                if response.status >= 400:
+                    LOGGER.error(f"Mail.tm {method} {path} Error Code: {response.status} Response: {await response.text()}")
+                    return response.status, None
+                return response.status, await response.json(content_type=None)
+
+    async def get_domain(self):
+        if self.domain and time.monotonic() - self.domain_fetched < DOMAIN_TTL:
+            return self.domain
+        try:
+            _, data = await self.request("GET", "/domains")
+            domains = hydra_members(data)
+            if domains:
+                self.domain = domains[0]['domain']
+                self.domain_fetched = time.monotonic()
+        except Exception as e:
+            LOGGER.error(f"Error fetching domain: {e}")
+        return self.domain
+
+    async def create_account(self, email, password):
+        try:
+            _, data = await self.request("POST", "/accounts", json={"address": email, "password": password})
+            return data
+        except Exception as e:
+            LOGGER.error(f"Error in create_account: {e}")
+            return None
+
+    async def get_token(self, email, password):
+        try:
+            _, data = await self.request("POST", "/token", json={"address": email, "password": password})
+            return data.get('token') if data else None
+        except Exception as e:
+            LOGGER.error(f"Error in get_token: {e}")
+            return None
+
+    async def get_account(self, token):
+        try:
+            _, data = await self.request("GET", "/me", token=token)
+            return data
+        except Exception as e:
+            LOGGER.error(f"Error in get_account: {e}")
+            return None
+
+    async def list_messages(self, token):
+        try:
+            status, data = await self.request("GET", "/messages", token=token)
+            if status == 401:
+                return None
+            return hydra_members(data)
+        except Exception as e:
+            LOGGER.error(f"Error in list_messages: {e}")
+            return []
+
+    async def get_message(self, token, message_id):
+        body = self.bodies.get(message_id)
+        if body is not None:
+            self.bodies.move_to_end(message_id)
+            return body
+        _, details = await self.request("GET", f"/messages/{message_id}", token=token)
+        if not details:
+            return None
+        if details.get('html'):
+            loop = asyncio.get_running_loop()
+            text = await loop.run_in_executor(None, get_text_from_html, details['html'])
+        elif details.get('text'):
+            text = details['text']
+        else:
+            text = "Content not available."
+        body = {"from": details['from']['address'], "subject": details['subject'], "text": text}
+        self.bodies[message_id] = body
+        while len(self.bodies) > MAX_BODIES:
+            self.bodies.popitem(last=False)
+        return body
+
+    def find(self, user_id, email, token):
+        short_id = self.tokens.get(token)
+        if short_id and self.get(short_id):
+            return short_id
+        mailbox = self.user_mailbox(user_id)
+        if mailbox and mailbox["email"] == email:
+            return self.users[user_id]
+        return None
+
+    def register(self, user_id, chat_id, email, token, password=None, messages=None):
+        messages = messages or []
+        short_id = self.find(user_id, email, token)
+        if short_id is None:
+            short_id = short_id_generator(email)
+            self.mailboxes[short_id] = {"password": None, "messages": [], "seen": set(), "fetched_at": 0}
+        mailbox = self.mailboxes[short_id]
+        if self.users.get(mailbox.get("user_id")) == short_id:
+            del self.users[mailbox["user_id"]]
+        if self.tokens.get(mailbox.get("token")) == short_id:
+            del self.tokens[mailbox["token"]]
+        mailbox.update({
+            "user_id": user_id,
+            "chat_id": chat_id,
+            "email": email,
+            "token": token,
+            "password": password or mailbox["password"],
+            "expires_at": time.monotonic() + MAILBOX_TTL
+        })
+        if messages:
+            mailbox["messages"] = messages
+            mailbox["seen"].update(msg['id'] for msg in messages)
+            mailbox["fetched_at"] = time.monotonic()
+        self.users[user_id] = short_id
+        self.tokens[token] = short_id
+        while len(self.mailboxes) > MAX_MAILBOXES:
+            self.evict(next(iter(self.mailboxes)))
+        return short_id
+
+    def evict(self, short_id):
+        mailbox = self.mailboxes.pop(short_id, None)
+        if mailbox and self.users.get(mailbox["user_id"]) == short_id:
+            del self.users[mailbox["user_id"]]
+        if mailbox and self.tokens.get(mailbox["token"]) == short_id:
+            del self.tokens[mailbox["token"]]
+
+    def get(self, short_id):
+        mailbox = self.mailboxes.get(short_id)
+        if mailbox is None:
+            return None
+        if mailbox["expires_at"] < time.monotonic():
+            self.evict(short_id)
+            return None
+        mailbox["expires_at"] = time.monotonic() + MAILBOX_TTL
+        self.mailboxes.move_to_end(short_id)
+        return mailbox
+
+    def user_mailbox(self, user_id):
+        short_id = self.users.get(user_id)
+        return self.get(short_id) if short_id else None
+
+    def message_mailbox(self, user_id, message_id):
+        for short_id, mailbox in reversed(self.mailboxes.items()):
+            if mailbox["user_id"] == user_id and message_id in mailbox["seen"]:
+                return self.get(short_id)
+        return self.user_mailbox(user_id)
+
+    async def messages(self, short_id):
+        mailbox = self.get(short_id)
+        if mailbox is None:
+            return None
+        if time.monotonic() - mailbox["fetched_at"] >= self.interval:
+            try:
+                await self.poll(short_id, mailbox)
+            except Exception as e:
+                LOGGER.error(f"Failed to poll temp mailbox {mailbox['email']}: {e}")
+            if short_id not in self.mailboxes:
+                return None
+        return mailbox["messages"]
+
+    async def poll(self, short_id, mailbox):
+        status, data = await self.request("GET", "/messages", token=mailbox["token"])
+        if status == 401:
+            self.evict(short_id)
+            return []
+        mailbox["fetched_at"] = time.monotonic()
+        if data is None:
+            return []
+        messages = hydra_members(data)
+        mailbox["messages"] = messages
+        fresh = [msg for msg in messages if msg['id'] not in mailbox["seen"]]
+        mailbox["seen"].update(msg['id'] for msg in fresh)
+        return fresh
+
+    async def start(self):
+        if self.tasks:
+            return
+        self.tasks = [asyncio.create_task(self.poll_loop()), asyncio.create_task(self.send_loop())]
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+    async def poll_loop(self):
+        while True:
+            try:
+                await self.poll_round()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                LOGGER.error(f"Temp mail watcher round failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def poll_round(self):
+        now = time.monotonic()
+        for short_id in [short_id for short_id, mailbox in self.mailboxes.items() if mailbox["expires_at"] < now]:
+            self.evict(short_id)
+        due = sorted(
+            (
+                (short_id, mailbox) for short_id, mailbox in self.mailboxes.items()
+                if now - mailbox["fetched_at"] >= self.interval
+            ),
+            key=lambda item: item[1]["fetched_at"]
+        )[:POLL_BATCH]
+        results = await asyncio.gather(*(self.poll(short_id, mailbox) for short_id, mailbox in due), return_exceptions=True)
+        for (short_id, mailbox), fresh in zip(due, results):
+            if isinstance(fresh, Exception):
+                LOGGER.error(f"Failed to poll temp mailbox {mailbox['email']}: {fresh}")
+                continue
+            for msg in fresh[:MAX_NOTIFICATIONS]:
+                self.queue.put_nowait((mailbox["chat_id"], mailbox["email"], msg))
+
+    def format_notification(self, email, msg):
+        buttons = SmartButtons()
+        buttons.button(text="Read Mail", callback_data=f"tmail_read_{msg['id']}")
+        text = (
+            "<b>📬 New Mail Received</b>\n"
+            "━━━━━━━━━━━━━━━━━━\n"
+            f"<b>📧 To:</b> <code>{email}</code>\n"
+            f"<b>From:</b> <code>{html.escape(msg['from']['address'])}</code>\n"
+            f"<b>Subject:</b> {html.escape(msg['subject'] or '')}"
+        )
+        return text, buttons.build_menu(b_cols=1)
+
+    async def send_loop(self):
+        while True:
+            chat_id, email, msg = await self.queue.get()
+            text, markup = self.format_notification(email, msg)
+            await send_message(
+                chat_id=chat_id,
+                text=text,
+                parse_mode=ParseMode.HTML,
+                reply_markup=markup,
+                disable_web_page_preview=True
+            )
+            await asyncio.sleep(SEND_INTERVAL)
+
+smart_mail = SmartMail()
@@ -0,0 +1,161 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+import asyncio
+import heapq
+import time
+from array import array
+import aiohttp
+from bot.helpers.logger import LOGGER
+from config import A360APIBASEURL
+
+MARKET_URL = f"{A360APIBASEURL}/binance/24h"
+MARKET_TTL = 15
+MARKET_RETRY = 10
+MARKET_STALE = 300
+
+class MarketSnapshot:
+    def __init__(self, tickers, fetched_at):
+        self.tickers = []
+        self.change = array('d')
+        self.last_price = array('d')
+        self.by_symbol = {}
+        self.rates = None
+        self.fetched_at = fetched_at
+        for item in tickers:
+            try:
+                change = float(item['priceChangePercent'])
+                last_price = float(item['lastPrice'])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.by_symbol[item['symbol']] = len(self.tickers)
+            self.tickers.append(item)
+            self.change.append(change)
+            self.last_price.append(last_price)
+
+    def age(self):
+        return time.time() - self.fetched_at
+
+    def top_gainers(self, count, offset=0):
+        indexes = heapq.nlargest(offset + count, range(len(self.change)), key=self.change.__getitem__)
+        return [self.tickers[index] for index in indexes[offset:]]
+
+    def top_losers(self, count, offset=0):
+        indexes = heapq.nsmallest(offset + count, range(len(self.change)), key=self.change.__getitem__)
+        return [self.tickers[index] for index in indexes[offset:]]
+
+    def find(self, token):
+        token = token.upper()
+        index = self.by_symbol.get(token)
+        if index is None:
+            index = self.by_symbol.get(f"{token}USDT")
+        return self.tickers[index] if index is not None else None
+
+    def price(self, symbol):
+        index = self.by_symbol.get(symbol)
+        return self.last_price[index] if index is not None else None
+
+    def usdt_rates(self):
+        if self.rates is not None:
+            return self.rates
+        rates = {"USDT": 1.0}
+        for symbol, index in self.by_symbol.items():
+            price = self.last_price[index]
+            if price <= 0:
+                continue
+            if symbol.endswith("USDT"):
+                rates[symbol[:-4]] = price
+        for symbol, index in self.by_symbol.items():
+            price = self.last_price[index]
+            if price <= 0:
+                continue
+            if symbol.startswith("USDT") and symbol[4:] not in rates:
+                rates[symbol[4:]] = 1 / price
+        btc_rate = rates.get("BTC")
+        if btc_rate:
+            for symbol, index in self.by_symbol.items():
+                price = self.last_price[index]
+                if price > 0 and symbol.endswith("BTC") and symbol[:-3] not in rates:
+                    rates[symbol[:-3]] = price * btc_rate
+        self.rates = rates
+        return rates
+
+    def convert(self, base_coin, target_coin, amount):
+        rates = self.usdt_rates()
+        base_rate = rates.get(base_coin.upper())
+        target_rate = rates.get(target_coin.upper())
+        if not base_rate or not target_rate:
+            return None
+        total_in_usdt = amount * base_rate
+        return {
+            "base_coin": base_coin.upper(),
+            "target_coin": target_coin.upper(),
+            "amount": amount,
+            "total_in_usdt": total_in_usdt,
+            "converted_amount": total_in_usdt / target_rate
+        }
+
+class SmartMarket:
+    def __init__(self, ttl=MARKET_TTL):
+        self.ttl = ttl
+        self.snapshot_data = None
+        self.lock = asyncio.Lock()
+        self.session = None
+        self.failed_at = 0
+
+    async def get_session(self):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=20))
+        return self.session
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    def cooling_down(self):
+        return time.monotonic() - self.failed_at < MARKET_RETRY
+
+    def fallback(self, current):
+        if current and current.age() < MARKET_STALE:
+            return current
+        raise Exception("Unable to fetch data from A360 API")
+
+    async def snapshot(self, max_age=None):
+        max_age = self.ttl if max_age is None else max_age
+        current = self.snapshot_data
+        if current and current.age() < max_age:
+            return current
+        if self.cooling_down():
+            return self.fallback(current)
+        async with self.lock:
+            current = self.snapshot_data
+            if current and current.age() < max_age:
+                return current
+            if self.cooling_down():
+                return self.fallback(current)
+            try:
+                self.snapshot_data = await self.fetch()
+            except Exception:
+                self.failed_at = time.monotonic()
+                if current:
+                    LOGGER.warning(f"Serving market snapshot from {current.age():.0f}s ago after a failed refresh")
+                return self.fallback(current)
+            return self.snapshot_data
+
+    async def fetch(self):
+        try:
+            session = await self.get_session()
+            async with session.get(MARKET_URL) as response:
+                response.raise_for_status()
+                data = await response.json()
+            if not data.get("success", False):
+                LOGGER.error("API returned success: false")
+                raise Exception("API returned success: false")
+            snapshot = MarketSnapshot(data['data'], time.time())
+            LOGGER.info(f"Fetched market snapshot with {len(snapshot.tickers)} tickers from A360 API")
+            return snapshot
+        except Exception as e:
+            LOGGER.error(f"Error fetching market snapshot: {e}")
+            raise Exception("Unable to fetch data from A360 API")
+
+smart_market = SmartMarket()
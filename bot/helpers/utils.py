@@ -3,12 +3,39 @@
 #  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack> 
 import asyncio
 import functools
+import multiprocessing
 import os
-from bot.helpers.logger import LOGGER
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from bot.helpers.logger import LOGGER, bind_log_context
+
+PROCESS_WORKERS = os.cpu_count() or 2
+PROCESS_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+process_pool = None
+process_pool_lock = threading.Lock()
+
+def get_process_pool():
+    global process_pool
+    with process_pool_lock:
+        if process_pool is None:
+            process_pool = ProcessPoolExecutor(
+                max_workers=PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context(PROCESS_START_METHOD)
+            )
+        return process_pool
+
+def shutdown_process_pool():
+    global process_pool
+    with process_pool_lock:
+        pool, process_pool = process_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 def new_task(func):
     async def wrapper(message, bot, **kwargs):
         try:
+            bind_log_context(message)
             task = asyncio.create_task(func(message, bot))
             task.add_done_callback(lambda t: t.exception() and LOGGER.error(f"{func.__name__} failed: {t.exception()}"))
         except Exception as e:
@@ -0,0 +1,171 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+import asyncio
+import time
+from bisect import bisect_left, bisect_right
+from bson import ObjectId
+from aiogram.enums import ParseMode
+from bot.core.database import SmartAlerts
+from bot.helpers.botutils import send_message
+from bot.helpers.logger import LOGGER
+from bot.helpers.market import smart_market, MARKET_TTL
+
+POLL_INTERVAL = MARKET_TTL
+SEND_INTERVAL = 1 / 25
+MAX_SUBSCRIPTIONS = 20
+
+class SymbolIndex:
+    def __init__(self):
+        self.above_levels = []
+        self.above_ids = []
+        self.below_levels = []
+        self.below_ids = []
+
+    def add(self, direction, level, sub_id):
+        levels, ids = self.lists(direction)
+        position = bisect_right(levels, level)
+        levels.insert(position, level)
+        ids.insert(position, sub_id)
+
+    def remove(self, sub_id):
+        for levels, ids in ((self.above_levels, self.above_ids), (self.below_levels, self.below_ids)):
+            if sub_id in ids:
+                position = ids.index(sub_id)
+                del levels[position]
+                del ids[position]
+
+    def lists(self, direction):
+        if direction == "above":
+            return self.above_levels, self.above_ids
+        return self.below_levels, self.below_ids
+
+    def triggered(self, price):
+        fired = self.above_ids[:bisect_right(self.above_levels, price)]
+        fired += self.below_ids[bisect_left(self.below_levels, price):]
+        return fired
+
+    def empty(self):
+        return not self.above_ids and not self.below_ids
+
+class SmartWatcher:
+    def __init__(self, interval=POLL_INTERVAL):
+        self.interval = interval
+        self.subscriptions = {}
+        self.indexes = {}
+        self.queue = asyncio.Queue()
+        self.tasks = []
+
+    async def start(self):
+        if self.tasks:
+            return
+        async for doc in SmartAlerts.find({}):
+            self.index(doc)
+        LOGGER.info(f"Loaded {len(self.subscriptions)} price subscriptions")
+        self.tasks = [asyncio.create_task(self.poll_loop()), asyncio.create_task(self.send_loop())]
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        self.tasks = []
+
+    def index(self, doc):
+        sub_id = str(doc["_id"])
+        self.subscriptions[sub_id] = doc
+        symbol_index = self.indexes.setdefault(doc["symbol"], SymbolIndex())
+        if doc["kind"] == "watch":
+            symbol_index.add("above", doc["base_price"] * (1 + doc["percent"] / 100), sub_id)
+            symbol_index.add("below", doc["base_price"] * (1 - doc["percent"] / 100), sub_id)
+        else:
+            symbol_index.add(doc["direction"], doc["threshold"], sub_id)
+
+    def unindex(self, sub_id):
+        doc = self.subscriptions.pop(sub_id, None)
+        if doc is None:
+            return None
+        symbol_index = self.indexes.get(doc["symbol"])
+        if symbol_index:
+            symbol_index.remove(sub_id)
+            if symbol_index.empty():
+                del self.indexes[doc["symbol"]]
+        return doc
+
+    def user_subscriptions(self, user_id):
+        return [doc for doc in self.subscriptions.values() if doc["user_id"] == user_id]
+
+    async def subscribe(self, doc):
+        if len(self.user_subscriptions(doc["user_id"])) >= MAX_SUBSCRIPTIONS:
+            raise ValueError(f"You can have at most {MAX_SUBSCRIPTIONS} active subscriptions")
+        doc["_id"] = ObjectId()
+        doc["created_at"] = time.time()
+        await SmartAlerts.insert_one(doc)
+        self.index(doc)
+        return doc
+
+    async def unsubscribe(self, user_id, sub_id):
+        doc = self.subscriptions.get(sub_id)
+        if doc is None or doc["user_id"] != user_id:
+            return None
+        self.unindex(sub_id)
+        await SmartAlerts.delete_one({"_id": doc["_id"]})
+        return doc
+
+    async def poll_loop(self):
+        while True:
+            try:
+                if self.indexes:
+                    snapshot = await smart_market.snapshot(max_age=self.interval)
+                    await self.evaluate(snapshot)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                LOGGER.error(f"Price watcher poll failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def evaluate(self, snapshot):
+        for symbol, symbol_index in list(self.indexes.items()):
+            price = snapshot.price(symbol)
+            if not price:
+                continue
+            for sub_id in symbol_index.triggered(price):
+                doc = self.unindex(sub_id)
+                if doc is None:
+                    continue
+                self.queue.put_nowait((doc["chat_id"], self.format_notification(doc, price)))
+                if doc["kind"] == "watch":
+                    doc["base_price"] = price
+                    self.index(doc)
+                    await SmartAlerts.update_one({"_id": doc["_id"]}, {"$set": {"base_price": price}})
+                else:
+                    await SmartAlerts.delete_one({"_id": doc["_id"]})
+
+    def format_notification(self, doc, price):
+        if doc["kind"] == "watch":
+            change = (price - doc["base_price"]) / doc["base_price"] * 100
+            return (
+                "<b>📈 Price Watch Triggered</b>\n"
+                "<b>━━━━━━━━━━━━━━━━</b>\n"
+                f"<b>Symbol:</b> {doc['symbol']}\n"
+                f"<b>Moved:</b> {change:+.2f}% (watching ±{doc['percent']:g}%)\n"
+                f"<b>Price:</b> ${price:,.8g}\n"
+                "<b>━━━━━━━━━━━━━━━━</b>\n"
+                "<b>Watching again from the new price ✅</b>"
+            )
+        sign = ">" if doc["direction"] == "above" else "<"
+        return (
+            "<b>🔔 Price Alert Triggered</b>\n"
+            "<b>━━━━━━━━━━━━━━━━</b>\n"
+            f"<b>Symbol:</b> {doc['symbol']}\n"
+            f"<b>Condition:</b> {sign} ${doc['threshold']:,.8g}\n"
+            f"<b>Price:</b> ${price:,.8g}\n"
+            "<b>━━━━━━━━━━━━━━━━</b>\n"
+            "<b>Alert removed after firing ✅</b>"
+        )
+
+    async def send_loop(self):
+        while True:
+            chat_id, text = await self.queue.get()
+            await send_message(chat_id=chat_id, text=text, parse_mode=ParseMode.HTML)
+            await asyncio.sleep(SEND_INTERVAL)
+
+smart_watcher = SmartWatcher()
@@ -1,5 +1,7 @@
 import os
+import io
 import asyncio
+import hashlib
 import time
 from aiogram import Bot
 from aiogram.filters import Command
@@ -8,19 +10,33 @@ from aiogram.enums import ParseMode, ChatType
 from aiogram.exceptions import TelegramBadRequest
 from pyrogram.enums import ParseMode as SmartParseMode
 from bot import dp, SmartPyro
-from bot.helpers.utils import new_task
+from bot.helpers.utils import new_task, get_process_pool, PROCESS_WORKERS
 from bot.helpers.botutils import send_message, delete_messages, get_args
 from bot.helpers.buttons import SmartButtons
 from bot.helpers.commands import BotCommands
 from bot.helpers.logger import LOGGER
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.defend import SmartDefender
-from pypdf import PdfWriter
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ArrayObject, IndirectObject, NameObject, NumberObject, StreamObject
 from PIL import Image
 
 user_sessions = {}
 MAX_FILE_SIZE_MB = 500
 SESSION_TIMEOUT = 180
+PAGE_WINDOW = max(8, PROCESS_WORKERS * 2)
+PROGRESS_INTERVAL = 3
+TARGET_SAMPLES = 8
+TARGET_LADDER = [
+    (1920, 80), (1920, 70), (1600, 70), (1600, 60), (1400, 65), (1400, 55), (1200, 55),
+    (1200, 45), (1000, 45), (1000, 35), (800, 35), (800, 30), (600, 30), (600, 20)
+]
+STANDARD_LUMINANCE = [
+    16, 11, 10, 16, 24, 40, 51, 61, 12, 12, 14, 19, 26, 58, 60, 55,
+    14, 13, 16, 24, 40, 57, 69, 56, 14, 17, 22, 29, 51, 87, 80, 62,
+    18, 22, 37, 56, 68, 109, 103, 77, 24, 35, 55, 64, 81, 104, 113, 92,
+    49, 64, 78, 87, 103, 121, 120, 101, 72, 92, 95, 98, 112, 100, 103, 99
+]
 
 def clean_pdf_download(*files):
     for file in files:
@@ -49,49 +65,287 @@ def resize_image(img, max_dimension):
         return img.resize(new_size, Image.LANCZOS)
     return img
 
-def compress_pdf(input_path, output_path, max_dimension, jpeg_quality, compression_level):
-    writer = PdfWriter(clone_from=input_path)
-    
-    for page in writer.pages:
-        for img in page.images:
-            try:
-                pil_image = img.image
-                
-                if pil_image.mode == 'CMYK':
-                    pil_image = pil_image.convert('RGB')
-                elif pil_image.mode in ('RGBA', 'LA'):
-                    background = Image.new('RGB', pil_image.size, (255, 255, 255))
-                    if pil_image.mode == 'RGBA':
-                        background.paste(pil_image, mask=pil_image.split()[3])
-                    else:
-                        background.paste(pil_image, mask=pil_image.split()[1])
-                    pil_image = background
-                elif pil_image.mode == 'P':
-                    pil_image = pil_image.convert('RGB')
-                elif pil_image.mode not in ('RGB', 'L'):
-                    pil_image = pil_image.convert('RGB')
-                
-                resized_image = resize_image(pil_image, max_dimension)
-                
-                img.replace(resized_image, quality=jpeg_quality)
-            except Exception:
-                continue
-        
-        page.compress_content_streams(level=compression_level)
-    
-    writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
-    
-    with open(output_path, "wb") as f:
-        writer.write(f)
+def image_mode(color_space):
+    if color_space is None:
+        return None
+    color_space = color_space.get_object()
+    if color_space == "/DeviceRGB":
+        return "RGB"
+    if color_space == "/DeviceGray":
+        return "L"
+    if isinstance(color_space, ArrayObject) and len(color_space) == 2 and color_space[0] == "/ICCBased":
+        return {3: "RGB", 1: "L"}.get(color_space[1].get_object().get("/N"))
+    return None
+
+def collect_images(resources, seen, found):
+    if resources is None:
+        return
+    xobjects = resources.get_object().get("/XObject")
+    if not xobjects:
+        return
+    for ref in xobjects.get_object().values():
+        if not isinstance(ref, IndirectObject) or ref.idnum in seen:
+            continue
+        seen.add(ref.idnum)
+        obj = ref.get_object()
+        subtype = obj.get("/Subtype")
+        if subtype == "/Image":
+            found.append(ref)
+        elif subtype == "/Form":
+            collect_images(obj.get("/Resources"), seen, found)
+
+def image_filter(obj):
+    filters = obj.get("/Filter")
+    if isinstance(filters, ArrayObject):
+        return filters[-1] if filters else None
+    return filters
+
+def is_recompressible(obj):
+    if obj.get("/ImageMask") or "/Decode" in obj or obj.get("/BitsPerComponent") != 8:
+        return False
+    if image_mode(obj.raw_get("/ColorSpace") if "/ColorSpace" in obj else None) is None:
+        return False
+    return image_filter(obj) in ("/DCTDecode", "/FlateDecode")
+
+def build_image_job(obj):
+    if obj.get("/ImageMask") or isinstance(obj.get("/Mask"), ArrayObject):
+        return None
+    try:
+        width, height = int(obj["/Width"]), int(obj["/Height"])
+        raw_length = len(obj._data)
+        if is_recompressible(obj):
+            mode = image_mode(obj.raw_get("/ColorSpace"))
+            data = obj.get_data()
+            if image_filter(obj) == "/DCTDecode":
+                return ("jpeg", data, mode, (width, height), raw_length)
+            if len(data) == width * height * len(mode):
+                return ("raw", data, mode, (width, height), raw_length)
+        image = obj.decode_as_image()
+        mode = "L" if image.mode in ("1", "L", "LA") else "RGB"
+        if image.mode != mode:
+            image = image.convert(mode)
+        return ("decoded", image.tobytes(), mode, image.size, raw_length)
+    except Exception as e:
+        LOGGER.warning(f"Skipping unreadable PDF image: {e}")
+        return None
+
+def estimate_jpeg_quality(image):
+    tables = getattr(image, "quantization", None)
+    if not tables or 0 not in tables:
+        return 100
+    scale = sum(value * 100 / base for value, base in zip(tables[0], STANDARD_LUMINANCE)) / 64
+    if scale <= 0:
+        return 100
+    return max(1, min(100, round((200 - scale) / 2 if scale <= 100 else 5000 / scale)))
+
+def open_job_image(kind, data, mode, size, max_dimension):
+    if kind != "jpeg":
+        return Image.frombytes(mode, size, data)
+    pil_image = Image.open(io.BytesIO(data))
+    pil_image.draft(mode, (max_dimension, max_dimension))
+    if pil_image.mode != mode:
+        pil_image = pil_image.convert(mode)
+    return pil_image
+
+def encode_pdf_image(kind, data, mode, size, original_length, max_dimension, jpeg_quality):
+    try:
+        if kind == "jpeg" and max(size) <= max_dimension and estimate_jpeg_quality(Image.open(io.BytesIO(data))) <= jpeg_quality:
+            return None
+        resized_image = resize_image(open_job_image(kind, data, mode, size, max_dimension), max_dimension)
+        output = io.BytesIO()
+        resized_image.save(output, "JPEG", quality=jpeg_quality, optimize=True)
+        encoded = output.getvalue()
+    except Exception:
+        return None
+    if len(encoded) >= original_length:
+        return None
+    color_space = ("/DeviceRGB" if mode == "RGB" else "/DeviceGray") if kind == "decoded" else None
+    return encoded, resized_image.size, color_space
+
+def estimate_image_sizes(kind, data, mode, size, original_length, ladder):
+    try:
+        source_quality = estimate_jpeg_quality(Image.open(io.BytesIO(data))) if kind == "jpeg" else 100
+        source = open_job_image(kind, data, mode, size, max(dimension for dimension, _ in ladder))
+    except Exception:
+        return [original_length] * len(ladder)
+    sizes = []
+    resized_cache = {}
+    for max_dimension, jpeg_quality in ladder:
+        if kind == "jpeg" and max(size) <= max_dimension and source_quality <= jpeg_quality:
+            sizes.append(original_length)
+            continue
+        if max_dimension not in resized_cache:
+            resized_cache[max_dimension] = resize_image(source, max_dimension)
+        output = io.BytesIO()
+        resized_cache[max_dimension].save(output, "JPEG", quality=jpeg_quality, optimize=True)
+        sizes.append(min(len(output.getvalue()), original_length))
+    return sizes
+
+def estimate_target_sizes(input_path):
+    with open(input_path, "rb") as source:
+        reader = PdfReader(source)
+        seen = set()
+        eligible = []
+        for page in reader.pages:
+            found = []
+            collect_images(page.get("/Resources"), seen, found)
+            for ref in found:
+                obj = ref.get_object()
+                if not obj.get("/ImageMask"):
+                    eligible.append((ref, len(obj._data)))
+                reader.resolved_objects.pop((ref.generation, ref.idnum), None)
+        eligible_bytes = sum(length for _, length in eligible)
+        file_bytes = os.path.getsize(input_path)
+        if not eligible:
+            return [file_bytes] * len(TARGET_LADDER)
+        step = max(1, len(eligible) // TARGET_SAMPLES)
+        samples = eligible[::step][:TARGET_SAMPLES]
+        jobs = [build_image_job(ref.get_object()) for ref, _ in samples]
+    jobs = [job for job in jobs if job]
+    sample_bytes = sum(job[4] for job in jobs)
+    if sample_bytes == 0:
+        return [file_bytes] * len(TARGET_LADDER)
+    process_pool = get_process_pool()
+    futures = [process_pool.submit(estimate_image_sizes, *job, TARGET_LADDER) for job in jobs]
+    totals = [0] * len(TARGET_LADDER)
+    for future in futures:
+        for index, length in enumerate(future.result()):
+            totals[index] += length
+    return [
+        int(file_bytes - eligible_bytes + eligible_bytes * total / sample_bytes)
+        for total in totals
+    ]
+
+def compress_pdf_target(input_path, output_path, target_mb, progress=None):
+    target_bytes = target_mb * 1024 * 1024
+    estimates = estimate_target_sizes(input_path)
+    rung = next((index for index, size in enumerate(estimates) if size <= target_bytes), len(TARGET_LADDER) - 1)
+    max_dimension, jpeg_quality = TARGET_LADDER[rung]
+    compress_pdf(input_path, output_path, max_dimension, jpeg_quality, 9, progress=progress)
+    actual_bytes = os.path.getsize(output_path)
+    if actual_bytes > target_bytes and rung < len(TARGET_LADDER) - 1:
+        correction = actual_bytes / max(estimates[rung], 1)
+        rung = next(
+            (index for index in range(rung + 1, len(TARGET_LADDER)) if estimates[index] * correction <= target_bytes),
+            len(TARGET_LADDER) - 1
+        )
+        max_dimension, jpeg_quality = TARGET_LADDER[rung]
+        compress_pdf(input_path, output_path, max_dimension, jpeg_quality, 9, progress=progress)
+        actual_bytes = os.path.getsize(output_path)
+    return max_dimension, jpeg_quality, actual_bytes <= target_bytes
+
+def parse_target_size(text):
+    text = text.strip().lower().replace(" ", "")
+    multiplier = 1
+    if text.endswith("kb"):
+        text, multiplier = text[:-2], 1 / 1024
+    elif text.endswith("mb"):
+        text = text[:-2]
+    try:
+        value = float(text) * multiplier
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+def replace_image(obj, encoded, size, color_space=None):
+    kept = {key: obj.raw_get(key) for key in ("/ColorSpace", "/Interpolate", "/Intent", "/SMask", "/Mask") if key in obj}
+    if color_space:
+        kept["/ColorSpace"] = NameObject(color_space)
+    obj.clear()
+    obj[NameObject("/Type")] = NameObject("/XObject")
+    obj[NameObject("/Subtype")] = NameObject("/Image")
+    obj[NameObject("/Width")] = NumberObject(size[0])
+    obj[NameObject("/Height")] = NumberObject(size[1])
+    obj[NameObject("/BitsPerComponent")] = NumberObject(8)
+    obj[NameObject("/Filter")] = NameObject("/DCTDecode")
+    for key, value in kept.items():
+        obj[NameObject(key)] = value
+    obj._data = encoded
+    if hasattr(obj, "decoded_self"):
+        obj.decoded_self = None
+
+def compress_pdf(input_path, output_path, max_dimension, jpeg_quality, compression_level, progress=None):
+    with open(input_path, "rb") as source:
+        reader = PdfReader(source)
+        total_pages = len(reader.pages)
+        seen = set()
+        encoded_by_hash = {}
+        process_pool = get_process_pool()
+
+        for start in range(0, total_pages, PAGE_WINDOW):
+            window = [reader.pages[index] for index in range(start, min(start + PAGE_WINDOW, total_pages))]
+            objs_by_hash = {}
+            futures = {}
+            for page in window:
+                found = []
+                collect_images(page.get("/Resources"), seen, found)
+                for ref in found:
+                    obj = ref.get_object()
+                    digest = hashlib.sha256(obj._data).hexdigest()
+                    if digest in encoded_by_hash:
+                        if encoded_by_hash[digest]:
+                            replace_image(obj, *encoded_by_hash[digest])
+                        continue
+                    objs_by_hash.setdefault(digest, []).append(obj)
+                    if digest in futures:
+                        continue
+                    job = build_image_job(obj)
+                    if job is None:
+                        encoded_by_hash[digest] = None
+                        objs_by_hash.pop(digest)
+                        continue
+                    futures[digest] = process_pool.submit(encode_pdf_image, *job, max_dimension, jpeg_quality)
 
-def compress_pdf_extreme(input_path, output_path):
-    compress_pdf(input_path, output_path, max_dimension=800, jpeg_quality=30, compression_level=9)
+            for digest, future in futures.items():
+                result = future.result()
+                encoded_by_hash[digest] = result
+                if result:
+                    for obj in objs_by_hash[digest]:
+                        replace_image(obj, *result)
 
-def compress_pdf_recommended(input_path, output_path):
-    compress_pdf(input_path, output_path, max_dimension=1400, jpeg_quality=65, compression_level=9)
+            if progress:
+                progress(start + len(window), total_pages)
 
-def compress_pdf_low(input_path, output_path):
-    compress_pdf(input_path, output_path, max_dimension=1920, jpeg_quality=75, compression_level=6)
+        writer = PdfWriter()
+        writer.append(reader)
+        if reader.metadata:
+            writer.add_metadata(reader.metadata)
+        for page in writer.pages:
+            page.compress_content_streams(level=compression_level)
+        writer.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+
+        with open(output_path, "wb") as f:
+            writer.write(f)
+
+def compress_pdf_extreme(input_path, output_path, progress=None):
+    compress_pdf(input_path, output_path, max_dimension=800, jpeg_quality=30, compression_level=9, progress=progress)
+
+def compress_pdf_recommended(input_path, output_path, progress=None):
+    compress_pdf(input_path, output_path, max_dimension=1400, jpeg_quality=65, compression_level=9, progress=progress)
+
+def compress_pdf_low(input_path, output_path, progress=None):
+    compress_pdf(input_path, output_path, max_dimension=1920, jpeg_quality=75, compression_level=6, progress=progress)
+
+async def update_progress(message, done, total):
+    try:
+        await message.edit_text(
+            text=f"<b>Compressing Received PDF Size...📄</b>\n<b>Pages:</b> <code>{done}/{total}</code>",
+            parse_mode=ParseMode.HTML
+        )
+    except TelegramBadRequest:
+        pass
+    except Exception as e:
+        LOGGER.error(f"Failed to update cpdf progress: {e}")
+
+def make_progress_reporter(message, loop):
+    last_update = [0]
+    def report(done, total):
+        now = time.time()
+        if done < total and now - last_update[0] < PROGRESS_INTERVAL:
+            return
+        last_update[0] = now
+        asyncio.run_coroutine_threadsafe(update_progress(message, done, total), loop)
+    return report
 
 async def cancel_session(user_id):
     if user_id in user_sessions:
@@ -116,6 +370,29 @@ async def session_timeout(user_id, message_id, chat_id, bot):
             pass
         await cancel_session(user_id)
 
+async def send_compressed_pdf(chat_id, session, output_path, quality_text):
+    compressed_size = get_file_size_mb(output_path)
+    original_size = session['original_size']
+    reduction = ((original_size - compressed_size) / original_size) * 100
+    
+    caption = (
+        "<b>✅ PDF Compressed Successfully</b>\n"
+        "<b>━━━━━━━━━━━━━━━━━━</b>\n"
+        f"<b>📄 Original Size:</b> <code>{format_size(original_size)}</code>\n"
+        f"<b>📦 Compressed Size:</b> <code>{format_size(compressed_size)}</code>\n"
+        f"<b>📉 Reduction:</b> <code>{reduction:.1f}%</code>\n"
+        f"<b>⚙️ Quality:</b> <code>{quality_text}</code>\n"
+        "<b>━━━━━━━━━━━━━━━━━━</b>\n"
+        "<b>Thank You For Using Our Smart Bot</b>"
+    )
+    
+    await SmartPyro.send_document(
+        chat_id=chat_id,
+        document=output_path,
+        caption=caption,
+        parse_mode=SmartParseMode.HTML
+    )
+
 @dp.message(Command(commands=["cpdf"], prefix=BotCommands))
 @new_task
 @SmartDefender
@@ -145,7 +422,8 @@ async def cpdf_handler(message: Message, bot: Bot):
             "<b>⚙️ Available Options:</b>\n"
             "• 🔥 Extreme - Maximum compression\n"
             "• ⚡ Recommended - Balanced quality\n"
-            "• 💎 Low - Best quality\n\n"
+            "• 💎 Low - Best quality\n"
+            "• 🎯 Target Size - Fit under a size you choose\n\n"
             "<b>📝 Note: Max file size 500 MB</b>\n\n"
             "<i>Session expires in 3 minutes</i>"
         )
@@ -222,6 +500,7 @@ async def handle_pdf_upload(message: Message, bot: Bot):
         buttons.button(text="🔥 Extreme", callback_data="cpdf_extreme")
         buttons.button(text="⚡ Recommended", callback_data="cpdf_recommended")
         buttons.button(text="💎 Low", callback_data="cpdf_low")
+        buttons.button(text="🎯 Target Size", callback_data="cpdf_target")
         buttons.button(text="❌ Cancel", callback_data="cpdf_cancel")
         reply_markup = buttons.build_menu(b_cols=1)
         
@@ -267,6 +546,72 @@ async def handle_pdf_upload(message: Message, bot: Bot):
         )
         await cancel_session(user_id)
 
+@dp.message(lambda message: message.from_user.id in user_sessions and user_sessions[message.from_user.id].get('state') == 'waiting_target')
+async def handle_target_size(message: Message, bot: Bot):
+    user_id = message.from_user.id
+    session = user_sessions[user_id]
+    
+    try:
+        target_mb = parse_target_size(message.text or "")
+        if target_mb is None:
+            await send_message(
+                chat_id=message.chat.id,
+                text="<b>❌ Please send a valid size like <code>5</code> or <code>800KB</code></b>",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        
+        if target_mb >= session['original_size']:
+            await send_message(
+                chat_id=message.chat.id,
+                text="<b>⚠️ Your PDF is already smaller than that size</b>",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        
+        session['state'] = 'compressing'
+        if session.get('timeout_task'):
+            session['timeout_task'].cancel()
+        
+        progress_msg = await send_message(
+            chat_id=message.chat.id,
+            text="<b>Estimating Best Settings For Target Size...🎯</b>",
+            parse_mode=ParseMode.HTML
+        )
+        
+        input_path = session['file_path']
+        output_path = f"{os.path.splitext(input_path)[0]}_compressed_target.pdf"
+        
+        loop = asyncio.get_running_loop()
+        progress = make_progress_reporter(progress_msg, loop)
+        max_dimension, jpeg_quality, reached = await loop.run_in_executor(
+            None, compress_pdf_target, input_path, output_path, target_mb, progress
+        )
+        
+        quality_text = f"Target {format_size(target_mb)} ({max_dimension}px, Q{jpeg_quality})"
+        if not reached:
+            quality_text += " - Closest Possible"
+        
+        await send_compressed_pdf(message.chat.id, session, output_path, quality_text)
+        
+        await progress_msg.delete()
+        
+        clean_pdf_download(input_path, output_path)
+        
+        await cancel_session(user_id)
+        
+        LOGGER.info(f"Successfully compressed PDF for user {user_id} to target {target_mb:.2f} MB")
+        
+    except Exception as e:
+        LOGGER.error(f"Error in cpdf target size: {e}")
+        await Smart_Notify(bot, "cpdf_target", e, message)
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>❌ Error compressing PDF file</b>",
+            parse_mode=ParseMode.HTML
+        )
+        await cancel_session(user_id)
+
 @dp.callback_query(lambda c: c.data.startswith("cpdf_"))
 async def handle_cpdf_callback(callback: CallbackQuery, bot: Bot):
     user_id = callback.from_user.id
@@ -297,6 +642,24 @@ async def handle_cpdf_callback(callback: CallbackQuery, bot: Bot):
         
         mode = callback.data.replace("cpdf_", "")
         
+        if mode == "target":
+            session['state'] = 'waiting_target'
+            buttons = SmartButtons()
+            buttons.button(text="❌ Cancel", callback_data="cpdf_cancel")
+            await callback.message.edit_text(
+                text=(
+                    "<b>🎯 Send the target size for your PDF</b>\n\n"
+                    "<b>Examples:</b> <code>5</code>, <code>5MB</code>, <code>800KB</code>"
+                ),
+                parse_mode=ParseMode.HTML,
+                reply_markup=buttons.build_menu(b_cols=1)
+            )
+            return
+        
+        session['state'] = 'compressing'
+        if session.get('timeout_task'):
+            session['timeout_task'].cancel()
+        
         await callback.message.edit_text(
             text="<b>Compressing Received PDF Size...📄</b>",
             parse_mode=ParseMode.HTML
@@ -305,37 +668,20 @@ async def handle_cpdf_callback(callback: CallbackQuery, bot: Bot):
         input_path = session['file_path']
         output_path = f"{os.path.splitext(input_path)[0]}_compressed_{mode}.pdf"
         
+        loop = asyncio.get_running_loop()
+        progress = make_progress_reporter(callback.message, loop)
+        
         if mode == "extreme":
-            compress_pdf_extreme(input_path, output_path)
+            await loop.run_in_executor(None, compress_pdf_extreme, input_path, output_path, progress)
             quality_text = "Extreme"
         elif mode == "recommended":
-            compress_pdf_recommended(input_path, output_path)
+            await loop.run_in_executor(None, compress_pdf_recommended, input_path, output_path, progress)
             quality_text = "Recommended"
         elif mode == "low":
-            compress_pdf_low(input_path, output_path)
+            await loop.run_in_executor(None, compress_pdf_low, input_path, output_path, progress)
             quality_text = "Low"
         
-        compressed_size = get_file_size_mb(output_path)
-        original_size = session['original_size']
-        reduction = ((original_size - compressed_size) / original_size) * 100
-        
-        caption = (
-            "<b>✅ PDF Compressed Successfully</b>\n"
-            "<b>━━━━━━━━━━━━━━━━━━</b>\n"
-            f"<b>📄 Original Size:</b> <code>{format_size(original_size)}</code>\n"
-            f"<b>📦 Compressed Size:</b> <code>{format_size(compressed_size)}</code>\n"
-            f"<b>📉 Reduction:</b> <code>{reduction:.1f}%</code>\n"
-            f"<b>⚙️ Quality:</b> <code>{quality_text}</code>\n"
-            "<b>━━━━━━━━━━━━━━━━━━</b>\n"
-            "<b>Thank You For Using Our Smart Bot</b>"
-        )
-        
-        await SmartPyro.send_document(
-            chat_id=callback.message.chat.id,
-            document=output_path,
-            caption=caption,
-            parse_mode=SmartParseMode.HTML
-        )
+        await send_compressed_pdf(callback.message.chat.id, session, output_path, quality_text)
         
         await callback.message.delete()
         
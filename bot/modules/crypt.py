@@ -1,7 +1,6 @@
 # Copyright @ISmartCoder
 #  SmartUtilBot - Telegram Utility Bot for Smart Features Bot 
 #  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack> 
-import aiohttp
 import asyncio
 from aiogram import Bot
 from aiogram.filters import Command, BaseFilter
@@ -15,26 +14,13 @@ from bot.helpers.buttons import SmartButtons
 from bot.helpers.logger import LOGGER
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.defend import SmartDefender
-from config import A360APIBASEURL
-BASE_URL = f"{A360APIBASEURL}/binance/24h"
+from bot.helpers.market import smart_market
 async def fetch_crypto_data():
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(BASE_URL) as response:
-                response.raise_for_status()
-                data = await response.json()
-                if not data.get("success", False):
-                    LOGGER.error("API returned success: false")
-                    raise Exception("API returned success: false")
-                LOGGER.info("Successfully fetched crypto data from A360 API")
-                return data['data']
-    except Exception as e:
-        LOGGER.error(f"Error fetching crypto data: {e}")
-        raise Exception("Unable to fetch data from A360 API")
-def get_top_gainers(data, top_n=5):
-    return sorted(data, key=lambda x: float(x['priceChangePercent']), reverse=True)[:top_n]
-def get_top_losers(data, top_n=5):
-    return sorted(data, key=lambda x: float(x['priceChangePercent']))[:top_n]
+    return await smart_market.snapshot()
+def get_top_gainers(snapshot, top_n=5, offset=0):
+    return snapshot.top_gainers(top_n, offset)
+def get_top_losers(snapshot, top_n=5, offset=0):
+    return snapshot.top_losers(top_n, offset)
 def format_crypto_info(data, start_index=0):
     result = ""
     for idx, item in enumerate(data, start=start_index + 1):
@@ -110,10 +96,10 @@ async def crypto_handle_pagination(callback_query: CallbackQuery, bot: Bot):
         data = await fetch_crypto_data()
         top_n = 5
         if command == "gainers":
-            top_cryptos = get_top_gainers(data, top_n * next_page)[page*top_n:(page+1)*top_n]
+            top_cryptos = get_top_gainers(data, top_n, page * top_n)
             title = "Gainers"
         else:
-            top_cryptos = get_top_losers(data, top_n * next_page)[page*top_n:(page+1)*top_n]
+            top_cryptos = get_top_losers(data, top_n, page * top_n)
             title = "Losers"
         if not top_cryptos:
             await callback_query.answer(f"No more {title.lower()} to display", show_alert=True)
@@ -14,6 +14,7 @@ from bot.helpers.commands import BotCommands
 from bot.helpers.logger import LOGGER
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.defend import SmartDefender
+from bot.helpers.market import smart_market
 from config import A360APIBASEURL
 
 BASE_URL = f"{A360APIBASEURL}/binance/cx"
@@ -21,6 +22,14 @@ BASE_URL = f"{A360APIBASEURL}/binance/cx"
 price_storage = {}
 
 async def get_conversion_data(base_coin: str, target_coin: str, amount: float):
+    try:
+        snapshot = await smart_market.snapshot()
+        data = snapshot.convert(base_coin, target_coin, amount)
+        if data:
+            data['age'] = snapshot.age()
+            return data
+    except Exception as e:
+        LOGGER.error(f"Market snapshot unavailable for {base_coin} to {target_coin}: {e}")
     try:
         url = f"{BASE_URL}?base={base_coin.upper()}&target={target_coin.upper()}&amount={amount}"
         async with aiohttp.ClientSession() as session:
@@ -36,6 +45,11 @@ async def get_conversion_data(base_coin: str, target_coin: str, amount: float):
         LOGGER.error(f"Error fetching conversion data for {base_coin} to {target_coin}: {e}")
         return None
         
+def format_age(age) -> str:
+    if age is None:
+        return ""
+    return f"<b>Rates Updated:</b> {int(age)}s ago\n"
+
 def format_response(data: dict) -> str:
     return (
         "<b>Smart Binance Convert Successful ✅</b>\n"
@@ -45,6 +59,7 @@ def format_response(data: dict) -> str:
         f"<b>Amount:</b> {data['amount']:.4f} {data['base_coin']}\n"
         f"<b>Total In USDT:</b> {data['total_in_usdt']:.4f} USDT\n"
         f"<b>Converted Amount:</b> {data['converted_amount']:.4f} {data['target_coin']}\n"
+        f"{format_age(data.get('age'))}"
         "<b>━━━━━━━━━━━━━━━━</b>\n"
         "<b>Smooth Coin Converter → Activated ✅</b>"
     )
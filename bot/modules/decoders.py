@@ -2,45 +2,47 @@
 #  SmartUtilBot - Telegram Utility Bot for Smart Features Bot 
 #  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack> 
 import os
+import shutil
 import asyncio
-import base64
-import binascii
+import tempfile
 from aiogram import Bot
 from aiogram.filters import Command, BaseFilter
 from aiogram.types import Message, FSInputFile
 from aiogram.enums import ParseMode
 from aiogram.exceptions import TelegramBadRequest
 from bot import dp
-from bot.helpers.utils import new_task, clean_download
+from bot.helpers.utils import new_task
 from bot.helpers.botutils import send_message, delete_messages
 from bot.helpers.commands import BotCommands
 from bot.helpers.logger import LOGGER
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.defend import SmartDefender
+from bot.helpers.codec import transform_text, transform_file, count_text, count_file
 from config import COMMAND_PREFIX, MAX_TXT_SIZE
 
-commands = {
-    "b64en": lambda text: base64.b64encode(text.encode()).decode(),
-    "b64de": lambda text: base64.b64decode(text).decode(),
-    "b32en": lambda text: base64.b32encode(text.encode()).decode(),
-    "b32de": lambda text: base64.b32decode(text).decode(),
-    "binen": lambda text: ' '.join(format(ord(char), '08b') for char in text),
-    "binde": lambda text: ''.join(chr(int(b, 2)) for b in text.split()),
-    "hexen": lambda text: binascii.hexlify(text.encode()).decode(),
-    "hexde": lambda text: binascii.unhexlify(text).decode(),
-    "octen": lambda text: ' '.join(format(ord(char), '03o') for char in text),
-    "octde": lambda text: ''.join(chr(int(o, 8)) for o in text.split()),
-    "trev": lambda text: text[::-1],
-    "tcap": lambda text: text.upper(),
-    "tsm": lambda text: text.lower(),
-    "wc": lambda text: (
+DOWNLOADS_DIR = "./downloads"
+MAX_INLINE_RESULT = 4096
+
+commands = {"b64en", "b64de", "b32en", "b32de", "binen", "binde", "hexen", "hexde", "octen", "octde", "trev", "tcap", "tsm", "wc"}
+
+def format_counts(counts):
+    return (
         "<b>📊 Text Counter</b>\n\n" +
-        "<b>✅ Words:</b> <code>" + str(len(text.split())) + "</code>\n" +
-        "<b>✅ Characters:</b> <code>" + str(len(text)) + "</code>\n" +
-        "<b>✅ Sentences:</b> <code>" + str(text.count('.') + text.count('!') + text.count('?')) + "</code>\n" +
-        "<b>✅ Paragraphs:</b> <code>" + str(text.count('\n') + 1) + "</code>"
+        "<b>✅ Words:</b> <code>" + str(counts["words"]) + "</code>\n" +
+        "<b>✅ Characters:</b> <code>" + str(counts["characters"]) + "</code>\n" +
+        "<b>✅ Sentences:</b> <code>" + str(counts["sentences"]) + "</code>\n" +
+        "<b>✅ Paragraphs:</b> <code>" + str(counts["paragraphs"]) + "</code>"
     )
-}
+
+def process_file(command, input_path, output_path):
+    if command == "wc":
+        return format_counts(count_file(input_path))
+    transform_file(command, input_path, output_path)
+    if os.path.getsize(output_path) > MAX_INLINE_RESULT * 4:
+        return None
+    with open(output_path, "r", encoding="utf-8") as file:
+        result = file.read()
+    return result if len(result) <= MAX_INLINE_RESULT else None
 
 class DecoderCommandFilter(BaseFilter):
     async def __call__(self, message: Message):
@@ -52,60 +54,63 @@ class DecoderCommandFilter(BaseFilter):
 @new_task
 @SmartDefender
 async def handle_command(message: Message, bot: Bot):
-    file_path = None
-    file_name = None
+    workdir = None
     try:
         command = message.text.split()[0][1:]
-        func = commands[command]
         processing_msg = await send_message(
             chat_id=message.chat.id,
             text="<b>Processing Your Input...✨</b>",
             parse_mode=ParseMode.HTML
         )
         text = None
-        if message.reply_to_message:
-            if message.reply_to_message.document:
-                if message.reply_to_message.document.file_size > MAX_TXT_SIZE:
-                    await send_message(
-                        chat_id=message.chat.id,
-                        text=f"<b>❌ File too large! Max size is {MAX_TXT_SIZE // 1024 // 1024}MB</b>",
-                        parse_mode=ParseMode.HTML
-                    )
-                    await delete_messages(message.chat.id, [processing_msg.message_id])
-                    LOGGER.warning(f"File too large for /{command} in chat {message.chat.id}")
-                    return
-                os.makedirs("./downloads", exist_ok=True)
-                file_path = os.path.join("./downloads", message.reply_to_message.document.file_name or f"{command}_input.txt")
-                await bot.download(message.reply_to_message.document, destination=file_path)
-                with open(file_path, "r", encoding="utf-8") as file:
-                    text = file.read()
-            else:
-                text = message.reply_to_message.text
+        result = None
+        output_path = None
+        if message.reply_to_message and message.reply_to_message.document:
+            if message.reply_to_message.document.file_size > MAX_TXT_SIZE:
+                await send_message(
+                    chat_id=message.chat.id,
+                    text=f"<b>❌ File too large! Max size is {MAX_TXT_SIZE // 1024 // 1024}MB</b>",
+                    parse_mode=ParseMode.HTML
+                )
+                await delete_messages(message.chat.id, [processing_msg.message_id])
+                LOGGER.warning(f"File too large for /{command} in chat {message.chat.id}")
+                return
+            os.makedirs(DOWNLOADS_DIR, exist_ok=True)
+            workdir = tempfile.mkdtemp(prefix=f"{command}_{message.from_user.id}_", dir=DOWNLOADS_DIR)
+            file_path = os.path.join(workdir, "input.txt")
+            output_path = os.path.join(workdir, f"{command}_result.txt")
+            await bot.download(message.reply_to_message.document, destination=file_path)
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(None, process_file, command, file_path, output_path)
         else:
-            text = message.text.split(maxsplit=1)[1] if len(message.text.split()) > 1 else None
-        if not text:
-            await send_message(
-                chat_id=message.chat.id,
-                text="<b>⚠️ Please provide text or reply to a message/file❌</b>",
-                parse_mode=ParseMode.HTML
-            )
-            await delete_messages(message.chat.id, [processing_msg.message_id])
-            LOGGER.warning(f"No text provided for /{command} in chat {message.chat.id}")
-            if file_path:
-                clean_download(file_path)
-            return
-        result = func(text)
+            if message.reply_to_message:
+                text = message.reply_to_message.text
+            else:
+                text = message.text.split(maxsplit=1)[1] if len(message.text.split()) > 1 else None
+            if not text:
+                await send_message(
+                    chat_id=message.chat.id,
+                    text="<b>⚠️ Please provide text or reply to a message/file❌</b>",
+                    parse_mode=ParseMode.HTML
+                )
+                await delete_messages(message.chat.id, [processing_msg.message_id])
+                LOGGER.warning(f"No text provided for /{command} in chat {message.chat.id}")
+                return
+            result = format_counts(count_text(text)) if command == "wc" else transform_text(command, text)
+            if len(result) > MAX_INLINE_RESULT:
+                os.makedirs(DOWNLOADS_DIR, exist_ok=True)
+                workdir = tempfile.mkdtemp(prefix=f"{command}_{message.from_user.id}_", dir=DOWNLOADS_DIR)
+                output_path = os.path.join(workdir, f"{command}_result.txt")
+                with open(output_path, "w", encoding="utf-8") as file:
+                    file.write(result)
+                result = None
         user_full_name = message.from_user.first_name + (" " + message.from_user.last_name if message.from_user.last_name else "")
         user_mention = f"<a href='tg://user?id={message.from_user.id}'>{user_full_name}</a>"
         LOGGER.info(f"Processed /{command} in chat {message.chat.id}")
-        if len(result) > 4096:
-            os.makedirs("./downloads", exist_ok=True)
-            file_name = os.path.join("./downloads", f"{command}_result.txt")
-            with open(file_name, "w", encoding="utf-8") as file:
-                file.write(result)
+        if result is None:
             await bot.send_document(
                 chat_id=message.chat.id,
-                document=FSInputFile(path=file_name),
+                document=FSInputFile(path=output_path),
                 caption=(
                     f"✨ <b>Here is your processed file!</b> ✨\n\n"
                     f"📂 <b>Command Used:</b> <code>{command}</code>\n"
@@ -121,10 +126,6 @@ async def handle_command(message: Message, bot: Bot):
                 parse_mode=ParseMode.HTML
             )
         await delete_messages(message.chat.id, [processing_msg.message_id])
-        if file_path:
-            clean_download(file_path)
-        if file_name:
-            clean_download(file_name)
     except (Exception, TelegramBadRequest) as e:
         await delete_messages(message.chat.id, [processing_msg.message_id])
         await send_message(
@@ -134,7 +135,6 @@ async def handle_command(message: Message, bot: Bot):
         )
         LOGGER.error(f"Error processing /{command} in chat {message.chat.id}: {str(e)}")
         await Smart_Notify(bot, f"/{command}", e, message)
-        if file_path:
-            clean_download(file_path)
-        if file_name and os.path.exists(file_name):
-            clean_download(file_name)
\ No newline at end of file
+    finally:
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
\ No newline at end of file
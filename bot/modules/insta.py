@@ -6,10 +6,12 @@ import aiohttp
 import aiofiles
 from pathlib import Path
 from typing import Optional
+from collections import OrderedDict
 from aiogram import Bot
 from aiogram.filters import Command
 from aiogram.types import Message
 from aiogram.exceptions import TelegramBadRequest
+from pyrogram import raw, utils
 from pyrogram.types import InputMediaPhoto, InputMediaVideo
 from pyrogram.enums import ParseMode as SmartParseMode
 from bot import dp, SmartPyro
@@ -26,12 +28,55 @@ class Config:
     MAX_MEDIA_PER_GROUP = 10
     DOWNLOAD_RETRIES = 3
     RETRY_DELAY = 2
+    UPLOAD_CONCURRENCY = 3
+    MAX_CACHED_POSTS = 1024
 
 Config.TEMP_DIR.mkdir(exist_ok=True)
 
+SHORTCODE_PATTERN = re.compile(r"instagram\.com/(?:[^/]+/)?(?:p|reels?|tv)/([A-Za-z0-9_-]+)")
+
+def extract_shortcode(url: str) -> Optional[str]:
+    match = SHORTCODE_PATTERN.search(url)
+    return match.group(1) if match else None
+
 class InstagramDownloader:
     def __init__(self, temp_dir: Path):
         self.temp_dir = temp_dir
+        self.session = None
+        self.posts = OrderedDict()
+        self.upload_semaphore = asyncio.Semaphore(Config.UPLOAD_CONCURRENCY)
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
+        return self.session
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    def cached_post(self, shortcode: Optional[str]) -> Optional[list]:
+        if not shortcode or shortcode not in self.posts:
+            return None
+        self.posts.move_to_end(shortcode)
+        return self.posts[shortcode]
+
+    def remember_post(self, shortcode: Optional[str], messages: list):
+        items = []
+        for sent in messages:
+            if getattr(sent, "video", None):
+                items.append({"type": "video", "file_id": sent.video.file_id})
+            elif getattr(sent, "photo", None):
+                items.append({"type": "image", "file_id": sent.photo.file_id})
+        if not shortcode or not items:
+            return
+        self.posts[shortcode] = items
+        self.posts.move_to_end(shortcode)
+        while len(self.posts) > Config.MAX_CACHED_POSTS:
+            self.posts.popitem(last=False)
 
     async def sanitize_filename(self, shortcode: str, index: int, media_type: str) -> str:
         safe_shortcode = re.sub(r'[<>:"/\\|?*]', '', shortcode[:30]).strip()
@@ -58,89 +103,145 @@ class InstagramDownloader:
             await asyncio.sleep(Config.RETRY_DELAY)
         raise Exception(f"Failed to download {url} after {retries} attempts")
 
-    async def download_content(self, url: str, downloading_message: Message, content_type: str) -> Optional[dict]:
-        self.temp_dir.mkdir(exist_ok=True)
-        api_url = f"{A360APIBASEURL}/insta/dl?url={url}"
-        
+    async def fetch_post(self, url: str) -> Optional[dict]:
         try:
-            async with aiohttp.ClientSession(
-                connector=aiohttp.TCPConnector(limit=100),
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as session:
-                async with session.get(api_url) as response:
-                    if response.status != 200:
-                        return None
-                    
-                    data = await response.json()
-                    
-                    if data.get("status") != "success":
-                        return None
-                    
-                    if content_type in ["reel", "igtv"]:
-                        await downloading_message.edit_text(
-                            "<b>Found ☑️ Downloading...</b>",
-                            parse_mode=SmartParseMode.HTML
-                        )
-                    
-                    media_files = []
-                    tasks = []
-                    thumbnail_tasks = []
-                    thumbnail_paths = []
-                    
-                    shortcode = url.split('/')[-2] if '/p/' in url or '/reel/' in url else 'unknown'
-                    
-                    for index, media in enumerate(data["results"], start=1):
-                        media_type = "video" if media["label"].startswith("video") else "image"
-                        filename = self.temp_dir / await self.sanitize_filename(shortcode, index, media_type)
-                        tasks.append(self.download_file(session, media["download"], filename))
-                        
-                        thumbnail_url = media.get("thumbnail")
-                        if thumbnail_url:
-                            thumbnail_filename = self.temp_dir / f"{filename.stem}_thumb.jpg"
-                            thumbnail_tasks.append(self.download_file(session, thumbnail_url, thumbnail_filename))
-                            thumbnail_paths.append(thumbnail_filename)
-                        else:
-                            thumbnail_tasks.append(None)
-                            thumbnail_paths.append(None)
-                    
-                    downloaded_files = await asyncio.gather(*tasks, return_exceptions=True)
-                    downloaded_thumbnails = await asyncio.gather(*[t for t in thumbnail_tasks if t is not None], return_exceptions=True)
-                    thumb_index = 0
-                    
-                    for index, result in enumerate(downloaded_files):
-                        if isinstance(result, Exception):
-                            if thumbnail_paths[index] and thumbnail_paths[index].exists():
-                                clean_download(thumbnail_paths[index])
-                            continue
-                        
-                        thumbnail_filename = None
-                        if thumbnail_tasks[index] is not None:
-                            thumb_result = downloaded_thumbnails[thumb_index]
-                            if not isinstance(thumb_result, Exception):
-                                thumbnail_filename = str(thumbnail_paths[index])
-                            thumb_index += 1
-                        
-                        media_files.append({
-                            "filename": str(result),
-                            "type": "video" if data["results"][index]["label"].startswith("video") else "image",
-                            "thumbnail": thumbnail_filename
-                        })
-                    
-                    if not media_files:
-                        return None
-                    
-                    post_type = "carousel" if data.get("media_count", 1) > 1 else ("video" if any(m["label"].startswith("video") for m in data["results"]) else "image")
-                    
-                    return {
-                        "media_files": media_files,
-                        "webpage_url": url,
-                        "type": post_type
-                    }
-        
+            session = await self.get_session()
+            async with session.get(f"{A360APIBASEURL}/insta/dl", params={"url": url}) as response:
+                if response.status != 200:
+                    return None
+                data = await response.json()
+            if data.get("status") != "success" or not data.get("results"):
+                return None
+            return data
         except Exception as e:
             LOGGER.error(f"Instagram download error: {e}")
             return None
 
+    async def download_media(self, shortcode: str, index: int, media: dict) -> Optional[dict]:
+        self.temp_dir.mkdir(exist_ok=True)
+        session = await self.get_session()
+        media_type = "video" if media["label"].startswith("video") else "image"
+        filename = self.temp_dir / await self.sanitize_filename(shortcode, index, media_type)
+        thumbnail_url = media.get("thumbnail")
+        thumbnail_filename = self.temp_dir / f"{filename.stem}_thumb.jpg" if thumbnail_url else None
+        tasks = [self.download_file(session, media["download"], filename)]
+        if thumbnail_url:
+            tasks.append(self.download_file(session, thumbnail_url, thumbnail_filename))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        thumbnail_ok = thumbnail_url and not isinstance(results[-1], Exception)
+        if isinstance(results[0], Exception):
+            LOGGER.error(f"Instagram media download failed: {results[0]}")
+            if thumbnail_ok:
+                clean_download(thumbnail_filename)
+            return None
+        return {
+            "filename": str(filename),
+            "type": media_type,
+            "thumbnail": str(thumbnail_filename) if thumbnail_ok else None
+        }
+
+    async def upload_media(self, chat_id: int, media: dict):
+        async with self.upload_semaphore:
+            peer = await SmartPyro.resolve_peer(chat_id)
+            if media["type"] == "image":
+                uploaded = await SmartPyro.invoke(
+                    raw.functions.messages.UploadMedia(
+                        peer=peer,
+                        media=raw.types.InputMediaUploadedPhoto(file=await SmartPyro.save_file(media["filename"]))
+                    )
+                )
+                return raw.types.InputMediaPhoto(
+                    id=raw.types.InputPhoto(
+                        id=uploaded.photo.id,
+                        access_hash=uploaded.photo.access_hash,
+                        file_reference=uploaded.photo.file_reference
+                    )
+                )
+            uploaded = await SmartPyro.invoke(
+                raw.functions.messages.UploadMedia(
+                    peer=peer,
+                    media=raw.types.InputMediaUploadedDocument(
+                        file=await SmartPyro.save_file(media["filename"]),
+                        thumb=await SmartPyro.save_file(media["thumbnail"]) if media["thumbnail"] else None,
+                        mime_type="video/mp4",
+                        attributes=[
+                            raw.types.DocumentAttributeVideo(supports_streaming=True, duration=0, w=0, h=0),
+                            raw.types.DocumentAttributeFilename(file_name=os.path.basename(media["filename"]))
+                        ]
+                    )
+                )
+            )
+            return raw.types.InputMediaDocument(
+                id=raw.types.InputDocument(
+                    id=uploaded.document.id,
+                    access_hash=uploaded.document.access_hash,
+                    file_reference=uploaded.document.file_reference
+                )
+            )
+
+    async def prepare_media(self, chat_id: int, shortcode: str, index: int, media: dict):
+        downloaded = await self.download_media(shortcode, index, media)
+        if not downloaded:
+            return None
+        try:
+            return await self.upload_media(chat_id, downloaded)
+        except Exception as e:
+            LOGGER.error(f"Instagram media upload failed: {e}")
+            return None
+        finally:
+            clean_download(downloaded["filename"])
+            if downloaded["thumbnail"]:
+                clean_download(downloaded["thumbnail"])
+
+    async def pipeline(self, chat_id: int, shortcode: str, results: list) -> list:
+        prepared = await asyncio.gather(*(
+            self.prepare_media(chat_id, shortcode, index, media)
+            for index, media in enumerate(results, start=1)
+        ))
+        return [media for media in prepared if media is not None]
+
+async def send_prepared_group(chat_id: int, prepared: list) -> list:
+    messages = []
+    peer = await SmartPyro.resolve_peer(chat_id)
+    for i in range(0, len(prepared), Config.MAX_MEDIA_PER_GROUP):
+        updates = await SmartPyro.invoke(
+            raw.functions.messages.SendMultiMedia(
+                peer=peer,
+                multi_media=[
+                    raw.types.InputSingleMedia(media=media, random_id=SmartPyro.rnd_id(), message="")
+                    for media in prepared[i:i + Config.MAX_MEDIA_PER_GROUP]
+                ]
+            ),
+            sleep_threshold=60
+        )
+        messages += await utils.parse_messages(
+            SmartPyro,
+            raw.types.messages.Messages(
+                messages=[update.message for update in updates.updates if isinstance(update, (raw.types.UpdateNewMessage, raw.types.UpdateNewChannelMessage))],
+                users=updates.users,
+                chats=updates.chats
+            )
+        )
+    return messages
+
+async def send_cached_post(chat_id: int, items: list):
+    if len(items) == 1:
+        if items[0]["type"] == "video":
+            await SmartPyro.send_video(chat_id=chat_id, video=items[0]["file_id"], supports_streaming=True)
+        else:
+            await SmartPyro.send_photo(chat_id=chat_id, photo=items[0]["file_id"])
+        return
+    for i in range(0, len(items), Config.MAX_MEDIA_PER_GROUP):
+        await SmartPyro.send_media_group(
+            chat_id=chat_id,
+            media=[
+                InputMediaVideo(media=item["file_id"], supports_streaming=True) if item["type"] == "video" else InputMediaPhoto(media=item["file_id"])
+                for item in items[i:i + Config.MAX_MEDIA_PER_GROUP]
+            ]
+        )
+
+ig_downloader = InstagramDownloader(Config.TEMP_DIR)
+
 @dp.message(Command(commands=["in", "insta", "ig"], prefix=BotCommands))
 @new_task
 @SmartDefender
@@ -176,10 +277,17 @@ async def insta_handler(message: Message, bot: Bot):
             parse_mode=SmartParseMode.HTML
         )
         
-        ig_downloader = InstagramDownloader(Config.TEMP_DIR)
-        content_info = await ig_downloader.download_content(url, progress_message, content_type)
+        shortcode = extract_shortcode(url)
+        cached = ig_downloader.cached_post(shortcode)
+        if cached:
+            await send_cached_post(message.chat.id, cached)
+            await delete_messages(message.chat.id, progress_message.message_id)
+            LOGGER.info(f"Served Instagram post {shortcode} from cache")
+            return
+        
+        data = await ig_downloader.fetch_post(url)
         
-        if not content_info:
+        if not data:
             await delete_messages(message.chat.id, progress_message.message_id)
             await send_message(
                 chat_id=message.chat.id,
@@ -188,54 +296,81 @@ async def insta_handler(message: Message, bot: Bot):
             )
             return
         
-        media_files = content_info["media_files"]
-        content_type = content_info["type"]
+        results = data["results"]
+        post_type = "carousel" if data.get("media_count", 1) > 1 else ("video" if any(m["label"].startswith("video") for m in results) else "image")
         
-        if content_type in ["carousel", "image"]:
+        if post_type == "carousel" and len(results) > 1:
             await progress_message.edit_text(
                 "<code>📤 Uploading...</code>",
                 parse_mode=SmartParseMode.HTML
             )
-        
-        try:
-            if content_type == "carousel" and len(media_files) > 1:
-                for i in range(0, len(media_files), Config.MAX_MEDIA_PER_GROUP):
-                    media_group = []
-                    for media in media_files[i:i + Config.MAX_MEDIA_PER_GROUP]:
-                        if media["type"] == "image":
-                            media_group.append(
-                                InputMediaPhoto(
-                                    media=media["filename"]
-                                )
-                            )
-                        else:
-                            media_group.append(
-                                InputMediaVideo(
-                                    media=media["filename"],
-                                    thumb=media["thumbnail"] if media["thumbnail"] else None,
-                                    supports_streaming=True
-                                )
-                            )
-                    
-                    await SmartPyro.send_media_group(
-                        chat_id=message.chat.id,
-                        media=media_group
-                    )
-            else:
-                media = media_files[0]
-                if media["type"] == "video":
-                    await SmartPyro.send_video(
-                        chat_id=message.chat.id,
-                        video=media["filename"],
-                        thumb=media["thumbnail"] if media["thumbnail"] else None,
-                        supports_streaming=True
+            prepared = await ig_downloader.pipeline(message.chat.id, shortcode or "unknown", results)
+            if not prepared:
+                await delete_messages(message.chat.id, progress_message.message_id)
+                await send_message(
+                    chat_id=message.chat.id,
+                    text="<b>Unable To Extract The URL 😕</b>",
+                    parse_mode=SmartParseMode.HTML
+                )
+                return
+            try:
+                sent = await send_prepared_group(message.chat.id, prepared)
+                ig_downloader.remember_post(shortcode, sent)
+                await delete_messages(message.chat.id, progress_message.message_id)
+            except Exception as e:
+                LOGGER.error(f"Error uploading Instagram content: {str(e)}")
+                await Smart_Notify(bot, "insta", e, message)
+                try:
+                    await progress_message.edit_text(
+                        text="<b>❌ Sorry, failed to upload media</b>",
+                        parse_mode=SmartParseMode.HTML
                     )
-                else:
-                    await SmartPyro.send_photo(
+                except TelegramBadRequest:
+                    await send_message(
                         chat_id=message.chat.id,
-                        photo=media["filename"]
+                        text="<b>❌ Sorry, failed to upload media</b>",
+                        parse_mode=SmartParseMode.HTML
                     )
+            return
+        
+        if content_type in ["reel", "igtv"]:
+            await progress_message.edit_text(
+                "<b>Found ☑️ Downloading...</b>",
+                parse_mode=SmartParseMode.HTML
+            )
+        
+        media = await ig_downloader.download_media(shortcode or "unknown", 1, results[0])
+        
+        if not media:
+            await delete_messages(message.chat.id, progress_message.message_id)
+            await send_message(
+                chat_id=message.chat.id,
+                text="<b>Unable To Extract The URL 😕</b>",
+                parse_mode=SmartParseMode.HTML
+            )
+            return
+        
+        if media["type"] == "image":
+            await progress_message.edit_text(
+                "<code>📤 Uploading...</code>",
+                parse_mode=SmartParseMode.HTML
+            )
+        
+        try:
+            if media["type"] == "video":
+                sent = await SmartPyro.send_video(
+                    chat_id=message.chat.id,
+                    video=media["filename"],
+                    thumb=media["thumbnail"] if media["thumbnail"] else None,
+                    supports_streaming=True
+                )
+            else:
+                sent = await SmartPyro.send_photo(
+                    chat_id=message.chat.id,
+                    photo=media["filename"]
+                )
             
+            ig_downloader.remember_post(shortcode, [sent])
             await delete_messages(message.chat.id, progress_message.message_id)
             
         except Exception as e:
@@ -254,10 +389,9 @@ async def insta_handler(message: Message, bot: Bot):
                 )
         
         finally:
-            for media in media_files:
-                clean_download(media["filename"])
-                if media.get("thumbnail"):
-                    clean_download(media["thumbnail"])
+            clean_download(media["filename"])
+            if media.get("thumbnail"):
+                clean_download(media["thumbnail"])
     
     except Exception as e:
         LOGGER.error(f"Error processing Instagram command: {str(e)}")
@@ -1,4 +1,5 @@
 import os
+import html
 import asyncio
 from datetime import datetime
 from aiogram import Bot
@@ -14,18 +15,11 @@ from bot.helpers.notify import Smart_Notify
 from bot.helpers.guard import admin_only
 from bot.core.database import SmartGuards
 from config import UPDATE_CHANNEL_URL, OWNER_ID
-from bot.helpers.graph import SmartGraph
+from bot.helpers.graph import smart_graph
+from bot.helpers.logger import LOG_FILE
+from bot.helpers.logstore import smart_logs, parse_since, LEVELS
 
-smart_graph = SmartGraph()
-
-try:
-    loop = asyncio.get_event_loop()
-    if loop.is_running():
-        loop.create_task(smart_graph.initialize())
-    else:
-        loop.run_until_complete(smart_graph.initialize())
-except Exception as e:
-    LOGGER.error(f"Failed to create or access Telegraph account: {e}")
+LOG_PAGE_LINES = 20
 
 def validate_message(func):
     async def wrapper(message: Message, bot: Bot):
@@ -39,7 +33,7 @@ async def create_telegraph_page(content: str) -> list:
     try:
         truncated_content = content[:40000]
         max_size_bytes = 20 * 1024
-        pages = []
+        chunks = []
         page_content = ""
         current_size = 0
         lines = truncated_content.splitlines(keepends=True)
@@ -47,35 +41,22 @@ async def create_telegraph_page(content: str) -> list:
         for line in lines:
             line_bytes = line.encode('utf-8', errors='ignore')
             if current_size + len(line_bytes) > max_size_bytes and page_content:
-                page_url = await smart_graph.create_page(
-                    title="SmartLogs",
-                    content=page_content,
-                    author_name="SmartUtilBot",
-                    author_url="https://t.me/TheSmartDevs"
-                )
-                if not page_url:
-                    return []
-                pages.append(page_url)
+                chunks.append(page_content)
                 page_content = ""
                 current_size = 0
-                await asyncio.sleep(0.5)
 
             page_content += line
             current_size += len(line_bytes)
 
         if page_content:
-            page_url = await smart_graph.create_page(
-                title="SmartLogs",
-                content=page_content,
-                author_name="SmartUtilBot",
-                author_url="https://t.me/TheSmartDevs"
-            )
-            if not page_url:
-                return []
-            pages.append(page_url)
-            await asyncio.sleep(0.5)
+            chunks.append(page_content)
 
-        return pages
+        return await smart_graph.create_pages(
+            title="SmartLogs",
+            contents=chunks,
+            author_name="SmartUtilBot",
+            author_url="https://t.me/TheSmartDevs"
+        )
     except Exception as e:
         LOGGER.error(f"Failed to create Telegraph page: {e}")
         return []
@@ -84,6 +65,10 @@ async def create_telegraph_page(content: str) -> list:
 @validate_message
 @admin_only
 async def logs_command(message: Message, bot: Bot):
+    args = get_args(message)
+    if args and args[0].lower() == "grep":
+        await logs_grep(message, bot, args[1:])
+        return
     try:
         loading_message = await send_message(
             chat_id=message.chat.id,
@@ -93,7 +78,7 @@ async def logs_command(message: Message, bot: Bot):
 
         await asyncio.sleep(2)
 
-        if not os.path.exists("botlog.txt"):
+        if not os.path.exists(LOG_FILE):
             if loading_message:
                 try:
                     await bot.edit_message_text(
@@ -111,12 +96,9 @@ async def logs_command(message: Message, bot: Bot):
         LOGGER.info(f"User {message.from_user.id} is admin, sending log document")
 
         try:
-            file_size_bytes = os.path.getsize("botlog.txt")
+            line_count, file_size_bytes = await asyncio.get_running_loop().run_in_executor(None, smart_logs.refresh)
             file_size_kb = file_size_bytes / 1024
 
-            with open("botlog.txt", "r", encoding="utf-8", errors="ignore") as f:
-                line_count = sum(1 for _ in f)
-
             now = datetime.now()
             time_str = now.strftime("%H-%M-%S")
             date_str = now.strftime("%Y-%m-%d")
@@ -138,7 +120,7 @@ async def logs_command(message: Message, bot: Bot):
             buttons.button(text="❌ Close", callback_data="close_doc", position="footer")
             reply_markup = buttons.build_menu(b_cols=2, f_cols=1)
 
-            log_file = FSInputFile("botlog.txt")
+            log_file = FSInputFile(LOG_FILE)
             response = await bot.send_document(
                 chat_id=message.chat.id,
                 document=log_file,
@@ -174,7 +156,62 @@ async def logs_command(message: Message, bot: Bot):
             parse_mode=SmartParseMode.HTML
         )
 
-@dp.callback_query(lambda c: c.data in ["close_doc", "close_logs", "web_paste", "display_logs"])
+async def logs_grep(message: Message, bot: Bot, args: list):
+    if not args:
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>Usage:</b> <code>/logs grep pattern [level] [since]</code>\n<b>Example:</b> <code>/logs grep timeout ERROR 2h</code>",
+            parse_mode=SmartParseMode.HTML
+        )
+        return
+    pattern = args[0]
+    level = None
+    since = None
+    for arg in args[1:]:
+        if arg.upper() in LEVELS:
+            level = arg.upper()
+        else:
+            since = parse_since(" ".join(args[args.index(arg):]))
+            if since is None:
+                await send_message(
+                    chat_id=message.chat.id,
+                    text="<b>❌ Invalid since value. Use 30m, 2h, 1d or 2024-01-31</b>",
+                    parse_mode=SmartParseMode.HTML
+                )
+                return
+            break
+    try:
+        total, matches = await asyncio.get_running_loop().run_in_executor(None, smart_logs.grep, pattern, level, since)
+        if not matches:
+            await send_message(
+                chat_id=message.chat.id,
+                text="<b>No matching log lines found ❌</b>",
+                parse_mode=SmartParseMode.HTML
+            )
+            return
+        header = f"<b>Smart Logs Grep → {total} Matches</b>\n<b>Showing the latest {len(matches)}</b>\n"
+        body = ""
+        for file_name, line_number, line in reversed(matches):
+            entry = html.escape(f"{file_name}:{line_number} {line}"[:400]) + "\n"
+            if len(header) + len(body) + len(entry) > 4000:
+                break
+            body = entry + body
+        await send_message(
+            chat_id=message.chat.id,
+            text=f"{header}<pre>{body}</pre>",
+            parse_mode=SmartParseMode.HTML
+        )
+        LOGGER.info(f"Log grep for '{pattern}' returned {total} matches for user_id {message.from_user.id}")
+    except Exception as e:
+        await Smart_Notify(bot, "logs_grep", e, message)
+        LOGGER.error(f"Failed to grep logs for user_id {message.from_user.id}: {e}")
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>❌ Failed to search logs!</b>",
+            parse_mode=SmartParseMode.HTML
+        )
+
+@dp.callback_query(lambda c: c.data in ["close_doc", "close_logs", "web_paste", "display_logs"] or c.data.startswith("logs_page_"))
 async def handle_logs_callback(query: CallbackQuery, bot: Bot):
     user_id = query.from_user.id
     auth_admins_data = await SmartGuards.find({}, {"user_id": 1, "_id": 0}).to_list(None)
@@ -207,7 +244,7 @@ async def handle_logs_callback(query: CallbackQuery, bot: Bot):
             except Exception as e:
                 LOGGER.error(f"Error editing caption for telegraph upload: {e}")
 
-            if not os.path.exists("botlog.txt"):
+            if not os.path.exists(LOG_FILE):
                 try:
                     await query.message.edit_caption(
                         caption="<b>Sorry, No Logs Found ❌</b>",
@@ -219,8 +256,7 @@ async def handle_logs_callback(query: CallbackQuery, bot: Bot):
                 return
 
             try:
-                with open("botlog.txt", "r", encoding="utf-8", errors="ignore") as f:
-                    logs_content = f.read()
+                logs_content = await asyncio.get_running_loop().run_in_executor(None, smart_logs.head, 40000)
 
                 telegraph_urls = await create_telegraph_page(logs_content)
 
@@ -235,12 +271,9 @@ async def handle_logs_callback(query: CallbackQuery, bot: Bot):
                     buttons.button(text="❌ Close", callback_data="close_doc", position="footer")
                     reply_markup = buttons.build_menu(b_cols=2, f_cols=1)
 
-                    file_size_bytes = os.path.getsize("botlog.txt")
+                    line_count, file_size_bytes = await asyncio.get_running_loop().run_in_executor(None, smart_logs.refresh)
                     file_size_kb = file_size_bytes / 1024
 
-                    with open("botlog.txt", "r", encoding="utf-8", errors="ignore") as f:
-                        line_count = sum(1 for _ in f)
-
                     now = datetime.now()
                     time_str = now.strftime("%H-%M-%S")
                     date_str = now.strftime("%Y-%m-%d")
@@ -278,15 +311,19 @@ async def handle_logs_callback(query: CallbackQuery, bot: Bot):
             await send_logs_page(bot, query.message.chat.id)
             await query.answer()
 
+        elif data.startswith("logs_page_"):
+            await send_logs_page(bot, query.message.chat.id, int(data.rsplit("_", 1)[1]), query.message)
+            await query.answer()
+
     except Exception as e:
         await Smart_Notify(bot, "handle_logs_callback", e)
         LOGGER.error(f"Failed to handle logs callback for user_id {user_id}: {e}")
         await query.answer("❌ Failed to process callback!", show_alert=True)
 
-async def send_logs_page(bot: Bot, chat_id: int):
-    LOGGER.info(f"Sending latest logs to chat {chat_id}")
+async def send_logs_page(bot: Bot, chat_id: int, start: int = None, message: Message = None):
+    LOGGER.info(f"Sending logs page {start or 'latest'} to chat {chat_id}")
 
-    if not os.path.exists("botlog.txt"):
+    if not os.path.exists(LOG_FILE):
         await send_message(
             chat_id=chat_id,
             text="<b>Sorry, No Logs Found ❌</b>",
@@ -295,18 +332,26 @@ async def send_logs_page(bot: Bot, chat_id: int):
         return
 
     try:
-        with open("botlog.txt", "r", encoding="utf-8", errors="ignore") as f:
-            logs = f.readlines()
-
-        latest_logs = logs[-20:] if len(logs) > 20 else logs
-        text = "".join(latest_logs)
-
-        if len(text) > 4096:
-            text = text[-4096:]
+        loop = asyncio.get_running_loop()
+        line_count, _ = await loop.run_in_executor(None, smart_logs.refresh)
+        if start is None:
+            start = max(1, line_count - LOG_PAGE_LINES + 1)
+        text = await loop.run_in_executor(None, smart_logs.lines, start, LOG_PAGE_LINES, 4096)
 
         buttons = SmartButtons()
-        buttons.button(text="🔙 Back", callback_data="close_logs")
-        reply_markup = buttons.build_menu(b_cols=1)
+        if start > 1:
+            buttons.button(text="⬅️ Older", callback_data=f"logs_page_{max(1, start - LOG_PAGE_LINES)}")
+        if start + LOG_PAGE_LINES <= line_count:
+            buttons.button(text="Newer ➡️", callback_data=f"logs_page_{start + LOG_PAGE_LINES}")
+        buttons.button(text="🔙 Back", callback_data="close_logs", position="footer")
+        reply_markup = buttons.build_menu(b_cols=2, f_cols=1)
+
+        if message:
+            await message.edit_text(
+                text=text if text else "No logs available.❌",
+                reply_markup=reply_markup
+            )
+            return
 
         await send_message(
             chat_id=chat_id,
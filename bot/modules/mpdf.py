@@ -1,7 +1,9 @@
 import asyncio
 import os
+import re
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict
 
@@ -25,6 +27,11 @@ DOWNLOADS_DIR = "./downloads"
 MAX_PDFS = 10
 MAX_FILE_SIZE = 50 * 1024 * 1024
 SESSION_TIMEOUT = 300
+PROGRESS_INTERVAL = 2
+PAGE_SPEC_PATTERN = re.compile(r'^\s*\d+(\s*-\s*\d+)?(\s*,\s*\d+(\s*-\s*\d+)?)*\s*$')
+PAGE_SPEC_CHARS = re.compile(r'^[\d\s,\-]+$')
+
+executor = ThreadPoolExecutor(max_workers=4)
 
 user_sessions: Dict[int, 'UserSession'] = {}
 
@@ -40,12 +47,14 @@ class UserSession:
         os.makedirs(self.user_dir, exist_ok=True)
         os.makedirs(DOWNLOADS_DIR, exist_ok=True)
 
-    def add_pdf(self, file_path: str, file_name: str, file_size: int, file_id: str):
+    def add_pdf(self, file_path: str, file_name: str, file_size: int, file_id: str, page_count: int = 0, pages: str = None):
         self.pdfs.append({
             'path': file_path,
             'name': file_name,
             'size': file_size,
-            'file_id': file_id
+            'file_id': file_id,
+            'page_count': page_count,
+            'pages': pages
         })
         self.last_activity = datetime.now()
 
@@ -108,6 +117,70 @@ def format_size(size_bytes: int) -> str:
         size_bytes /= 1024.0
     return f"{size_bytes:.2f} TB"
 
+def parse_page_spec(spec: str, page_count: int) -> list:
+    if not spec:
+        return list(range(page_count))
+    indices = []
+    for part in spec.split(','):
+        bounds = [int(value) for value in part.split('-')]
+        first, last = bounds[0], bounds[-1]
+        if first > last:
+            first, last = last, first
+        for number in range(max(first, 1), min(last, page_count) + 1):
+            indices.append(number - 1)
+    return indices
+
+def check_page_spec(spec: str, page_count: int) -> str:
+    for part in spec.split(','):
+        for value in part.split('-'):
+            if not 1 <= int(value) <= page_count:
+                return f"Page {int(value)} is out of range, this PDF has {page_count} pages"
+    return None
+
+def inspect_pdf(file_path: str):
+    reader = PdfReader(file_path)
+    if reader.is_encrypted:
+        return True, 0
+    return False, len(reader.pages)
+
+def merge_pdfs_sync(pdfs: list, output_path: str, progress=None) -> int:
+    merger = PdfWriter()
+    total_pages = 0
+    try:
+        for index, pdf in enumerate(pdfs, start=1):
+            try:
+                reader = PdfReader(pdf['path'])
+                if reader.is_encrypted:
+                    raise ValueError(f"Cannot merge: '{pdf['name']}' is password-protected!")
+                pages = parse_page_spec(pdf.get('pages'), len(reader.pages))
+                if not pages:
+                    raise ValueError(f"No pages selected from '{pdf['name']}'")
+                merger.append(reader, pages=pages, import_outline=False)
+            except ValueError:
+                raise
+            except FileNotDecryptedError:
+                raise ValueError(f"Cannot merge: '{pdf['name']}' is encrypted!")
+            except Exception as e:
+                raise ValueError(f"Error reading '{pdf['name']}': {str(e)}") from e
+            total_pages += len(pages)
+            if progress:
+                progress(index, len(pdfs))
+        merger.compress_identical_objects(remove_identicals=True, remove_orphans=True)
+        with open(output_path, 'wb') as output_file:
+            merger.write(output_file)
+    finally:
+        merger.close()
+    return total_pages
+
+async def update_merge_progress(message: Message, done: int, total: int):
+    try:
+        await message.edit_text(
+            f"<b>Merging Your PDFs.....🕣</b>\n<b>Files:</b> <code>{done}/{total}</code>",
+            parse_mode=ParseMode.HTML
+        )
+    except Exception:
+        pass
+
 @dp.message(Command(commands=["mpdf"], prefix=BotCommands))
 @new_task
 @SmartDefender
@@ -144,7 +217,8 @@ async def mpdf_command(message: Message, bot: Bot):
                 "• Custom order selection\n"
                 "• Set custom title\n"
                 "• Maintains quality\n"
-                "• Max 50 MB per file\n\n"
+                "• Max 50 MB per file\n"
+                "• Pick pages with a caption like <code>1-3,7</code>\n\n"
                 "<b>📝 Instructions:</b>\n"
                 "1️⃣ Send PDF files one by one\n"
                 "2️⃣ Reorder files if needed\n"
@@ -215,6 +289,16 @@ async def handle_document(message: Message, bot: Bot):
         )
         return
 
+    page_spec = message.caption.strip() if message.caption and PAGE_SPEC_PATTERN.match(message.caption) else None
+
+    if message.caption and not page_spec and PAGE_SPEC_CHARS.match(message.caption):
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>❌ Invalid page range! Use a caption like <code>1-3,7</code></b>",
+            parse_mode=ParseMode.HTML
+        )
+        return
+
     if session.is_duplicate(document.file_id):
         await send_message(
             chat_id=message.chat.id,
@@ -241,8 +325,8 @@ async def handle_document(message: Message, bot: Bot):
         await bot.download_file(file.file_path, file_path)
 
         try:
-            reader = PdfReader(file_path)
-            if reader.is_encrypted:
+            is_encrypted, page_count = await asyncio.get_running_loop().run_in_executor(executor, inspect_pdf, file_path)
+            if is_encrypted:
                 await delete_messages(message.chat.id, download_msg.message_id)
                 await send_message(
                     chat_id=message.chat.id,
@@ -264,7 +348,18 @@ async def handle_document(message: Message, bot: Bot):
             LOGGER.error(f"PDF validation error for user {user_id}: {e}")
             return
 
-        session.add_pdf(file_path, document.file_name, document.file_size, document.file_id)
+        spec_error = check_page_spec(page_spec, page_count) if page_spec else None
+        if spec_error:
+            await delete_messages(message.chat.id, download_msg.message_id)
+            await send_message(
+                chat_id=message.chat.id,
+                text=f"<b>❌ {spec_error}! Send the PDF again with a valid range.</b>",
+                parse_mode=ParseMode.HTML
+            )
+            clean_download(file_path)
+            return
+
+        session.add_pdf(file_path, document.file_name, document.file_size, document.file_id, page_count, page_spec)
 
         await delete_messages(message.chat.id, download_msg.message_id)
 
@@ -279,6 +374,7 @@ async def handle_document(message: Message, bot: Bot):
                 f"<b>✅ PDF Added Successfully!</b>\n\n"
                 f"<b>📄 File:</b> {document.file_name}\n"
                 f"<b>📦 Size:</b> {format_size(document.file_size)}\n"
+                f"<b>📑 Pages:</b> {page_spec or 'All'} of {page_count}\n"
                 f"<b>📊 Total PDFs:</b> {pdf_count}/{MAX_PDFS}\n"
                 f"<b>💾 Total Size:</b> {format_size(total_size)}\n\n"
                 f"Send more PDFs"
@@ -447,49 +543,33 @@ async def handle_callback(callback: CallbackQuery, bot: Bot):
             try:
                 start_time = time.time()
 
-                merger = PdfWriter()
-
-                for pdf in session.pdfs:
-                    LOGGER.info(f"Adding PDF to merger: {pdf['path']}")
-                    try:
-                        reader = PdfReader(pdf['path'])
-                        if reader.is_encrypted:
-                            await merge_msg.edit_text(
-                                f"<b>❌ Cannot merge: '{pdf['name']}' is password-protected!</b>",
-                                parse_mode=ParseMode.HTML
-                            )
-                            session.cleanup()
-                            del user_sessions[user_id]
-                            return
-                        for page in reader.pages:
-                            merger.add_page(page)
-                    except FileNotDecryptedError:
-                        await merge_msg.edit_text(
-                            f"<b>❌ Cannot merge: '{pdf['name']}' is encrypted!</b>",
-                            parse_mode=ParseMode.HTML
-                        )
-                        session.cleanup()
-                        del user_sessions[user_id]
-                        return
-                    except Exception as e:
-                        await merge_msg.edit_text(
-                            f"<b>❌ Error reading '{pdf['name']}': {str(e)}</b>",
-                            parse_mode=ParseMode.HTML
-                        )
-                        session.cleanup()
-                        del user_sessions[user_id]
-                        return
-
                 output_filename = session.custom_title if session.custom_title else f"Merged_PDF_{int(datetime.now().timestamp())}"
                 if not output_filename.endswith('.pdf'):
                     output_filename += '.pdf'
 
                 output_path = os.path.join(session.user_dir, output_filename)
 
-                with open(output_path, 'wb') as output_file:
-                    merger.write(output_file)
+                loop = asyncio.get_running_loop()
+                last_update = [0]
 
-                merger.close()
+                def report(done, total):
+                    now = time.time()
+                    if done < total and now - last_update[0] < PROGRESS_INTERVAL:
+                        return
+                    last_update[0] = now
+                    asyncio.run_coroutine_threadsafe(update_merge_progress(merge_msg, done, total), loop)
+
+                try:
+                    total_pages = await loop.run_in_executor(executor, merge_pdfs_sync, session.pdfs, output_path, report)
+                except ValueError as e:
+                    await merge_msg.edit_text(
+                        f"<b>❌ {e}</b>",
+                        parse_mode=ParseMode.HTML
+                    )
+                    clean_download(output_path)
+                    session.cleanup()
+                    del user_sessions[user_id]
+                    return
 
                 LOGGER.info(f"User {user_id} merged {pdf_count} PDFs into {output_filename}")
 
@@ -508,6 +588,7 @@ async def handle_callback(callback: CallbackQuery, bot: Bot):
                         f"<b>✅ PDF Merged Successfully!</b>\n\n"
                         f"<b>📄 Filename:</b> {output_filename}\n"
                         f"<b>📊 Total PDFs Merged:</b> {pdf_count}\n"
+                        f"<b>📑 Total Pages:</b> {total_pages}\n"
                         f"<b>💾 File Size:</b> {format_size(file_size)}\n"
                         f"<b>⏱️ Time Taken:</b> {time_taken:.2f}s"
                     ),
@@ -1,10 +1,12 @@
 import asyncio
 import os
+import shutil
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from io import BytesIO
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
 
 from aiogram import Bot
 from aiogram.filters import Command
@@ -12,22 +14,30 @@ from aiogram.types import Message, CallbackQuery, FSInputFile
 from aiogram.enums import ParseMode, ChatType
 from PIL import Image, ImageDraw, ImageFont
 from reportlab.lib.pagesizes import A4
+from reportlab import rl_config
 from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-from pypdf import PdfReader, PdfWriter
+from reportlab.lib.pdfencrypt import StandardEncryption
 
 from bot import dp
 from bot.helpers.botutils import send_message, delete_messages, get_args
 from bot.helpers.commands import BotCommands
 from bot.helpers.buttons import SmartButtons
 from bot.helpers.logger import LOGGER
-from bot.helpers.utils import new_task, clean_download
+from bot.helpers.utils import new_task, clean_download, get_process_pool
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.defend import SmartDefender
 
 user_states: Dict[int, Dict] = {}
 user_data: Dict[int, Dict] = {}
 
+DOWNLOADS_DIR = "./downloads"
+MAX_IMAGES = 100
+
+WATERMARK_FONT_SIZE = 60
+
+executor = ThreadPoolExecutor(max_workers=4)
+rl_config.useA85 = 0
+
 PAGE_SIZES = {"a4": "A4", "auto": "Auto Fit"}
 DPI_OPTIONS = {72: "Web (72)", 150: "Standard (150)", 300: "Print (300)", 600: "High (600)"}
 FIT_MODES = {"shrink": "Shrink To Fit", "crop": "Crop To Fit"}
@@ -51,7 +61,18 @@ def set_state(user_id: int, state: str):
 
 def clear_state(user_id: int):
     user_states.pop(user_id, None)
-    user_data.pop(user_id, None)
+    cleanup_workdir(user_data.pop(user_id, None))
+
+def cleanup_workdir(data: Dict):
+    if not data:
+        return
+    for task in data.get("pages", []):
+        task.cancel()
+    data["pages"] = []
+    workdir = data.pop("workdir", None)
+    if workdir:
+        shutil.rmtree(workdir, ignore_errors=True)
+        LOGGER.info(f"Removed PDF work directory {workdir}")
 
 def get_data(user_id: int) -> Dict:
     return user_data.get(user_id, {})
@@ -195,7 +216,7 @@ async def pdf_handler(message: Message, bot: Bot):
             "cover_page": None,
             "watermark": None,
             "password": None,
-            "images": []
+            "pages": []
         }
         set_data(user_id, data)
         set_state(user_id, "pdf_settings")
@@ -472,7 +493,9 @@ async def pdf_back_settings(callback: CallbackQuery, bot: Bot):
 async def pdf_start_processing(callback: CallbackQuery, bot: Bot):
     user_id = callback.from_user.id
     data = get_data(user_id)
-    data["images"] = []
+    cleanup_workdir(data)
+    os.makedirs(DOWNLOADS_DIR, exist_ok=True)
+    data["workdir"] = tempfile.mkdtemp(prefix=f"pdf_{user_id}_", dir=DOWNLOADS_DIR)
     set_data(user_id, data)
     set_state(user_id, "collecting_images")
 
@@ -503,17 +526,19 @@ async def collect_image(message: Message, bot: Bot):
     user_id = message.from_user.id
     data = get_data(user_id)
 
-    if len(data.get("images", [])) >= 100:
+    if len(data.get("pages", [])) >= MAX_IMAGES:
         await send_message(message.chat.id, "❌ Maximum 100 images allowed!", ParseMode.HTML)
         return
 
-    photo = message.photo[-1]
-    file = await bot.get_file(photo.file_id)
-    img_bytes = await bot.download_file(file.file_path)
-    data["images"].append(img_bytes.read())
+    index = len(data["pages"])
+    source_path = os.path.join(data["workdir"], f"{index:03d}_source.jpg")
+    page_path = os.path.join(data["workdir"], f"{index:03d}_page.jpg")
+    data["pages"].append(asyncio.create_task(
+        spool_page(bot, message.photo[-1].file_id, source_path, page_path, data.get("watermark"), data.get("dpi", 150))
+    ))
     set_data(user_id, data)
 
-    count = len(data["images"])
+    count = len(data["pages"])
     page_size_text = "A4" if data.get("page_size") == "a4" else "AUTO"
     page_nums_text = "No" if not data.get("page_numbers") else "Yes"
     watermark_text = "No" if not data.get("watermark") else "Yes"
@@ -538,27 +563,105 @@ async def collect_image(message: Message, bot: Bot):
         parse_mode=ParseMode.HTML
     )
 
+async def spool_page(bot: Bot, file_id: str, source_path: str, page_path: str, watermark: str, dpi: int) -> Dict:
+    file = await bot.get_file(file_id)
+    await bot.download_file(file.file_path, destination=source_path)
+    return await asyncio.get_running_loop().run_in_executor(
+        get_process_pool(), prepare_page, source_path, page_path, watermark, dpi
+    )
+
+@lru_cache(maxsize=4)
+def load_watermark_font(size: int):
+    try:
+        return ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size)
+    except:
+        try:
+            return ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", size)
+        except:
+            return ImageFont.load_default()
+
+@lru_cache(maxsize=32)
+def render_watermark(text: str, size: int) -> Image.Image:
+    font = load_watermark_font(size)
+    bbox = ImageDraw.Draw(Image.new('RGBA', (1, 1))).textbbox((0, 0), text, font=font)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+
+    watermark_img = Image.new('RGBA', (text_width + 40, text_height + 40), (255, 255, 255, 0))
+    watermark_draw = ImageDraw.Draw(watermark_img)
+    watermark_draw.text((20, 20), text, font=font, fill=(128, 128, 128, 128))
+
+    return watermark_img.rotate(45, expand=True)
+
+def prepare_page(source_path: str, page_path: str, watermark: str, dpi: int) -> Dict:
+    img = Image.open(source_path)
+
+    if not watermark and img.format == 'JPEG' and img.mode in ('RGB', 'L'):
+        width, height = img.size
+        img.close()
+        os.replace(source_path, page_path)
+        return {"path": page_path, "width": width, "height": height}
+
+    if watermark:
+        watermark_img = render_watermark(watermark, WATERMARK_FONT_SIZE)
+
+        position = ((img.width - watermark_img.width) // 2, (img.height - watermark_img.height) // 2)
+
+        if img.mode != 'RGBA':
+            img = img.convert('RGBA')
+
+        img.paste(watermark_img, position, watermark_img)
+
+    if img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+
+    img.save(page_path, format='JPEG', dpi=(dpi, dpi))
+    width, height = img.size
+    img.close()
+    os.remove(source_path)
+    return {"path": page_path, "width": width, "height": height}
+
+async def collect_pages(data: Dict) -> Tuple[list, int]:
+    results = await asyncio.gather(*data.get("pages", []), return_exceptions=True)
+    pages = []
+    skipped = 0
+    for result in results:
+        if isinstance(result, BaseException):
+            LOGGER.error(f"Failed to prepare PDF page: {result}")
+            skipped += 1
+            continue
+        pages.append(result)
+    return pages, skipped
+
 @dp.callback_query(lambda c: c.data == "pdf_generate")
 async def pdf_generate(callback: CallbackQuery, bot: Bot):
     user_id = callback.from_user.id
     data = get_data(user_id)
-    if not data.get("images"):
+    if get_state(user_id) != "collecting_images":
+        await callback.answer("Session expired!", show_alert=True)
+        return
+    if not data.get("pages"):
         await callback.answer("❌ No images to generate PDF!", show_alert=True)
         return
 
+    set_state(user_id, "generating")
     await callback.message.delete()
     proc_msg = await send_message(callback.message.chat.id, "<b>⏳ Processing Your Document...</b>", ParseMode.HTML)
     start = time.time()
     temp_path = None
 
     try:
-        temp_path = await asyncio.get_event_loop().run_in_executor(None, generate_pdf_sync, data)
+        pages, skipped = await collect_pages(data)
+        if not pages:
+            raise ValueError("No images could be processed")
+        temp_path = await asyncio.get_running_loop().run_in_executor(executor, generate_pdf_sync, data, pages)
         await proc_msg.edit_text("<b>📤 Uploading......</b>")
 
         size = os.path.getsize(temp_path)
         size_text = f"{size/1024:.2f} KB" if size < 1024*1024 else f"{size/(1024*1024):.2f} MB"
         time_taken = f"{time.time() - start:.2f}s"
         filename = f"{data.get('title', 'Document')}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+        skipped_text = f"<b>⚠️ Skipped :</b> {skipped} unreadable images\n" if skipped else ""
 
         caption = (
             f"<b>🔍 Successfully Generated PDF 📋</b><b>┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉</b>\n"
@@ -570,7 +673,8 @@ async def pdf_generate(callback: CallbackQuery, bot: Bot):
             f"<b> Fit mode:</b> {data.get('fit_mode', 'shrink').capitalize()}\n"
             f"<b> Page numbers: </b> {'Yes' if data.get('page_numbers') else 'No'}\n"
             f"<b>Watermarks :</b> {'Yes' if data.get('watermark') else 'No'}\n"
-            f"<b>Images :</b> {len(data.get('images', []))}/100\n"
+            f"<b>Images :</b> {len(pages)}/100\n"
+            f"{skipped_text}"
             f"<b>┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉┉</b>\n"
             f"<b>🔍Thanks For Using Smart Tool 🤖</b>"
         )
@@ -591,7 +695,30 @@ async def pdf_generate(callback: CallbackQuery, bot: Bot):
 
     clear_state(user_id)
 
-def generate_pdf_sync(data: dict) -> str:
+def draw_cover_page(c: canvas.Canvas, data: dict, page_width: float, page_height: float):
+    c.setFont("Helvetica-Bold", 48)
+    title_text = data.get("title", "Document")
+    text_width = c.stringWidth(title_text, "Helvetica-Bold", 48)
+    c.drawString((page_width - text_width) / 2, page_height / 2, title_text)
+
+    c.setFont("Helvetica", 16)
+    date_text = datetime.now().strftime("%B %d, %Y")
+    date_width = c.stringWidth(date_text, "Helvetica", 16)
+    c.drawString((page_width - date_width) / 2, page_height / 2 - 60, date_text)
+
+    if data["cover_page"] == "bold":
+        c.setFillColorRGB(0.2, 0.2, 0.2)
+        c.rect(50, page_height / 2 - 100, page_width - 100, 200, fill=1)
+        c.setFillColorRGB(1, 1, 1)
+        c.drawString((page_width - text_width) / 2, page_height / 2, title_text)
+    elif data["cover_page"] == "minimal":
+        c.setStrokeColorRGB(0.5, 0.5, 0.5)
+        c.setLineWidth(2)
+        c.line(100, page_height / 2 - 80, page_width - 100, page_height / 2 - 80)
+
+    c.showPage()
+
+def generate_pdf_sync(data: dict, pages: list) -> str:
     fd, temp_path = tempfile.mkstemp(suffix='.pdf')
     os.close(fd)
 
@@ -599,51 +726,19 @@ def generate_pdf_sync(data: dict) -> str:
         if data.get("page_size") == "a4":
             page_width, page_height = A4
         else:
-            first_img = Image.open(BytesIO(data.get("images", [])[0]))
-            aspect = first_img.width / first_img.height
+            aspect = pages[0]["width"] / pages[0]["height"]
             page_width = 595
             page_height = page_width / aspect
 
-        c = canvas.Canvas(temp_path, pagesize=(page_width, page_height))
+        encrypt = StandardEncryption(data["password"], strength=128) if data.get("password") else None
+        c = canvas.Canvas(temp_path, pagesize=(page_width, page_height), encrypt=encrypt)
 
-        for idx, img_data in enumerate(data.get("images", []), 1):
-            img = Image.open(BytesIO(img_data))
-
-            if data.get("watermark"):
-                draw = ImageDraw.Draw(img)
-                try:
-                    font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 60)
-                except:
-                    try:
-                        font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 60)
-                    except:
-                        font = ImageFont.load_default()
-
-                bbox = draw.textbbox((0, 0), data["watermark"], font=font)
-                text_width = bbox[2] - bbox[0]
-                text_height = bbox[3] - bbox[1]
-
-                watermark_img = Image.new('RGBA', (text_width + 40, text_height + 40), (255, 255, 255, 0))
-                watermark_draw = ImageDraw.Draw(watermark_img)
-                watermark_draw.text((20, 20), data["watermark"], font=font, fill=(128, 128, 128, 128))
-
-                watermark_img = watermark_img.rotate(45, expand=True)
-
-                position = ((img.width - watermark_img.width) // 2, (img.height - watermark_img.height) // 2)
-
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
-
-                img.paste(watermark_img, position, watermark_img)
-                img = img.convert('RGB')
-
-            img_buffer = BytesIO()
-            img.save(img_buffer, format='JPEG', dpi=(data.get("dpi", 150), data.get("dpi", 150)))
-            img_buffer.seek(0)
+        if data.get("cover_page"):
+            draw_cover_page(c, data, page_width, page_height)
 
-            img_reader = ImageReader(img_buffer)
-            img_width_points = img.width * 72 / data.get("dpi", 150)
-            img_height_points = img.height * 72 / data.get("dpi", 150)
+        for idx, page in enumerate(pages, 1):
+            img_width_points = page["width"] * 72 / data.get("dpi", 150)
+            img_height_points = page["height"] * 72 / data.get("dpi", 150)
 
             if data.get("fit_mode") == "shrink":
                 if img_width_points > page_width or img_height_points > page_height:
@@ -658,7 +753,7 @@ def generate_pdf_sync(data: dict) -> str:
             x_pos = (page_width - img_width_points) / 2
             y_pos = (page_height - img_height_points) / 2
 
-            c.drawImage(img_reader, x_pos, y_pos, width=img_width_points, height=img_height_points)
+            c.drawImage(page["path"], x_pos, y_pos, width=img_width_points, height=img_height_points)
 
             if data.get("page_numbers"):
                 c.setFont("Helvetica", 10)
@@ -684,94 +779,9 @@ def generate_pdf_sync(data: dict) -> str:
 
         c.save()
 
-        if data.get("cover_page"):
-            cover_fd, cover_path = tempfile.mkstemp(suffix='.pdf')
-            os.close(cover_fd)
-
-            try:
-                cover_canvas = canvas.Canvas(cover_path, pagesize=(page_width, page_height))
-
-                cover_canvas.setFont("Helvetica-Bold", 48)
-                title_text = data.get("title", "Document")
-                text_width = cover_canvas.stringWidth(title_text, "Helvetica-Bold", 48)
-                cover_canvas.drawString((page_width - text_width) / 2, page_height / 2, title_text)
-
-                cover_canvas.setFont("Helvetica", 16)
-                date_text = datetime.now().strftime("%B %d, %Y")
-                date_width = cover_canvas.stringWidth(date_text, "Helvetica", 16)
-                cover_canvas.drawString((page_width - date_width) / 2, page_height / 2 - 60, date_text)
-
-                if data["cover_page"] == "bold":
-                    cover_canvas.setFillColorRGB(0.2, 0.2, 0.2)
-                    cover_canvas.rect(50, page_height / 2 - 100, page_width - 100, 200, fill=1)
-                    cover_canvas.setFillColorRGB(1, 1, 1)
-                    cover_canvas.drawString((page_width - text_width) / 2, page_height / 2, title_text)
-                elif data["cover_page"] == "minimal":
-                    cover_canvas.setStrokeColorRGB(0.5, 0.5, 0.5)
-                    cover_canvas.setLineWidth(2)
-                    cover_canvas.line(100, page_height / 2 - 80, page_width - 100, page_height / 2 - 80)
-
-                cover_canvas.save()
-
-                final_fd, final_path = tempfile.mkstemp(suffix='.pdf')
-                os.close(final_fd)
-
-                writer = PdfWriter()
-
-                with open(cover_path, 'rb') as cover_file:
-                    cover_reader = PdfReader(cover_file)
-                    writer.add_page(cover_reader.pages[0])
-
-                with open(temp_path, 'rb') as content_file:
-                    content_reader = PdfReader(content_file)
-                    for page in content_reader.pages:
-                        writer.add_page(page)
-
-                if data.get("password"):
-                    writer.encrypt(data["password"])
-
-                with open(final_path, 'wb') as output_file:
-                    writer.write(output_file)
-
-                os.unlink(cover_path)
-                os.unlink(temp_path)
-
-                return final_path
-
-            except Exception as e:
-                if os.path.exists(cover_path):
-                    os.unlink(cover_path)
-                raise e
-
-        elif data.get("password"):
-            protected_fd, protected_path = tempfile.mkstemp(suffix='.pdf')
-            os.close(protected_fd)
-
-            try:
-                writer = PdfWriter()
-
-                with open(temp_path, 'rb') as input_file:
-                    reader = PdfReader(input_file)
-                    for page in reader.pages:
-                        writer.add_page(page)
-
-                writer.encrypt(data["password"])
-
-                with open(protected_path, 'wb') as output_file:
-                    writer.write(output_file)
-
-                os.unlink(temp_path)
-
-                return protected_path
-
-            except Exception as e:
-                if os.path.exists(protected_path):
-                    os.unlink(protected_path)
-                raise e
-
         return temp_path
 
     except Exception as e:
         if os.path.exists(temp_path):
             os.unlink(temp_path)
-        raise e
\ No newline at end of file
+        raise e
@@ -1,5 +1,12 @@
 import io
 import os
+import re
+import csv
+import time
+import shutil
+import asyncio
+import tempfile
+import zipfile
 from typing import Dict
 import qrcode
 from qrcode import ERROR_CORRECT_L, ERROR_CORRECT_M, ERROR_CORRECT_Q, ERROR_CORRECT_H
@@ -9,18 +16,25 @@ from qrcode.image.styles.moduledrawers import (
     CircleModuleDrawer,
 )
 from PIL import Image, ImageDraw, ImageFont
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen.canvas import Canvas
 from aiogram import Bot
 from aiogram.filters import Command
-from aiogram.types import Message, CallbackQuery, FSInputFile
+from aiogram.types import Message, CallbackQuery
 from aiogram.enums import ParseMode, ChatType
-from bot import dp
+from aiogram.exceptions import TelegramBadRequest
+from pyrogram.enums import ParseMode as SmartParseMode
+from bot import dp, SmartPyro
 from bot.helpers.botutils import send_message, delete_messages
 from bot.helpers.commands import BotCommands
 from bot.helpers.buttons import SmartButtons
 from bot.helpers.logger import LOGGER
-from bot.helpers.utils import new_task, clean_download
+from bot.helpers.utils import new_task, get_process_pool, PROCESS_WORKERS
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.defend import SmartDefender
+from bot.helpers.cards import FONT_BOLD, get_font, encode_png
+from bot.helpers.artifacts import artifact_key, smart_artifacts
 
 user_states: Dict[int, Dict] = {}
 user_data: Dict[int, Dict] = {}
@@ -35,6 +49,21 @@ STYLES = {
     "green": {"drawer": CircleModuleDrawer(), "color": (0, 128, 0)},
 }
 LOGO_SHAPES = {"square": "⬜ Square", "circle": "⭕ Circle", "rounded": "⏹ Rounded"}
+STYLE_LABELS = {"classic": "⬛ Classic", "blue": "🔵 Blue", "gradient": "🌈 Gradient", "dark": "⚫ Dark", "green": "🟢 Green"}
+
+DOWNLOADS_DIR = "./downloads"
+MAX_TEXT_LENGTH = 2953
+BATCH_MAX_ITEMS = 1000
+BATCH_MAX_PDF_ITEMS = 240
+BATCH_MAX_FILE_MB = 5
+BATCH_WINDOW = PROCESS_WORKERS * 8
+BATCH_PROGRESS_INTERVAL = 3
+BATCH_GRID_COLUMNS = 3
+BATCH_GRID_ROWS = 4
+BATCH_GRID_MARGIN = 36
+BATCH_CAPTION_HEIGHT = 14
+
+batch_sessions: Dict[int, Dict] = {}
 
 
 def get_state(user_id: int) -> str:
@@ -283,7 +312,7 @@ async def message_handler(message: Message, bot: Bot):
 
             LOGGER.info(f"Processing {full_name}'s QR input")
 
-            if len(text) > 2953:
+            if len(text) > MAX_TEXT_LENGTH:
                 await send_message(
                     chat_id=message.chat.id,
                     text="<b>❌ Text too long! Max 2953 characters.</b>",
@@ -382,6 +411,7 @@ async def photo_handler(message: Message, bot: Bot):
                 data = get_data(user_id)
                 data["has_logo"] = True
                 data["logo_image"] = img
+                data["logo_id"] = photo.file_unique_id
                 set_data(user_id, data)
                 set_state(user_id, "qr_settings")
 
@@ -766,6 +796,76 @@ async def skip_label_callback(callback_query: CallbackQuery, bot: Bot):
         LOGGER.error(f"Error in skip_label_callback: {e}")
 
 
+def render_qr(text, size, error, style_name, label, logo_image):
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=ERROR_LEVELS[error],
+        box_size=SIZES[size],
+        border=4,
+    )
+    qr.add_data(text)
+    qr.make(fit=True)
+
+    style = STYLES[style_name]
+    img = qr.make_image(
+        fill_color=style["color"],
+        back_color=(255, 255, 255),
+        module_drawer=type(style["drawer"])(),
+    )
+
+    img = img.convert("RGB")
+
+    if logo_image:
+        logo = logo_image.copy()
+        logo_size = img.size[0] // 4
+        logo = logo.resize((logo_size, logo_size), Image.LANCZOS)
+
+        if logo.mode != "RGBA":
+            logo = logo.convert("RGBA")
+
+        img_with_logo = Image.new("RGB", img.size, (255, 255, 255))
+        img_with_logo.paste(img, (0, 0))
+
+        pos = ((img.size[0] - logo.size[0]) // 2, (img.size[1] - logo.size[1]) // 2)
+
+        if logo.mode == "RGBA":
+            img_with_logo.paste(logo, pos, logo)
+        else:
+            img_with_logo.paste(logo, pos)
+
+        img = img_with_logo
+
+    if label:
+        label_text = label
+        label_height = 100
+        new_img = Image.new("RGB", (img.size[0], img.size[1] + label_height), (255, 255, 255))
+        new_img.paste(img, (0, 0))
+
+        draw = ImageDraw.Draw(new_img)
+
+        try:
+            font = get_font(FONT_BOLD, 40)
+        except:
+            try:
+                font = ImageFont.truetype("arial.ttf", 40)
+            except:
+                font = ImageFont.load_default()
+
+        try:
+            bbox = font.getbbox(label_text)
+            text_width = bbox[2] - bbox[0]
+        except:
+            text_width = len(label_text) * 20
+
+        text_x = (new_img.size[0] - text_width) // 2
+        text_y = img.size[1] + 30
+
+        draw.text((text_x, text_y), label_text, fill=(0, 0, 0), font=font)
+        img = new_img
+
+    return encode_png(img)
+
+
 @dp.callback_query(lambda c: c.data == 'qr_generate')
 async def generate_callback(callback_query: CallbackQuery, bot: Bot):
     try:
@@ -779,10 +879,6 @@ async def generate_callback(callback_query: CallbackQuery, bot: Bot):
         data = get_data(user_id)
         sender = callback_query.from_user
         full_name = sender.first_name or "User"
-        temp_path = f"downloads/{user_id}.png"
-
-        os.makedirs("downloads", exist_ok=True)
-
         LOGGER.info(f"Processing {full_name}'s QR generation")
         LOGGER.info(f"Validating all received data for user {user_id}")
 
@@ -791,75 +887,8 @@ async def generate_callback(callback_query: CallbackQuery, bot: Bot):
             parse_mode=ParseMode.HTML
         )
 
-        qr = qrcode.QRCode(
-            version=None,
-            error_correction=ERROR_LEVELS[data["error"]],
-            box_size=SIZES[data["size"]],
-            border=4,
-        )
-        qr.add_data(data["text"])
-        qr.make(fit=True)
-
-        style = STYLES[data["style"]]
-        img = qr.make_image(
-            fill_color=style["color"],
-            back_color=(255, 255, 255),
-            module_drawer=style["drawer"],
-        )
-
-        img = img.convert("RGB")
-
-        if data.get("has_logo") and data.get("logo_image"):
-            logo = data["logo_image"].copy()
-            logo_size = img.size[0] // 4
-            logo = logo.resize((logo_size, logo_size), Image.LANCZOS)
-
-            if logo.mode != "RGBA":
-                logo = logo.convert("RGBA")
-
-            img_with_logo = Image.new("RGB", img.size, (255, 255, 255))
-            img_with_logo.paste(img, (0, 0))
-
-            pos = ((img.size[0] - logo.size[0]) // 2, (img.size[1] - logo.size[1]) // 2)
-
-            if logo.mode == "RGBA":
-                img_with_logo.paste(logo, pos, logo)
-            else:
-                img_with_logo.paste(logo, pos)
-
-            img = img_with_logo
-
-        if data.get("label"):
-            label_text = data["label"]
-            label_height = 100
-            new_img = Image.new("RGB", (img.size[0], img.size[1] + label_height), (255, 255, 255))
-            new_img.paste(img, (0, 0))
-
-            draw = ImageDraw.Draw(new_img)
-
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 40)
-            except:
-                try:
-                    font = ImageFont.truetype("arial.ttf", 40)
-                except:
-                    font = ImageFont.load_default()
-
-            try:
-                bbox = font.getbbox(label_text)
-                text_width = bbox[2] - bbox[0]
-            except:
-                text_width = len(label_text) * 20
-
-            text_x = (new_img.size[0] - text_width) // 2
-            text_y = img.size[1] + 30
-
-            draw.text((text_x, text_y), label_text, fill=(0, 0, 0), font=font)
-            img = new_img
-
-        LOGGER.info(f"Generating Image -> /{temp_path}")
-
-        img.save(temp_path, format="PNG")
+        logo_image = data.get("logo_image") if data.get("has_logo") else None
+        qr_key = artifact_key("qr", data["text"], data["size"], data["error"], data["style"], data.get("label"), data.get("logo_id") if logo_image else None)
 
         size_map = {"small": "Small", "medium": "Medium", "large": "Large", "xlarge": "Extra Large"}
         err_map = {"low": "L (7%)", "medium": "M (15%)", "high": "H (30%)", "max": "Q (25%)"}
@@ -878,22 +907,16 @@ async def generate_callback(callback_query: CallbackQuery, bot: Bot):
 
         await callback_query.message.delete()
 
-        photo_file = FSInputFile(temp_path)
-
-        await bot.send_photo(
+        await smart_artifacts.deliver(qr_key, "qr_code.png", lambda photo_file: bot.send_photo(
             chat_id=callback_query.message.chat.id,
             photo=photo_file,
             caption=caption,
             parse_mode=ParseMode.HTML
-        )
-
+        ), render_qr, data["text"], data["size"], data["error"], data["style"], data.get("label"), logo_image)
         clear_state(user_id)
         await callback_query.answer()
         LOGGER.info(f"QR code sent to user {user_id}")
 
-        LOGGER.info(f"Cleaning Download -> /{temp_path}")
-        clean_download(temp_path)
-
     except Exception as e:
         await Smart_Notify(bot, "generate_callback", e)
         await callback_query.answer("Failed to generate QR code!", show_alert=True)
@@ -905,4 +928,299 @@ async def generate_callback(callback_query: CallbackQuery, bot: Bot):
                 parse_mode=ParseMode.HTML
             )
         except:
-            pass
\ No newline at end of file
+            pass
+
+
+def parse_batch_items(path: str):
+    items = []
+    skipped = 0
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as file:
+        if path.lower().endswith(".csv"):
+            rows = ((row[0] if row else "", row[1] if len(row) > 1 else "") for row in csv.reader(file))
+        else:
+            rows = ((line, "") for line in file)
+        for text, label in rows:
+            text = text.strip()
+            label = label.strip()[:100] or None
+            if not text:
+                continue
+            if len(text) > MAX_TEXT_LENGTH or len(items) >= BATCH_MAX_ITEMS:
+                skipped += 1
+                continue
+            items.append((text, label))
+    return items, skipped
+
+
+def render_batch_item(item, style_name, size):
+    text, label = item
+    return render_qr(text, size, "medium", style_name, label, None)
+
+
+def batch_entry_name(index: int, text: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9._-]+", "_", text)[:40].strip("._") or "qr"
+    return f"{index:04d}_{safe}.png"
+
+
+def draw_grid_cell(canvas: Canvas, index: int, item, png: bytes):
+    page_width, page_height = A4
+    per_page = BATCH_GRID_COLUMNS * BATCH_GRID_ROWS
+    if index and index % per_page == 0:
+        canvas.showPage()
+    slot = index % per_page
+    column, row = slot % BATCH_GRID_COLUMNS, slot // BATCH_GRID_COLUMNS
+    cell_width = (page_width - 2 * BATCH_GRID_MARGIN) / BATCH_GRID_COLUMNS
+    cell_height = (page_height - 2 * BATCH_GRID_MARGIN) / BATCH_GRID_ROWS
+    image = ImageReader(io.BytesIO(png))
+    image_width, image_height = image.getSize()
+    scale = min((cell_width - 10) / image_width, (cell_height - BATCH_CAPTION_HEIGHT - 10) / image_height)
+    draw_width, draw_height = image_width * scale, image_height * scale
+    x = BATCH_GRID_MARGIN + column * cell_width + (cell_width - draw_width) / 2
+    top = page_height - BATCH_GRID_MARGIN - row * cell_height
+    y = top - 5 - draw_height
+    canvas.drawImage(image, x, y, draw_width, draw_height)
+    caption = item[0] if len(item[0]) <= 40 else item[0][:37] + "..."
+    canvas.setFont("Helvetica", 7)
+    canvas.drawCentredString(BATCH_GRID_MARGIN + column * cell_width + cell_width / 2, y - 10, caption)
+
+
+def build_qr_batch(items, style_name: str, output_format: str, output_path: str, progress=None):
+    total = len(items)
+    if output_format != "zip" and total > BATCH_MAX_PDF_ITEMS:
+        raise ValueError(f"PDF grid output is limited to {BATCH_MAX_PDF_ITEMS} QR codes")
+    size = "medium" if output_format == "zip" else "small"
+    if output_format == "zip":
+        archive = zipfile.ZipFile(output_path, "w", zipfile.ZIP_STORED)
+    else:
+        canvas = Canvas(output_path, pagesize=A4, pageCompression=1)
+        canvas.setTitle("QR Codes")
+    try:
+        for start in range(0, total, BATCH_WINDOW):
+            window = items[start:start + BATCH_WINDOW]
+            images = get_process_pool().map(render_batch_item, window, [style_name] * len(window), [size] * len(window))
+            for offset, (item, png) in enumerate(zip(window, images)):
+                if output_format == "zip":
+                    archive.writestr(batch_entry_name(start + offset + 1, item[0]), png)
+                else:
+                    draw_grid_cell(canvas, start + offset, item, png)
+            if progress:
+                progress(start + len(window), total)
+    finally:
+        if output_format == "zip":
+            archive.close()
+    if output_format != "zip":
+        canvas.save()
+
+
+async def update_batch_progress(message, done, total):
+    try:
+        await message.edit_text(
+            text=f"<b>⚙️ Generating QR Codes...</b>\n<b>Progress:</b> <code>{done}/{total}</code>",
+            parse_mode=ParseMode.HTML
+        )
+    except TelegramBadRequest:
+        pass
+    except Exception as e:
+        LOGGER.error(f"Failed to update qrbatch progress: {e}")
+
+
+def make_batch_reporter(message, loop):
+    last_update = [0]
+    def report(done, total):
+        now = time.time()
+        if done < total and now - last_update[0] < BATCH_PROGRESS_INTERVAL:
+            return
+        last_update[0] = now
+        asyncio.run_coroutine_threadsafe(update_batch_progress(message, done, total), loop)
+    return report
+
+
+def clear_batch(user_id: int):
+    session = batch_sessions.pop(user_id, None)
+    if session and session.get("workdir"):
+        shutil.rmtree(session["workdir"], ignore_errors=True)
+
+
+def build_batch_style_keyboard():
+    buttons = SmartButtons()
+    for key, label in STYLE_LABELS.items():
+        buttons.button(label, f"qrb_style_{key}")
+    buttons.button("❌ Cancel", "qrb_cancel", position="footer")
+    return buttons.build_menu(b_cols=2, f_cols=1)
+
+
+def build_batch_format_keyboard():
+    buttons = SmartButtons()
+    buttons.button("📦 ZIP Of PNGs", "qrb_fmt_zip")
+    buttons.button("📄 PDF Grid", "qrb_fmt_pdf")
+    buttons.button("❌ Cancel", "qrb_cancel", position="footer")
+    return buttons.build_menu(b_cols=2, f_cols=1)
+
+
+@dp.message(Command(commands=["qrbatch"], prefix=BotCommands))
+@new_task
+@SmartDefender
+async def qrbatch_handler(message: Message, bot: Bot):
+    user_id = message.from_user.id
+
+    if message.chat.type != ChatType.PRIVATE:
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>⚠️ QR Code can only be created in private chat.</b>",
+            parse_mode=ParseMode.HTML
+        )
+        return
+
+    document = message.reply_to_message.document if message.reply_to_message else None
+    if not document or not (document.file_name or "").lower().endswith((".txt", ".csv")):
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>❌ Reply to a .txt or .csv file with /qrbatch</b>\n\n<b>One QR code per line. For CSV, column 1 is the data and column 2 an optional label.</b>",
+            parse_mode=ParseMode.HTML
+        )
+        return
+
+    if document.file_size and document.file_size > BATCH_MAX_FILE_MB * 1024 * 1024:
+        await send_message(
+            chat_id=message.chat.id,
+            text=f"<b>❌ File too large! Max {BATCH_MAX_FILE_MB}MB.</b>",
+            parse_mode=ParseMode.HTML
+        )
+        return
+
+    clear_batch(user_id)
+    os.makedirs(DOWNLOADS_DIR, exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix=f"qrbatch_{user_id}_", dir=DOWNLOADS_DIR)
+    batch_sessions[user_id] = {"workdir": workdir}
+
+    try:
+        input_path = os.path.join(workdir, os.path.basename(document.file_name))
+        file = await bot.get_file(document.file_id)
+        await bot.download_file(file.file_path, input_path)
+        items, skipped = parse_batch_items(input_path)
+        if not items:
+            clear_batch(user_id)
+            await send_message(
+                chat_id=message.chat.id,
+                text="<b>⚠️ No valid QR data found in this file.</b>",
+                parse_mode=ParseMode.HTML
+            )
+            return
+
+        batch_sessions[user_id].update({"items": items, "style": None})
+        skipped_text = f"<b>Skipped:</b> <code>{skipped}</code> (empty, too long or over {BATCH_MAX_ITEMS})\n" if skipped else ""
+        await send_message(
+            chat_id=message.chat.id,
+            text=(
+                "<b>📱 Batch QR Generator</b>\n"
+                "<b>━━━━━━━━━━━━━━━━━━━━━━</b>\n"
+                f"<b>QR Codes:</b> <code>{len(items)}</code>\n"
+                f"{skipped_text}\n"
+                "<b>Choose a style for all QR codes:</b>"
+            ),
+            reply_markup=build_batch_style_keyboard(),
+            parse_mode=ParseMode.HTML
+        )
+        LOGGER.info(f"User {user_id} started /qrbatch with {len(items)} items")
+    except Exception as e:
+        clear_batch(user_id)
+        await Smart_Notify(bot, "qrbatch_handler", e, message)
+        LOGGER.error(f"Error in qrbatch_handler for user {user_id}: {e}")
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>❌ Failed to read your file!</b>",
+            parse_mode=ParseMode.HTML
+        )
+
+
+@dp.callback_query(lambda c: c.data == 'qrb_cancel')
+async def qrbatch_cancel_callback(callback_query: CallbackQuery, bot: Bot):
+    user_id = callback_query.from_user.id
+    session = batch_sessions.get(user_id)
+    if session and session.get("generating"):
+        await callback_query.answer("Generation already in progress", show_alert=True)
+        return
+    clear_batch(user_id)
+    try:
+        await callback_query.message.edit_text(
+            text="<b>❌ Batch QR Generation Cancelled</b>",
+            parse_mode=ParseMode.HTML
+        )
+        await callback_query.answer()
+    except Exception as e:
+        LOGGER.error(f"Error in qrbatch_cancel_callback: {e}")
+
+
+@dp.callback_query(lambda c: c.data.startswith('qrb_style_'))
+async def qrbatch_style_callback(callback_query: CallbackQuery, bot: Bot):
+    user_id = callback_query.from_user.id
+    session = batch_sessions.get(user_id)
+    style_name = callback_query.data[len("qrb_style_"):]
+    if not session or "items" not in session or style_name not in STYLES:
+        await callback_query.answer("Session Expired Please Try Again", show_alert=True)
+        return
+    session["style"] = style_name
+    try:
+        await callback_query.message.edit_text(
+            text=(
+                "<b>📱 Batch QR Generator</b>\n"
+                "<b>━━━━━━━━━━━━━━━━━━━━━━</b>\n"
+                f"<b>QR Codes:</b> <code>{len(session['items'])}</code>\n"
+                f"<b>Style:</b> <code>{STYLE_LABELS[style_name]}</code>\n\n"
+                "<b>Choose the output format:</b>"
+            ),
+            reply_markup=build_batch_format_keyboard(),
+            parse_mode=ParseMode.HTML
+        )
+        await callback_query.answer()
+    except Exception as e:
+        LOGGER.error(f"Error in qrbatch_style_callback: {e}")
+
+
+@dp.callback_query(lambda c: c.data.startswith('qrb_fmt_'))
+async def qrbatch_format_callback(callback_query: CallbackQuery, bot: Bot):
+    user_id = callback_query.from_user.id
+    session = batch_sessions.get(user_id)
+    output_format = callback_query.data[len("qrb_fmt_"):]
+    if not session or not session.get("style") or session.get("generating") or output_format not in ("zip", "pdf"):
+        await callback_query.answer("Session Expired Please Try Again", show_alert=True)
+        return
+    if output_format == "pdf" and len(session["items"]) > BATCH_MAX_PDF_ITEMS:
+        await callback_query.answer(f"PDF Grid supports up to {BATCH_MAX_PDF_ITEMS} QR codes. Please choose ZIP.", show_alert=True)
+        return
+    session["generating"] = True
+    await callback_query.answer()
+    items = session["items"]
+    output_path = os.path.join(session["workdir"], f"qr_codes_{len(items)}.{output_format}")
+    try:
+        await callback_query.message.edit_text(
+            text=f"<b>⚙️ Generating QR Codes...</b>\n<b>Progress:</b> <code>0/{len(items)}</code>",
+            parse_mode=ParseMode.HTML
+        )
+        loop = asyncio.get_running_loop()
+        progress = make_batch_reporter(callback_query.message, loop)
+        started = time.time()
+        await loop.run_in_executor(None, build_qr_batch, items, session["style"], output_format, output_path, progress)
+        elapsed = time.time() - started
+        await SmartPyro.send_document(
+            chat_id=callback_query.message.chat.id,
+            document=output_path,
+            caption=(
+                "<b>✅ Batch QR Codes Generated</b>\n\n"
+                f"<b>QR Codes:</b> <code>{len(items)}</code>\n"
+                f"<b>Style:</b> <code>{STYLE_LABELS[session['style']]}</code>\n"
+                f"<b>Time Taken:</b> <code>{elapsed:.1f}s</code>"
+            ),
+            parse_mode=SmartParseMode.HTML
+        )
+        await delete_messages(callback_query.message.chat.id, callback_query.message.message_id)
+        LOGGER.info(f"Sent {len(items)} batch QR codes as {output_format} to user {user_id}")
+    except Exception as e:
+        await Smart_Notify(bot, "qrbatch_format_callback", e)
+        LOGGER.error(f"Error in qrbatch_format_callback for user {user_id}: {e}")
+        await send_message(
+            chat_id=callback_query.message.chat.id,
+            text="<b>❌ Failed to generate QR codes!</b>",
+            parse_mode=ParseMode.HTML
+        )
+    finally:
+        clear_batch(user_id)
@@ -1,8 +1,12 @@
 import asyncio
+import io
 import re
 import shutil
 import os
 import subprocess
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 from aiogram import F, Bot
 from aiogram.filters import Command
@@ -19,10 +23,16 @@ from bot.helpers.defend import SmartDefender
 from bot import SmartPyro
 
 logger = LOGGER
-image_store = {}
+image_store = OrderedDict()
 image_store_lock = asyncio.Lock()
 waiting_users = {}
 waiting_users_lock = asyncio.Lock()
+MAX_GIF_FRAMES = 500
+MAX_GIF_PIXELS = 1920 * 1080
+MAX_GIF_BYTES = 50 * 1024 * 1024
+SESSION_TTL = 10 * 60
+MAX_DECODED_BYTES = 256 * 1024 * 1024
+executor = ThreadPoolExecutor(max_workers=4)
 
 RESOLUTIONS = {
     "dp_square": (1080, 1080),
@@ -47,40 +57,187 @@ RESOLUTIONS = {
     "medium_thumb": (480, 270)
 }
 
+PRESET_BUTTONS = [
+    ("❤️ DP Square", "dp_square"),
+    ("💫 Widescreen", "widescreen"),
+    ("⭐ Story", "story"),
+    ("✨ Portrait", "portrait"),
+    ("📰 Vertical", "vertical"),
+    ("📖 Horizontal", "horizontal"),
+    ("🧩 Standard", "standard"),
+    ("🔥 IG Post", "ig_post"),
+    ("👀 TikTok DP", "tiktok_dp"),
+    ("🕸️ FB Cover", "fb_cover"),
+    ("🕷️ YT Banner", "yt_banner"),
+    ("👁️ YT Thumb", "yt_thumb"),
+    ("🐦 X Header", "x_header"),
+    ("⭐ X Post", "x_post"),
+    ("🤖 LinkedIn Banner", "linkedin_banner"),
+    ("❤️ WhatsApp DP", "whatsapp_dp"),
+    ("💘 Small Thumb", "small_thumb"),
+    ("🎥 Wide Banner", "wide_banner"),
+    ("🐵 Bot Desc Photo", "bot_father"),
+    ("✨ Medium Thumb", "medium_thumb")
+]
+
+def load_source_image(input_path):
+    with Image.open(input_path) as img:
+        return img.convert("RGBA")
+
+def decoded_bytes(image):
+    return image.width * image.height * len(image.getbands())
+
+def trim_decoded_images():
+    total = sum(decoded_bytes(entry["image"]) for entry in image_store.values() if entry.get("image") is not None)
+    for entry in image_store.values():
+        if total <= MAX_DECODED_BYTES:
+            break
+        if entry.get("image") is not None:
+            total -= decoded_bytes(entry["image"])
+            entry["image"] = None
+
+async def get_source_image(user_id, input_path):
+    async with image_store_lock:
+        entry = image_store.get(user_id)
+        if entry and entry.get("image") is not None:
+            image_store.move_to_end(user_id)
+            return entry["image"]
+    source = await asyncio.get_running_loop().run_in_executor(executor, load_source_image, input_path)
+    async with image_store_lock:
+        if image_store.get(user_id) is entry and entry is not None:
+            entry["image"] = source
+            image_store.move_to_end(user_id)
+            trim_decoded_images()
+    return source
+
+async def touch_session(user_id):
+    async with image_store_lock:
+        entry = image_store.get(user_id)
+        if entry:
+            entry["expires_at"] = asyncio.get_running_loop().time() + SESSION_TTL
+            image_store.move_to_end(user_id)
+        return entry
+
+async def end_session(user_id, entry=None):
+    async with image_store_lock:
+        current = image_store.get(user_id)
+        if current is None or (entry is not None and current is not entry):
+            return
+        image_store.pop(user_id)
+    async with waiting_users_lock:
+        if waiting_users.get(user_id, {}).get("input_path") == current["path"]:
+            waiting_users.pop(user_id)
+    task = current.get("expiry")
+    if task and task is not asyncio.current_task():
+        task.cancel()
+    clean_download(current["path"])
+
+async def expire_session(user_id, entry):
+    loop = asyncio.get_running_loop()
+    while entry["expires_at"] > loop.time():
+        await asyncio.sleep(entry["expires_at"] - loop.time())
+    logger.info(f"Resize session for user {user_id} expired")
+    await end_session(user_id, entry)
+
+def save_resized(source, width, height, output_path):
+    resized = source.resize((width, height), Image.Resampling.LANCZOS)
+    resized.save(output_path, "PNG", optimize=True)
+
+def build_resize_zip(source, presets, output_path):
+    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_STORED) as zf:
+        for name in presets:
+            width, height = RESOLUTIONS[name]
+            buffer = io.BytesIO()
+            source.resize((width, height), Image.Resampling.LANCZOS).save(buffer, "PNG", optimize=True)
+            zf.writestr(f"{name}_{width}x{height}.png", buffer.getvalue())
+
+def build_select_menu(selected):
+    buttons = SmartButtons()
+    for label, key in PRESET_BUTTONS:
+        mark = "✅ " if key in selected else ""
+        buttons.button(text=f"{mark}{label}", callback_data=f"resize_sel_{key}", position="header")
+    buttons.button(text=f"📦 Generate Selected ({len(selected)})", callback_data="resize_selgo", position="footer")
+    buttons.button(text="❌ Close", callback_data="resize_close", position="footer")
+    return buttons.build_menu(b_cols=2, h_cols=2, f_cols=1)
+
 async def resize_image(input_path, width, height, user_id):
     output_path = f"./downloads/resized_{user_id}_{width}x{height}.png"
     try:
-        with open(input_path, 'rb') as f:
-            img = Image.open(f).convert("RGBA")
-            resized = img.resize((width, height), Image.Resampling.LANCZOS)
-            resized.save(output_path, "PNG", optimize=True)
+        source = await get_source_image(user_id, input_path)
+        await asyncio.get_running_loop().run_in_executor(executor, save_resized, source, width, height, output_path)
     except Exception as e:
         logger.error(f"Error in resize_image: {e}")
         raise
     return output_path
 
+async def resize_batch(input_path, presets, user_id):
+    output_path = f"./downloads/resized_{user_id}_batch.zip"
+    try:
+        source = await get_source_image(user_id, input_path)
+        await asyncio.get_running_loop().run_in_executor(executor, build_resize_zip, source, presets, output_path)
+    except Exception as e:
+        logger.error(f"Error in resize_batch: {e}")
+        raise
+    return output_path
+
+async def run_ffmpeg(cmd):
+    proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+    stdout, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        raise RuntimeError(f"FFmpeg failed: {stderr.decode()}")
+
+def count_gif_frames(input_path):
+    with Image.open(input_path) as img:
+        return getattr(img, "n_frames", 1)
+
+def gif_limit_error(input_path, width, height):
+    if width * height > MAX_GIF_PIXELS:
+        return f"<b>❌ GIF output is limited to {MAX_GIF_PIXELS:,} pixels (1920x1080), {width}x{height} is too large</b>"
+    if os.path.getsize(input_path) > MAX_GIF_BYTES:
+        return f"<b>❌ GIF files larger than {MAX_GIF_BYTES // (1024 * 1024)}MB can not be resized</b>"
+    return None
+
+async def gif_frame_notice(input_path):
+    try:
+        frames = await asyncio.get_running_loop().run_in_executor(executor, count_gif_frames, input_path)
+    except Exception as e:
+        logger.error(f"Failed to count GIF frames: {e}")
+        return ""
+    if frames <= MAX_GIF_FRAMES:
+        return ""
+    return f"\n<b>⚠️ Only the first {MAX_GIF_FRAMES} of {frames} frames were kept</b>"
+
 async def resize_gif(input_path, width, height, user_id):
     output_path = f"./downloads/resized_{user_id}_{width}x{height}.gif"
+    palette_path = f"./downloads/palette_{user_id}_{width}x{height}.png"
     try:
-        img = Image.open(input_path)
-        if not getattr(img, "is_animated", False):
-            img.close()
-            raise ValueError("Not animated GIF")
-        frames, durations = [], []
-        try:
-            while True:
-                frame = img.copy().convert("RGBA").resize((width, height), Image.Resampling.LANCZOS)
-                frames.append(frame)
-                durations.append(img.info.get("duration", 100))
-                img.seek(img.tell() + 1)
-        except EOFError:
-            pass
-        img.close()
-        if frames:
-            frames[0].save(output_path, save_all=True, append_images=frames[1:], duration=durations, loop=0, optimize=True)
+        if width * height > MAX_GIF_PIXELS:
+            raise ValueError(f"GIF size {width}x{height} exceeds limit")
+        if os.path.getsize(input_path) > MAX_GIF_BYTES:
+            raise ValueError("GIF file too large")
+        scale = f"scale={width}:{height}:flags=lanczos"
+        await run_ffmpeg([
+            "ffmpeg", "-y",
+            "-i", input_path,
+            "-frames:v", str(MAX_GIF_FRAMES),
+            "-vf", f"{scale},palettegen=stats_mode=diff",
+            palette_path
+        ])
+        await run_ffmpeg([
+            "ffmpeg", "-y",
+            "-i", input_path,
+            "-i", palette_path,
+            "-frames:v", str(MAX_GIF_FRAMES),
+            "-lavfi", f"{scale}[x];[x][1:v]paletteuse=dither=bayer:bayer_scale=5:diff_mode=rectangle",
+            "-loop", "0",
+            "-f", "gif",
+            output_path
+        ])
     except Exception as e:
         logger.error(f"Error in resize_gif: {e}")
         raise
+    finally:
+        clean_download(palette_path)
     return output_path
 
 async def resize_mp4(input_path, width, height, user_id):
@@ -95,10 +252,7 @@ async def resize_mp4(input_path, width, height, user_id):
             "-c:v", "gif",
             output_path
         ]
-        proc = await asyncio.create_subprocess_exec(*cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
-        stdout, stderr = await proc.communicate()
-        if proc.returncode != 0:
-            raise RuntimeError(f"FFmpeg failed: {stderr.decode()}")
+        await run_ffmpeg(cmd)
     except Exception as e:
         logger.error(f"Error in resize_mp4: {e}")
         raise
@@ -171,31 +325,31 @@ async def resize_menu_handler(message: Message, bot: Bot):
                 logger.error(f"PIL detection failed: {e}")
         ext = ".mp4" if is_mp4 else (".gif" if is_gif else ".png")
         original_file = f"./downloads/res_{user_id}{ext}"
+        await end_session(user_id)
         shutil.move(downloaded_path, original_file)
         logger.info(f"File type detected: {file_type}, is_gif: {is_gif}, is_mp4: {is_mp4}")
+        source = None
+        if not is_gif and not is_mp4:
+            try:
+                source = await asyncio.get_running_loop().run_in_executor(executor, load_source_image, original_file)
+            except Exception as e:
+                logger.error(f"Failed to decode source image: {e}")
+        entry = {
+            "path": original_file,
+            "is_gif": is_gif,
+            "is_mp4": is_mp4,
+            "image": source,
+            "expires_at": asyncio.get_running_loop().time() + SESSION_TTL
+        }
         async with image_store_lock:
-            image_store[user_id] = {"path": original_file, "is_gif": is_gif, "is_mp4": is_mp4}
+            image_store[user_id] = entry
+            trim_decoded_images()
+        entry["expiry"] = asyncio.create_task(expire_session(user_id, entry))
         buttons = SmartButtons()
-        buttons.button(text="❤️ DP Square", callback_data="resize_dp_square", position="header")
-        buttons.button(text="💫 Widescreen", callback_data="resize_widescreen", position="header")
-        buttons.button(text="⭐ Story", callback_data="resize_story", position="header")
-        buttons.button(text="✨ Portrait", callback_data="resize_portrait", position="header")
-        buttons.button(text="📰 Vertical", callback_data="resize_vertical", position="header")
-        buttons.button(text="📖 Horizontal", callback_data="resize_horizontal", position="header")
-        buttons.button(text="🧩 Standard", callback_data="resize_standard", position="header")
-        buttons.button(text="🔥 IG Post", callback_data="resize_ig_post", position="header")
-        buttons.button(text="👀 TikTok DP", callback_data="resize_tiktok_dp", position="header")
-        buttons.button(text="🕸️ FB Cover", callback_data="resize_fb_cover", position="header")
-        buttons.button(text="🕷️ YT Banner", callback_data="resize_yt_banner", position="header")
-        buttons.button(text="👁️ YT Thumb", callback_data="resize_yt_thumb", position="header")
-        buttons.button(text="🐦 X Header", callback_data="resize_x_header", position="header")
-        buttons.button(text="⭐ X Post", callback_data="resize_x_post", position="header")
-        buttons.button(text="🤖 LinkedIn Banner", callback_data="resize_linkedin_banner", position="header")
-        buttons.button(text="❤️ WhatsApp DP", callback_data="resize_whatsapp_dp", position="header")
-        buttons.button(text="💘 Small Thumb", callback_data="resize_small_thumb", position="header")
-        buttons.button(text="🎥 Wide Banner", callback_data="resize_wide_banner", position="header")
-        buttons.button(text="🐵 Bot Desc Photo", callback_data="resize_bot_father", position="header")
-        buttons.button(text="✨ Medium Thumb", callback_data="resize_medium_thumb", position="header")
+        for label, key in PRESET_BUTTONS:
+            buttons.button(text=label, callback_data=f"resize_{key}", position="header")
+        buttons.button(text="📦 All Sizes (ZIP)", callback_data="resize_all", position="header")
+        buttons.button(text="☑️ Select Sizes", callback_data="resize_pick", position="header")
         buttons.button(text="⏰ GIF Resize", callback_data="resize_gif_resize", position="header")
         buttons.button(text="📰 Custom Size", callback_data="resize_custom_size", position="header")
         buttons.button(text="❌ Close", callback_data="resize_close", position="footer")
@@ -227,22 +381,20 @@ async def resize_button_handler(callback_query: CallbackQuery, bot: Bot):
     user_id = callback_query.from_user.id
     chat_id = callback_query.message.chat.id
     data = callback_query.data.replace("resize_", "")
-    async with image_store_lock:
-        if user_id not in image_store:
-            await callback_query.answer("Image not found. Please use /rs again.", show_alert=True)
-            return
-        input_path = image_store[user_id]["path"]
-        is_gif = image_store[user_id]["is_gif"]
-        is_mp4 = image_store[user_id]["is_mp4"]
+    entry = await touch_session(user_id)
+    if not entry:
+        await callback_query.answer("Image not found. Please use /rs again.", show_alert=True)
+        return
+    input_path = entry["path"]
+    is_gif = entry["is_gif"]
+    is_mp4 = entry["is_mp4"]
     if data == "close":
         await SmartAIO.delete_message(
             chat_id=chat_id,
             message_id=callback_query.message.message_id
         )
         await callback_query.answer("Menu closed.")
-        async with image_store_lock:
-            image_store.pop(user_id, None)
-        clean_download(input_path)
+        await end_session(user_id, entry)
         return
     if is_gif or is_mp4:
         if data not in ["gif_resize", "custom_size"]:
@@ -252,44 +404,111 @@ async def resize_button_handler(callback_query: CallbackQuery, bot: Bot):
         if data == "gif_resize":
             await callback_query.answer("GIF Resize is only for GIF/MP4 files", show_alert=True)
             return
-    if data == "gif_resize":
+    if data == "pick":
+        async with image_store_lock:
+            selected = entry.setdefault("selected", set())
+            reply_markup = build_select_menu(selected)
         await SmartAIO.edit_message_text(
             chat_id=chat_id,
             message_id=callback_query.message.message_id,
+            text="<b>Select the sizes you need, then tap Generate Selected:</b>",
+            parse_mode=ParseMode.HTML,
+            reply_markup=reply_markup
+        )
+        await callback_query.answer()
+        return
+    if data.startswith("sel_"):
+        key = data[len("sel_"):]
+        if key not in RESOLUTIONS:
+            await callback_query.answer("Unknown size.", show_alert=True)
+            return
+        async with image_store_lock:
+            selected = entry.setdefault("selected", set())
+            selected.symmetric_difference_update({key})
+            reply_markup = build_select_menu(selected)
+        await SmartAIO.edit_message_reply_markup(
+            chat_id=chat_id,
+            message_id=callback_query.message.message_id,
+            reply_markup=reply_markup
+        )
+        await callback_query.answer()
+        return
+    if data in ["all", "selgo"]:
+        if data == "all":
+            presets = list(RESOLUTIONS)
+        else:
+            async with image_store_lock:
+                selected = entry.get("selected", set())
+            presets = [key for key in RESOLUTIONS if key in selected]
+            if not presets:
+                await callback_query.answer("Select at least one size.", show_alert=True)
+                return
+        output_file = None
+        try:
+            logger.info(f"Processing Batch Resize For {len(presets)} Sizes.....")
+            await callback_query.answer(f"Generating {len(presets)} sizes...")
+            output_file = await resize_batch(input_path, presets, user_id)
+            logger.info("Processing Done Uploading......")
+            await SmartAIO.send_document(
+                chat_id=chat_id,
+                document=FSInputFile(output_file, filename="resized_images.zip"),
+                caption=f"<b>Resized to {len(presets)} sizes</b>",
+                parse_mode=ParseMode.HTML
+            )
+        except Exception as e:
+            logger.error(f"Batch resizing error: {e}")
+            await Smart_Notify(SmartAIO, "/rs", e, callback_query.message)
+            await send_message(
+                chat_id=chat_id,
+                text="<b>Failed to resize image.</b>",
+                parse_mode=ParseMode.HTML
+            )
+        finally:
+            if output_file:
+                clean_download(output_file)
+        return
+    if data == "gif_resize":
+        prompt_msg = await send_message(
+            chat_id=chat_id,
             text="<b>Please Send Your Desired Size For GIF Like <code>1280x720</code></b>",
             parse_mode=ParseMode.HTML
         )
         async with waiting_users_lock:
-            waiting_users[user_id] = {"input_path": input_path, "is_gif": is_gif, "is_mp4": is_mp4, "message_id": callback_query.message.message_id}
+            waiting_users[user_id] = {"input_path": input_path, "is_gif": is_gif, "is_mp4": is_mp4, "message_id": prompt_msg.message_id}
         await callback_query.answer()
         return
     if data == "custom_size":
-        await SmartAIO.edit_message_text(
+        prompt_msg = await send_message(
             chat_id=chat_id,
-            message_id=callback_query.message.message_id,
             text="<b>Please Send Your Desired Size Like <code>1280x720</code></b>",
             parse_mode=ParseMode.HTML
         )
         async with waiting_users_lock:
-            waiting_users[user_id] = {"input_path": input_path, "is_gif": is_gif, "is_mp4": is_mp4, "message_id": callback_query.message.message_id}
+            waiting_users[user_id] = {"input_path": input_path, "is_gif": is_gif, "is_mp4": is_mp4, "message_id": prompt_msg.message_id}
         await callback_query.answer()
         return
     width, height = RESOLUTIONS.get(data, (1080, 1080))
     output_file = None
+    notice = ""
     try:
-        logger.info(f"Processing Image Resize.....")
+        logger.info("Processing Image Resize.....")
         if is_gif:
+            limit_error = gif_limit_error(input_path, width, height)
+            if limit_error:
+                await callback_query.answer()
+                await send_message(chat_id=chat_id, text=limit_error, parse_mode=ParseMode.HTML)
+                return
+            notice = await gif_frame_notice(input_path)
             output_file = await resize_gif(input_path, width, height, user_id)
         elif is_mp4:
             output_file = await resize_mp4(input_path, width, height, user_id)
         else:
             output_file = await resize_image(input_path, width, height, user_id)
-        logger.info(f"Processing Done Uploading......")
-        await SmartAIO.delete_message(chat_id=chat_id, message_id=callback_query.message.message_id)
+        logger.info("Processing Done Uploading......")
         await SmartAIO.send_document(
             chat_id=chat_id,
             document=FSInputFile(output_file),
-            caption=f"<b>Resized to {width}x{height}</b>",
+            caption=f"<b>Resized to {width}x{height}</b>{notice}",
             parse_mode=ParseMode.HTML
         )
         await callback_query.answer(f"Image successfully resized to {width}x{height}!")
@@ -298,12 +517,8 @@ async def resize_button_handler(callback_query: CallbackQuery, bot: Bot):
         await Smart_Notify(SmartAIO, "/rs", e, callback_query.message)
         await callback_query.answer("Failed to resize image.", show_alert=True)
     finally:
-        async with image_store_lock:
-            image_store.pop(user_id, None)
         if output_file:
-            clean_download(input_path, output_file)
-        else:
-            clean_download(input_path)
+            clean_download(output_file)
 
 @dp.message(F.text.regexp(r'^\d+x\d+$'))
 @new_task
@@ -326,35 +541,40 @@ async def custom_size_handler(message: Message, bot: Bot):
     if width <= 0 or height <= 0 or width > 10000 or height > 10000:
         await message.reply("Size must be between 1-10000")
         return
+    if not await touch_session(user_id):
+        await message.reply("Image not found. Please use /rs again.")
+        return
     input_path = wait_data["input_path"]
     is_gif = wait_data["is_gif"]
     is_mp4 = wait_data["is_mp4"]
     prompt_msg_id = wait_data["message_id"]
     output_file = None
+    notice = ""
     try:
         logger.info(f"Received Custom Size From User {full_name}")
-        logger.info(f"Processing Image Resize.....")
+        logger.info("Processing Image Resize.....")
         if is_gif:
+            limit_error = gif_limit_error(input_path, width, height)
+            if limit_error:
+                await send_message(chat_id=message.chat.id, text=limit_error, parse_mode=ParseMode.HTML)
+                return
+            notice = await gif_frame_notice(input_path)
             output_file = await resize_gif(input_path, width, height, user_id)
         elif is_mp4:
             output_file = await resize_mp4(input_path, width, height, user_id)
         else:
             output_file = await resize_image(input_path, width, height, user_id)
-        logger.info(f"Processing Done Uploading......")
+        logger.info("Processing Done Uploading......")
         await SmartAIO.delete_message(chat_id=message.chat.id, message_id=prompt_msg_id)
         await SmartAIO.send_document(
             chat_id=message.chat.id,
             document=FSInputFile(output_file),
-            caption=f"<b>Resized to {width}x{height}</b>",
+            caption=f"<b>Resized to {width}x{height}</b>{notice}",
             parse_mode=ParseMode.HTML
         )
     except Exception as e:
         logger.error(f"Resizing error: {e}")
         await message.reply("Failed to resize.")
     finally:
-        async with image_store_lock:
-            image_store.pop(user_id, None)
         if output_file:
-            clean_download(input_path, output_file)
-        else:
-            clean_download(input_path)
\ No newline at end of file
+            clean_download(output_file)
\ No newline at end of file
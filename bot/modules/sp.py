@@ -1,65 +1,372 @@
 import os
 import time
+import shutil
+import tempfile
 import aiohttp
 import re
+import json
 import asyncio
 import aiofiles
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor
 from aiogram import Bot
 from aiogram.filters import Command
 from aiogram.types import Message
 from aiogram.enums import ParseMode
-from pyrogram import Client
 from pyrogram.enums import ParseMode as SmartParseMode
-from pyrogram.types import Message as SmartMessage, InlineKeyboardMarkup, InlineKeyboardButton
+from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from typing import Optional
 from config import A360APIBASEURL
 from bot import dp, SmartPyro
+from bot.core.database import SmartSpotify
 from bot.helpers.commands import BotCommands
-from bot.helpers.utils import new_task, clean_download
+from bot.helpers.utils import new_task
 from bot.helpers.logger import LOGGER
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.pgbar import progress_bar
 from bot.helpers.defend import SmartDefender
 from bot.helpers.botutils import send_message, delete_messages
-import urllib.parse
 
 logger = LOGGER
 
 class Config:
     TEMP_DIR = Path("./downloads")
+    CHUNK_SIZE = 1024 * 1024
+    BATCH_WORKERS = 4
+    BATCH_WINDOW = 8
+    BATCH_MAX_TRACKS = 50
+    BATCH_QUOTA = 100
+    BATCH_QUOTA_WINDOW = 24 * 60 * 60
+    PROGRESS_INTERVAL = 3
 
 Config.TEMP_DIR.mkdir(exist_ok=True)
 
-executor = ThreadPoolExecutor(max_workers=10)
+TRACK_PATTERN = re.compile(r"open\.spotify\.com/(?:intl-[a-z-]+/)?track/([A-Za-z0-9]+)")
+COLLECTION_PATTERN = re.compile(r"open\.spotify\.com/(?:intl-[a-z-]+/)?(album|playlist)/([A-Za-z0-9]+)")
+NEXT_DATA_PATTERN = re.compile(r'<script id="__NEXT_DATA__" type="application/json">(.*?)</script>', re.S)
+
+batch_usage = {}
+active_batches = set()
+
+def extract_track_id(url: str) -> Optional[str]:
+    match = TRACK_PATTERN.search(url or "")
+    return match.group(1) if match else None
 
 async def sanitize_filename(title: str) -> str:
     title = re.sub(r'[<>:"/\\|?*]', '', title[:50]).strip()
     return f"{title.replace(' ', '_')}_{int(time.time())}"
 
-async def download_image(url: str, output_path: str, bot: Bot) -> Optional[str]:
-    logger.info(f"Starting download of image from {url}")
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                logger.info(f"HTTP Request: GET {url} \"HTTP/1.1 {response.status} {response.reason}\"")
-                if response.status == 200:
-                    async with aiofiles.open(output_path, 'wb') as file:
-                        await file.write(await response.read())
-                    logger.info(f"Image downloaded successfully to {output_path}")
-                    return output_path
+class SpotifyClient:
+    def __init__(self):
+        self.session = None
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=None, sock_connect=15, sock_read=60))
+        return self.session
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    async def api(self, path: str, **params):
+        session = await self.get_session()
+        async with session.get(f"{A360APIBASEURL}{path}", params=params) as response:
+            logger.info(f"HTTP Request: GET {response.url} \"HTTP/1.1 {response.status} {response.reason}\"")
+            if response.status != 200:
+                return response.status, None
+            return response.status, await response.json(content_type=None)
+
+    async def download(self, url: str, output_path: Path) -> bool:
+        session = await self.get_session()
+        async with session.get(url) as response:
+            logger.info(f"HTTP Request: GET {url} \"HTTP/1.1 {response.status} {response.reason}\"")
+            if response.status != 200:
+                return False
+            async with aiofiles.open(output_path, 'wb') as file:
+                async for chunk in response.content.iter_chunked(Config.CHUNK_SIZE):
+                    await file.write(chunk)
+        return True
+
+    async def download_image(self, url: str, output_path: Path, bot: Bot) -> Optional[Path]:
+        logger.info(f"Starting download of image from {url}")
+        try:
+            if await self.download(url, output_path):
+                logger.info(f"Image downloaded successfully to {output_path}")
+                return output_path
+            logger.error("Failed to download image")
+            await Smart_Notify(bot, f"{BotCommands}sp", Exception(f"Failed to download image: {url}"), None)
+        except Exception as e:
+            logger.error(f"Failed to download image: {e}")
+            await Smart_Notify(bot, f"{BotCommands}sp", e, None)
+        return None
+
+    async def collection_tracks(self, kind: str, collection_id: str) -> list:
+        session = await self.get_session()
+        async with session.get(f"https://open.spotify.com/embed/{kind}/{collection_id}", headers={"User-Agent": "Mozilla/5.0"}) as response:
+            logger.info(f"HTTP Request: GET {response.url} \"HTTP/1.1 {response.status} {response.reason}\"")
+            if response.status != 200:
+                return []
+            page = await response.text()
+        match = NEXT_DATA_PATTERN.search(page)
+        if not match:
+            return []
+        tracks = []
+        pending = [json.loads(match.group(1))]
+        while pending and not tracks:
+            node = pending.pop()
+            if isinstance(node, dict):
+                if isinstance(node.get("trackList"), list):
+                    for item in node["trackList"]:
+                        uri = item.get("uri", "")
+                        if uri.startswith("spotify:track:"):
+                            track_id = uri.rsplit(":", 1)[1]
+                            tracks.append({
+                                "id": track_id,
+                                "title": item.get("title", "Unknown"),
+                                "url": f"https://open.spotify.com/track/{track_id}"
+                            })
                 else:
-                    logger.error(f"Failed to download image: HTTP status {response.status}")
-                    await Smart_Notify(bot, f"{BotCommands}sp", Exception(f"Failed to download image: HTTP status {response.status}"), None)
+                    pending.extend(node.values())
+            elif isinstance(node, list):
+                pending.extend(node)
+        return tracks
+
+    async def cached_tracks(self, track_ids: list) -> dict:
+        try:
+            return {doc["_id"]: doc async for doc in SmartSpotify.find({"_id": {"$in": track_ids}})}
+        except Exception as e:
+            logger.error(f"Failed to read Spotify cache: {e}")
+            return {}
+
+    async def cached_track(self, track_id: Optional[str]) -> Optional[dict]:
+        if not track_id:
+            return None
+        try:
+            return await SmartSpotify.find_one({"_id": track_id})
+        except Exception as e:
+            logger.error(f"Failed to read Spotify cache for {track_id}: {e}")
+            return None
+
+    async def remember_track(self, track_id: Optional[str], sent, track: dict):
+        if not track_id or not sent or not sent.audio:
+            return
+        try:
+            await SmartSpotify.update_one(
+                {"_id": track_id},
+                {"$set": {
+                    "file_id": sent.audio.file_id,
+                    "title": track["title"],
+                    "artists": track["artists"],
+                    "duration": track["duration"],
+                    "url": track["url"],
+                    "cached_at": time.time()
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            logger.error(f"Failed to store Spotify cache for {track_id}: {e}")
+
+    async def forget_track(self, track_id: str):
+        try:
+            await SmartSpotify.delete_one({"_id": track_id})
+        except Exception as e:
+            logger.error(f"Failed to drop Spotify cache for {track_id}: {e}")
+
+smart_spotify = SpotifyClient()
+
+def build_caption(track: dict, message: Message, user_name: str) -> str:
+    user_info = (
+        f"<a href=\"tg://user?id={message.from_user.id}\">{user_name}</a>" if message.from_user
+        else f"<a href=\"https://t.me/{message.chat.username or 'this group'}\">{message.chat.title}</a>"
+    )
+    return (
+        f"🌟 <b>Title</b>: <code>{track['title']}</code>\n"
+        f"💥 <b>Artist</b>: <code>{track['artists']}</code>\n"
+        f"✨ <b>Duration</b>: <code>{track['duration']}</code>\n"
+        f"👀 <b>Album</b>: <code>{track['artists']}</code>\n"
+        f"🎵 <b>Release Date</b>: <code>Unknown</code>\n"
+        f"<b>━━━━━━━━━━━━━━━━━━━━━</b>\n"
+        f"<b>Downloaded By</b> {user_info}"
+    )
+
+def build_markup(url: str) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton("🎸 Listen On Spotify", url=url)]
+    ])
+
+async def send_cached_track(message: Message, cached: dict, user_name: str) -> bool:
+    try:
+        await SmartPyro.send_audio(
+            chat_id=message.chat.id,
+            audio=cached["file_id"],
+            caption=build_caption(cached, message, user_name),
+            parse_mode=SmartParseMode.HTML,
+            reply_markup=build_markup(cached["url"])
+        )
+        logger.info(f"Served Spotify track {cached['_id']} from cache")
+        return True
+    except Exception as e:
+        logger.warning(f"Cached Spotify file_id failed for {cached['_id']}: {e}")
+        await smart_spotify.forget_track(cached["_id"])
+        return False
+
+def reserve_quota(user_id: int, count: int) -> int:
+    now = time.time()
+    for stale in [uid for uid, (start, _) in batch_usage.items() if now - start >= Config.BATCH_QUOTA_WINDOW]:
+        del batch_usage[stale]
+    window_start, used = batch_usage.get(user_id, (now, 0))
+    allowed = max(0, min(count, Config.BATCH_QUOTA - used))
+    batch_usage[user_id] = (window_start, used + allowed)
+    return allowed
+
+def refund_quota(user_id: int, count: int):
+    if count > 0 and user_id in batch_usage:
+        window_start, used = batch_usage[user_id]
+        batch_usage[user_id] = (window_start, max(0, used - count))
+
+async def prepare_batch_track(entry: dict, cached: Optional[dict], workdir: Path, index: int, bot: Bot) -> Optional[dict]:
+    if cached:
+        return {"cached": cached}
+    response_status, data = await smart_spotify.api("/sp/dl", url=entry["url"])
+    if not data or data.get("status") != "success" or not data.get("download_link"):
+        logger.error(f"Track API request failed for {entry['url']}: HTTP status {response_status}")
+        return None
+    track = {
+        "title": data.get("title", entry["title"]),
+        "artists": data.get("author", "Unknown"),
+        "duration": data.get("duration", "Unknown"),
+        "url": entry["url"]
+    }
+    audio_path = workdir / f"{index:03d}_{await sanitize_filename(track['title'])}.mp3"
+    cover_path = workdir / f"{index:03d}_cover.jpg"
+    downloaded, cover_path = await asyncio.gather(
+        smart_spotify.download(data["download_link"], audio_path),
+        smart_spotify.download_image(data["cover"], cover_path, bot) if data.get("cover") else asyncio.sleep(0)
+    )
+    if not downloaded:
+        logger.error(f"Audio download failed for {entry['url']}")
+        return None
+    return {"track": track, "audio": audio_path, "cover": cover_path}
+
+async def send_batch_track(message: Message, entry: dict, prepared: dict, user_name: str) -> bool:
+    if "cached" in prepared:
+        return await send_cached_track(message, prepared["cached"], user_name)
+    track = prepared["track"]
+    try:
+        sent = await SmartPyro.send_audio(
+            chat_id=message.chat.id,
+            audio=str(prepared["audio"]),
+            caption=build_caption(track, message, user_name),
+            title=track["title"],
+            performer=track["artists"],
+            parse_mode=SmartParseMode.HTML,
+            thumb=str(prepared["cover"]) if prepared["cover"] else None,
+            reply_markup=build_markup(track["url"])
+        )
+        await smart_spotify.remember_track(entry["id"], sent, track)
+        return True
+    finally:
+        os.remove(prepared["audio"])
+        if prepared["cover"]:
+            os.remove(prepared["cover"])
+
+async def update_batch_status(status, kind: str, sent: int, failed: int, total: int, last_update: float) -> float:
+    if time.monotonic() - last_update < Config.PROGRESS_INTERVAL and sent + failed < total:
+        return last_update
+    try:
+        await status.edit_text(
+            f"<b>Downloading Spotify {kind.title()} 🎧</b>\n"
+            f"<b>━━━━━━━━━━━━━━━━━━━━━</b>\n"
+            f"<b>Sent:</b> {sent}/{total}\n"
+            f"<b>Failed:</b> {failed}",
+            parse_mode=ParseMode.HTML
+        )
     except Exception as e:
-        logger.error(f"Failed to download image: {e}")
-        await Smart_Notify(bot, f"{BotCommands}sp", e, None)
-    return None
+        logger.warning(f"Failed to update Spotify batch status: {e}")
+    return time.monotonic()
+
+async def handle_spotify_batch(message: Message, bot: Bot, status, kind: str, collection_id: str, user_id: int, user_name: str):
+    if user_id in active_batches:
+        await status.edit_text("<b>⚠️ Please wait for your current album or playlist to finish</b>", parse_mode=ParseMode.HTML)
+        return
+    active_batches.add(user_id)
+    workdir = None
+    tasks = {}
+    reserved = downloaded = 0
+    try:
+        tracks = await smart_spotify.collection_tracks(kind, collection_id)
+        truncated = max(0, len(tracks) - Config.BATCH_MAX_TRACKS)
+        tracks = tracks[:Config.BATCH_MAX_TRACKS]
+        if not tracks:
+            await status.edit_text(f"<b>❌ Could not read tracks from this {kind}</b>", parse_mode=ParseMode.HTML)
+            return
+        cache = await smart_spotify.cached_tracks([track["id"] for track in tracks])
+        budget = reserved = reserve_quota(user_id, sum(1 for track in tracks if track["id"] not in cache))
+        selected = []
+        for track in tracks:
+            if track["id"] in cache:
+                selected.append(track)
+            elif budget > 0:
+                selected.append(track)
+                budget -= 1
+        skipped = len(tracks) - len(selected)
+        if not selected:
+            await status.edit_text("<b>❌ Daily Spotify download quota reached, try again later</b>", parse_mode=ParseMode.HTML)
+            return
+        logger.info(f"Spotify {kind} {collection_id}: {len(selected)} tracks, {len(cache)} cached, {skipped} over quota")
+        Config.TEMP_DIR.mkdir(exist_ok=True)
+        workdir = Path(tempfile.mkdtemp(prefix=f"sp_{user_id}_", dir=Config.TEMP_DIR))
+        semaphore = asyncio.Semaphore(Config.BATCH_WORKERS)
+
+        async def prepare(index, entry, use_cache=True):
+            async with semaphore:
+                try:
+                    return await prepare_batch_track(entry, cache.get(entry["id"]) if use_cache else None, workdir, index, bot)
+                except Exception as e:
+                    logger.error(f"Failed to prepare Spotify track {entry['url']}: {e}")
+                    return None
+
+        sent = failed = 0
+        last_update = 0
+        for index, entry in enumerate(selected):
+            for ahead in range(index, min(index + Config.BATCH_WINDOW, len(selected))):
+                if ahead not in tasks:
+                    tasks[ahead] = asyncio.create_task(prepare(ahead, selected[ahead]))
+            prepared = await tasks.pop(index)
+            delivered = False
+            if prepared:
+                try:
+                    delivered = await send_batch_track(message, entry, prepared, user_name)
+                    if not delivered and "cached" in prepared:
+                        prepared = await prepare(index, entry, False)
+                        delivered = bool(prepared) and await send_batch_track(message, entry, prepared, user_name)
+                except Exception as e:
+                    logger.error(f"Failed to send Spotify track {entry['url']}: {e}")
+            sent += delivered
+            failed += not delivered
+            downloaded += delivered and "cached" not in prepared
+            last_update = await update_batch_status(status, kind, sent, failed, len(selected), last_update)
+        await delete_messages(message.chat.id, [status.message_id])
+        summary = f"<b>✅ Sent {sent}/{len(selected)} tracks from this {kind}</b>"
+        if skipped:
+            summary += f"\n<b>⚠️ {skipped} tracks skipped: daily quota of {Config.BATCH_QUOTA} downloads reached</b>"
+        if truncated:
+            summary += f"\n<b>⚠️ {truncated} tracks not sent: only the first {Config.BATCH_MAX_TRACKS} tracks are downloaded</b>"
+        await send_message(chat_id=message.chat.id, text=summary, parse_mode=ParseMode.HTML)
+    except Exception as e:
+        await status.edit_text("<b>❌ Sorry Bro Spotify DL API Dead</b>", parse_mode=ParseMode.HTML)
+        logger.error(f"Error processing Spotify {kind}: {str(e)}")
+        await Smart_Notify(bot, f"{BotCommands}sp", Exception(str(e)), status)
+    finally:
+        for task in tasks.values():
+            task.cancel()
+        refund_quota(user_id, reserved - downloaded)
+        active_batches.discard(user_id)
+        if workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
 
 async def handle_spotify_request(message: Message, bot: Bot, input_text: Optional[str]):
-    output_filename = None
-    cover_path = None
+    workdir = None
     
     if not input_text and message.reply_to_message and message.reply_to_message.text:
         input_text = message.reply_to_message.text.strip()
@@ -81,153 +388,125 @@ async def handle_spotify_request(message: Message, bot: Bot, input_text: Optiona
     user_id = message.from_user.id if message.from_user else message.chat.id
     logger.info(f"Command SP Received: From User {user_name} {user_id}")
     logger.info(f"{user_name} {user_id} Query - {input_text} Type - Audio")
+    collection = COLLECTION_PATTERN.search(input_text) if is_url else None
+    if collection:
+        await handle_spotify_batch(message, bot, status, collection.group(1), collection.group(2), user_id, user_name)
+        return
     try:
-        async with aiohttp.ClientSession() as session:
-            if is_url:
-                logger.info(f"Processing Spotify URL: {input_text}")
-                api_url = f"{A360APIBASEURL}/sp/dl?url={urllib.parse.quote(input_text)}"
-                async with session.get(api_url) as response:
-                    logger.info(f"HTTP Request: GET {api_url} \"HTTP/1.1 {response.status} {response.reason}\"")
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.info(f"Track API response: {data}")
-                        if data["status"] == "success":
-                            await status.edit_text("<b>Found ☑️ Downloading...</b>", parse_mode=ParseMode.HTML)
-                        else:
-                            await status.edit_text("<b>Please Provide A Valid Spotify URL ❌</b>", parse_mode=ParseMode.HTML)
-                            logger.error(f"Invalid Spotify URL: {input_text}")
-                            await Smart_Notify(bot, f"{BotCommands}sp", Exception(f"Invalid Spotify URL: {input_text}"), status)
-                            return
-                    else:
-                        await status.edit_text("<b>❌ Song Not Available On Spotify</b>", parse_mode=ParseMode.HTML)
-                        logger.error(f"API request failed: HTTP status {response.status}")
-                        await Smart_Notify(bot, f"{BotCommands}sp", Exception(f"API request failed: HTTP status {response.status}"), status)
-                        return
-            else:
-                logger.info(f"Processing Spotify search query: {input_text}")
-                encoded_query = urllib.parse.quote(input_text)
-                api_url = f"{A360APIBASEURL}/sp/search?q={encoded_query}"
-                async with session.get(api_url) as response:
-                    logger.info(f"HTTP Request: GET {api_url} \"HTTP/1.1 {response.status} {response.reason}\"")
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.info(f"Search API response: {data}")
-                        if data["status"] == "success" and data["results"]:
-                            await status.edit_text("<b>Found ☑️ Downloading...</b>", parse_mode=ParseMode.HTML)
-                            track = data["results"][0]
-                            track_url = track["url"]
-                            logger.info(f"Selected track: {track['title']} (URL: {track_url})")
-                            track_api_url = f"{A360APIBASEURL}/sp/dl?url={urllib.parse.quote(track_url)}"
-                            async with session.get(track_api_url) as track_response:
-                                logger.info(f"HTTP Request: GET {track_api_url} \"HTTP/1.1 {track_response.status} {track_response.reason}\"")
-                                if track_response.status == 200:
-                                    data = await track_response.json()
-                                    logger.info(f"Track API response: {data}")
-                                    if data["status"] != "success":
-                                        await status.edit_text("<b>Song Metadata Unavailable</b>", parse_mode=ParseMode.HTML)
-                                        logger.error("Song metadata unavailable")
-                                        await Smart_Notify(bot, f"{BotCommands}sp", Exception("Song metadata unavailable"), status)
-                                        return
-                                else:
-                                    await status.edit_text("<b>❌ Song Unavailable Bro Try Later</b>", parse_mode=ParseMode.HTML)
-                                    logger.error(f"Track API request failed: HTTP status {track_response.status}")
-                                    await Smart_Notify(bot, f"{BotCommands}sp", Exception(f"Track API request failed: HTTP status {track_response.status}"), status)
-                                    return
-                        else:
-                            await status.edit_text("<b>Sorry No Songs Matched To Your Search!</b>", parse_mode=ParseMode.HTML)
-                            logger.error(f"No songs matched search query: {input_text}")
-                            return
-                    else:
-                        await status.edit_text("<b>❌ Sorry Bro Spotify Search API Dead</b>", parse_mode=ParseMode.HTML)
-                        logger.error(f"Search API request failed: HTTP status {response.status}")
-                        await Smart_Notify(bot, f"{BotCommands}sp", Exception(f"Search API request failed: HTTP status {response.status}"), status)
-                        return
-            
-            title = data.get("title", "Unknown")
-            artists = data.get("author", "Unknown")
-            duration = data.get("duration", "Unknown")
-            album = artists
-            release_date = "Unknown"
-            spotify_url = input_text if is_url else track_url
-            download_url = data.get("download_link")
-            cover_url = data.get("cover")
-            
-            if not download_url:
-                await status.edit_text("<b>❌ Download link not available</b>", parse_mode=ParseMode.HTML)
-                logger.error("Download link not available in API response")
-                await Smart_Notify(bot, f"{BotCommands}sp", Exception("Download link not available"), status)
+        if is_url:
+            spotify_url = input_text
+            track_id = extract_track_id(spotify_url)
+            cached = await smart_spotify.cached_track(track_id)
+            if cached and await send_cached_track(message, cached, user_name):
+                await delete_messages(message.chat.id, [status.message_id])
                 return
-            
-            if cover_url:
-                Config.TEMP_DIR.mkdir(exist_ok=True)
-                cover_path = Config.TEMP_DIR / f"{await sanitize_filename(title)}.jpg"
-                downloaded_path = await download_image(cover_url, str(cover_path), bot)
-                if downloaded_path:
-                    logger.info(f"Cover image downloaded to {downloaded_path}")
-                else:
-                    logger.warning("Failed to download cover image")
-                    cover_path = None
-            
-            safe_title = await sanitize_filename(title)
-            output_filename = Config.TEMP_DIR / f"{safe_title}.mp3"
-            logger.info(f"Downloading Spotify Music: {output_filename}")
-            async with session.get(download_url) as response:
-                logger.info(f"HTTP Request: GET {download_url} \"HTTP/1.1 {response.status} {response.reason}\"")
-                if response.status == 200:
-                    async with aiofiles.open(output_filename, 'wb') as file:
-                        await file.write(await response.read())
-                    logger.info(f"Audio file downloaded successfully to {output_filename}")
-                else:
-                    await status.edit_text("<b>❌ Sorry Bro Spotify DL API Dead</b>", parse_mode=ParseMode.HTML)
-                    logger.error(f"Audio download failed: HTTP status {response.status}")
-                    await Smart_Notify(bot, f"{BotCommands}sp", Exception(f"Audio download failed: HTTP status {response.status}"), status)
-                    logger.info(f"Cleaning Download: {output_filename}")
-                    clean_download(output_filename, cover_path)
-                    return
-            
-            user_info = (
-                f"<a href=\"tg://user?id={message.from_user.id}\">{user_name}</a>" if message.from_user
-                else f"<a href=\"https://t.me/{message.chat.username or 'this group'}\">{message.chat.title}</a>"
-            )
-            audio_caption = (
-                f"🌟 <b>Title</b>: <code>{title}</code>\n"
-                f"💥 <b>Artist</b>: <code>{artists}</code>\n"
-                f"✨ <b>Duration</b>: <code>{duration}</code>\n"
-                f"👀 <b>Album</b>: <code>{album}</code>\n"
-                f"🎵 <b>Release Date</b>: <code>{release_date}</code>\n"
-                f"<b>━━━━━━━━━━━━━━━━━━━━━</b>\n"
-                f"<b>Downloaded By</b> {user_info}"
-            )
-            reply_markup = InlineKeyboardMarkup([
-                [InlineKeyboardButton("🎸 Listen On Spotify", url=spotify_url)]
-            ])
-            last_update_time = [0]
-            start_time = time.time()
-            logger.info("Starting upload of audio file to Telegram")
-            await SmartPyro.send_audio(
-                chat_id=message.chat.id,
-                audio=str(output_filename),
-                caption=audio_caption,
-                title=title,
-                performer=artists,
-                parse_mode=SmartParseMode.HTML,
-                thumb=str(cover_path) if cover_path else None,
-                reply_markup=reply_markup,
-                progress=progress_bar,
-                progress_args=(status, start_time, last_update_time)
-            )
-            logger.info("Upload of audio successfully completed")
-            logger.info(f"Cleaning Download: {output_filename}")
-            clean_download(output_filename, cover_path)
-            await delete_messages(message.chat.id, [status.message_id])
-            logger.info("Status message deleted")
+            logger.info(f"Processing Spotify URL: {input_text}")
+            response_status, data = await smart_spotify.api("/sp/dl", url=input_text)
+            if data is None:
+                await status.edit_text("<b>❌ Song Not Available On Spotify</b>", parse_mode=ParseMode.HTML)
+                logger.error(f"API request failed: HTTP status {response_status}")
+                await Smart_Notify(bot, f"{BotCommands}sp", Exception(f"API request failed: HTTP status {response_status}"), status)
+                return
+            logger.info(f"Track API response: {data}")
+            if data["status"] != "success":
+                await status.edit_text("<b>Please Provide A Valid Spotify URL ❌</b>", parse_mode=ParseMode.HTML)
+                logger.error(f"Invalid Spotify URL: {input_text}")
+                await Smart_Notify(bot, f"{BotCommands}sp", Exception(f"Invalid Spotify URL: {input_text}"), status)
+                return
+            await status.edit_text("<b>Found ☑️ Downloading...</b>", parse_mode=ParseMode.HTML)
+        else:
+            logger.info(f"Processing Spotify search query: {input_text}")
+            response_status, data = await smart_spotify.api("/sp/search", q=input_text)
+            if data is None:
+                await status.edit_text("<b>❌ Sorry Bro Spotify Search API Dead</b>", parse_mode=ParseMode.HTML)
+                logger.error(f"Search API request failed: HTTP status {response_status}")
+                await Smart_Notify(bot, f"{BotCommands}sp", Exception(f"Search API request failed: HTTP status {response_status}"), status)
+                return
+            logger.info(f"Search API response: {data}")
+            if data["status"] != "success" or not data["results"]:
+                await status.edit_text("<b>Sorry No Songs Matched To Your Search!</b>", parse_mode=ParseMode.HTML)
+                logger.error(f"No songs matched search query: {input_text}")
+                return
+            track = data["results"][0]
+            spotify_url = track["url"]
+            logger.info(f"Selected track: {track['title']} (URL: {spotify_url})")
+            track_id = extract_track_id(spotify_url)
+            cached = await smart_spotify.cached_track(track_id)
+            if cached and await send_cached_track(message, cached, user_name):
+                await delete_messages(message.chat.id, [status.message_id])
+                return
+            await status.edit_text("<b>Found ☑️ Downloading...</b>", parse_mode=ParseMode.HTML)
+            response_status, data = await smart_spotify.api("/sp/dl", url=spotify_url)
+            if data is None:
+                await status.edit_text("<b>❌ Song Unavailable Bro Try Later</b>", parse_mode=ParseMode.HTML)
+                logger.error(f"Track API request failed: HTTP status {response_status}")
+                await Smart_Notify(bot, f"{BotCommands}sp", Exception(f"Track API request failed: HTTP status {response_status}"), status)
+                return
+            logger.info(f"Track API response: {data}")
+            if data["status"] != "success":
+                await status.edit_text("<b>Song Metadata Unavailable</b>", parse_mode=ParseMode.HTML)
+                logger.error("Song metadata unavailable")
+                await Smart_Notify(bot, f"{BotCommands}sp", Exception("Song metadata unavailable"), status)
+                return
+        
+        track = {
+            "title": data.get("title", "Unknown"),
+            "artists": data.get("author", "Unknown"),
+            "duration": data.get("duration", "Unknown"),
+            "url": spotify_url
+        }
+        download_url = data.get("download_link")
+        cover_url = data.get("cover")
+        
+        if not download_url:
+            await status.edit_text("<b>❌ Download link not available</b>", parse_mode=ParseMode.HTML)
+            logger.error("Download link not available in API response")
+            await Smart_Notify(bot, f"{BotCommands}sp", Exception("Download link not available"), status)
+            return
+        
+        Config.TEMP_DIR.mkdir(exist_ok=True)
+        workdir = Path(tempfile.mkdtemp(prefix=f"sp_{user_id}_", dir=Config.TEMP_DIR))
+        output_filename = workdir / f"{await sanitize_filename(track['title'])}.mp3"
+        cover_path = workdir / "cover.jpg"
+        logger.info(f"Downloading Spotify Music: {output_filename}")
+        downloaded, cover_path = await asyncio.gather(
+            smart_spotify.download(download_url, output_filename),
+            smart_spotify.download_image(cover_url, cover_path, bot) if cover_url else asyncio.sleep(0)
+        )
+        if not downloaded:
+            await status.edit_text("<b>❌ Sorry Bro Spotify DL API Dead</b>", parse_mode=ParseMode.HTML)
+            logger.error("Audio download failed")
+            await Smart_Notify(bot, f"{BotCommands}sp", Exception("Audio download failed"), status)
+            return
+        logger.info(f"Audio file downloaded successfully to {output_filename}")
+        
+        last_update_time = [0]
+        start_time = time.time()
+        logger.info("Starting upload of audio file to Telegram")
+        sent = await SmartPyro.send_audio(
+            chat_id=message.chat.id,
+            audio=str(output_filename),
+            caption=build_caption(track, message, user_name),
+            title=track["title"],
+            performer=track["artists"],
+            parse_mode=SmartParseMode.HTML,
+            thumb=str(cover_path) if cover_path else None,
+            reply_markup=build_markup(spotify_url),
+            progress=progress_bar,
+            progress_args=(status, start_time, last_update_time)
+        )
+        logger.info("Upload of audio successfully completed")
+        await smart_spotify.remember_track(track_id, sent, track)
+        await delete_messages(message.chat.id, [status.message_id])
+        logger.info("Status message deleted")
     except Exception as e:
         await status.edit_text("<b>❌ Sorry Bro Spotify DL API Dead</b>", parse_mode=ParseMode.HTML)
         logger.error(f"Error processing Spotify request: {str(e)}")
         await Smart_Notify(bot, f"{BotCommands}sp", Exception(str(e)), status)
-        if output_filename or cover_path:
-            logger.info(f"Cleaning Download: {output_filename}")
-            clean_download(output_filename, cover_path)
+    finally:
+        if workdir:
+            logger.info(f"Cleaning Download: {workdir}")
+            shutil.rmtree(workdir, ignore_errors=True)
 
 @dp.message(Command(commands=["sp", "spotify"], prefix=BotCommands))
 @new_task
@@ -253,4 +532,4 @@ async def spotify_command(message: Message, bot: Bot):
             parse_mode=ParseMode.HTML
         )
         return
-    await handle_spotify_request(message, bot, input_text)
\ No newline at end of file
+    await handle_spotify_request(message, bot, input_text)
@@ -2,14 +2,18 @@
 #  SmartUtilBot - Telegram Utility Bot for Smart Features Bot 
 #  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack> 
 import os
-import aiofiles
+import re
+import math
+import shutil
 import asyncio
+import tempfile
+import zipfile
 from aiogram import Bot
 from aiogram.filters import Command
-from aiogram.types import Message, FSInputFile
+from aiogram.types import Message, FSInputFile, InputMediaDocument
 from aiogram.enums import ParseMode, ChatType
 from bot import dp, SmartAIO
-from bot.helpers.utils import new_task, clean_download
+from bot.helpers.utils import new_task
 from bot.helpers.botutils import send_message, delete_messages, get_args
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.logger import LOGGER
@@ -19,20 +23,166 @@ from config import MAX_TXT_SIZE
 
 logger = LOGGER
 
-async def process_file(file_path, line_limit):
-    async with aiofiles.open(file_path, "r", encoding='utf-8', errors='ignore') as file:
-        lines = await file.readlines()
-    total_lines = len(lines)
-    split_files = []
-    file_index = 1
-    for start in range(0, total_lines, line_limit):
-        end = start + line_limit
-        split_file_path = f"{file_path}_part_{file_index}.txt"
-        async with aiofiles.open(split_file_path, "w", encoding='utf-8') as split_file:
-            await split_file.writelines(lines[start:end])
-        split_files.append(split_file_path)
-        file_index += 1
-    return split_files
+DOWNLOADS_DIR = "./downloads"
+BLOCK_SIZE = 1024 * 1024
+MAX_PARTS = 1000
+MAX_GROUP_DOCUMENTS = 10
+SIZE_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)(b|kb|mb)$", re.IGNORECASE)
+SIZE_UNITS = {"b": 1, "kb": 1024, "mb": 1024 * 1024}
+PARTS_WORDS = ("part", "parts", "file", "files")
+
+class TextSplitter:
+    def __init__(self, mode, amount, open_part):
+        self.mode = mode
+        self.amount = amount
+        self.open_part = open_part
+        self.part = None
+        self.parts = 0
+        self.filled = 0
+        self.pending = bytearray()
+
+    def write(self, view):
+        if self.part is None:
+            self.parts += 1
+            self.part = self.open_part(self.parts)
+        self.part.write(view)
+
+    def write_pending(self, view):
+        if self.pending:
+            self.write(self.pending)
+            self.filled += len(self.pending)
+            self.pending = bytearray()
+        if view:
+            self.write(view)
+            self.filled += len(view)
+
+    def close_part(self):
+        if self.part is not None:
+            self.part.close()
+            self.part = None
+        self.filled = 0
+
+    def finish(self):
+        self.write_pending(b"")
+        self.close_part()
+
+    def feed(self, block):
+        view = memoryview(block)
+        start, end = 0, len(block)
+        while start < end:
+            if self.mode == "lines":
+                start = self.feed_lines(block, view, start, end)
+            elif self.mode == "bytes":
+                start = self.feed_bytes(block, view, start, end)
+            else:
+                start = self.feed_target(block, view, start, end)
+
+    def feed_lines(self, block, view, start, end):
+        remaining = self.amount - self.filled
+        newlines = block.count(b"\n", start, end)
+        if newlines < remaining:
+            self.write(view[start:end])
+            self.filled += newlines
+            return end
+        position = start
+        for _ in range(remaining):
+            position = block.index(b"\n", position) + 1
+        self.write(view[start:position])
+        self.close_part()
+        return position
+
+    def feed_bytes(self, block, view, start, end):
+        remaining = self.amount - self.filled - len(self.pending)
+        if end - start <= remaining:
+            newline = block.rfind(b"\n", start, end)
+            if newline >= 0:
+                self.write_pending(view[start:newline + 1])
+                start = newline + 1
+            self.pending += view[start:end]
+            return end
+        newline = block.rfind(b"\n", start, start + remaining)
+        if newline >= 0:
+            self.write_pending(view[start:newline + 1])
+            self.close_part()
+            return newline + 1
+        if self.filled:
+            self.close_part()
+            return start
+        self.write_pending(view[start:start + remaining])
+        self.close_part()
+        return start + remaining
+
+    def feed_target(self, block, view, start, end):
+        remaining = self.amount - self.filled
+        newline = block.find(b"\n", start + max(remaining - 1, 0), end) if end - start >= remaining else -1
+        if newline < 0:
+            self.write(view[start:end])
+            self.filled += end - start
+            return end
+        self.write(view[start:newline + 1])
+        self.close_part()
+        return newline + 1
+
+def count_lines(file_path):
+    lines = 0
+    last = b"\n"
+    with open(file_path, "rb") as file:
+        while block := file.read(BLOCK_SIZE):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    return lines + (last != b"\n")
+
+def estimate_parts(file_path, mode, amount):
+    if mode == "lines":
+        return math.ceil(count_lines(file_path) / amount)
+    if mode == "bytes":
+        return math.ceil(os.path.getsize(file_path) / amount)
+    return amount
+
+def split_file(file_path, mode, amount, output_dir, base_name, archive_path=None):
+    if mode == "parts":
+        amount = max(1, math.ceil(os.path.getsize(file_path) / amount))
+        mode = "target"
+    archive = zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED) if archive_path else None
+    part_paths = []
+
+    def open_part(index):
+        name = f"{base_name}_part_{index}.txt"
+        if archive:
+            return archive.open(name, "w")
+        path = os.path.join(output_dir, name)
+        part_paths.append(path)
+        return open(path, "wb")
+
+    splitter = TextSplitter(mode, amount, open_part)
+    try:
+        with open(file_path, "rb") as file:
+            while block := file.read(BLOCK_SIZE):
+                splitter.feed(block)
+        splitter.finish()
+    finally:
+        if archive:
+            archive.close()
+    return splitter.parts, part_paths
+
+def parse_split_args(args):
+    force_zip = any(arg.lower() == "zip" for arg in args)
+    args = [arg for arg in args if arg.lower() != "zip"]
+    if not args:
+        return None
+    size = SIZE_PATTERN.match(args[0])
+    if size:
+        amount = int(float(size.group(1)) * SIZE_UNITS[size.group(2).lower()])
+        return ("bytes", amount, force_zip) if amount > 0 else None
+    try:
+        amount = int(args[0])
+    except ValueError:
+        return None
+    if amount <= 0:
+        return None
+    if len(args) > 1 and args[1].lower() in PARTS_WORDS:
+        return ("parts", amount, force_zip) if amount <= MAX_PARTS else None
+    return "lines", amount, force_zip
 
 @dp.message(Command(commands=["sptxt"], prefix=BotCommands))
 @new_task
@@ -54,34 +204,52 @@ async def split_text(message: Message, bot: Bot):
             parse_mode=ParseMode.HTML
         )
         return
-    file_size_mb = message.reply_to_message.document.file_size / (1024 * 1024)
-    if file_size_mb > MAX_TXT_SIZE:
+    if message.reply_to_message.document.file_size > MAX_TXT_SIZE:
         await send_message(
             chat_id=message.chat.id,
-            text="<b>⚠️ File size exceeds the 10MB limit❌</b>",
+            text=f"<b>⚠️ File size exceeds the {MAX_TXT_SIZE // (1024 * 1024)}MB limit❌</b>",
             parse_mode=ParseMode.HTML
         )
         return
-    try:
-        line_limit = int(get_args(message)[0])
-    except (IndexError, ValueError):
+    split_args = parse_split_args(get_args(message))
+    if not split_args:
         await send_message(
             chat_id=message.chat.id,
-            text="<b>⚠️ Please Provide A Valid Line Limit</b>",
+            text=(
+                "<b>⚠️ Please Provide A Valid Line Limit</b>\n\n"
+                "<code>/sptxt 500</code> - 500 lines per part\n"
+                "<code>/sptxt 2MB</code> - parts of at most 2MB\n"
+                "<code>/sptxt 5 parts</code> - 5 roughly equal parts\n"
+                "Add <code>zip</code> to receive a single archive"
+            ),
             parse_mode=ParseMode.HTML
         )
         return
+    mode, amount, force_zip = split_args
     processing_msg = await send_message(
         chat_id=message.chat.id,
         text="<b>Processing Text Split..✨</b>",
         parse_mode=ParseMode.HTML
     )
+    os.makedirs(DOWNLOADS_DIR, exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix=f"sptxt_{user_id}_", dir=DOWNLOADS_DIR)
     try:
         file_id = message.reply_to_message.document.file_id
-        os.makedirs("./downloads", exist_ok=True)
-        file_path = f"./downloads/sptxt_{user_id}_{int(asyncio.get_event_loop().time())}.txt"
+        file_path = os.path.join(workdir, "source.txt")
+        base_name = os.path.splitext(os.path.basename(message.reply_to_message.document.file_name))[0] or "text"
         await bot.download(file=file_id, destination=file_path)
-        split_files = await process_file(file_path, line_limit)
+        loop = asyncio.get_running_loop()
+        estimated = await loop.run_in_executor(None, estimate_parts, file_path, mode, amount)
+        if estimated > MAX_PARTS:
+            await delete_messages(chat_id=message.chat.id, message_ids=[processing_msg.message_id])
+            await send_message(
+                chat_id=message.chat.id,
+                text=f"<b>⚠️ This would create {estimated} parts. The limit is {MAX_PARTS}.</b>",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        archive_path = os.path.join(workdir, f"{base_name}_parts.zip") if force_zip or estimated > MAX_GROUP_DOCUMENTS else None
+        parts, part_paths = await loop.run_in_executor(None, split_file, file_path, mode, amount, workdir, base_name, archive_path)
         try:
             await delete_messages(
                 chat_id=message.chat.id,
@@ -89,13 +257,25 @@ async def split_text(message: Message, bot: Bot):
             )
         except Exception as e:
             logger.warning(f"[{user_id}] Failed to delete processing message: {e}")
-        for split_file in split_files:
+        if archive_path:
+            await bot.send_document(
+                chat_id=message.chat.id,
+                document=FSInputFile(archive_path),
+                caption=f"<b>✅ Split into {parts} parts</b>",
+                parse_mode=ParseMode.HTML
+            )
+        elif len(part_paths) == 1:
             await bot.send_document(
                 chat_id=message.chat.id,
-                document=FSInputFile(split_file)
+                document=FSInputFile(part_paths[0])
             )
-            clean_download(split_file)
-        clean_download(file_path)
+        else:
+            for start in range(0, len(part_paths), MAX_GROUP_DOCUMENTS):
+                await bot.send_media_group(
+                    chat_id=message.chat.id,
+                    media=[InputMediaDocument(media=FSInputFile(path)) for path in part_paths[start:start + MAX_GROUP_DOCUMENTS]]
+                )
+        logger.info(f"[{user_id}] Split text into {parts} parts by {mode}")
     except Exception as e:
         logger.error(f"[{user_id}] Error processing /sptxt: {e}")
         try:
@@ -110,5 +290,6 @@ async def split_text(message: Message, bot: Bot):
             text="<b>❌ Error processing text split</b>",
             parse_mode=ParseMode.HTML
         )
-        clean_download(file_path)
-        await Smart_Notify(bot, "/sptxt", e, message)
\ No newline at end of file
+        await Smart_Notify(bot, "/sptxt", e, message)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
\ No newline at end of file
@@ -1,41 +1,78 @@
 # Copyright @ISmartCoder
 #  SmartUtilBot - Telegram Utility Bot for Smart Features Bot 
 #  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack> 
-import os
-import aiohttp
+import io
 import time
-import aiofiles
+import aiohttp
 import asyncio
+from collections import OrderedDict
 from aiogram import Bot
 from aiogram.filters import Command
 from aiogram.types import Message
 from aiogram.enums import ParseMode
-from pyrogram.enums import ParseMode as SmartParseMode
-from pyrogram.types import Message as SmartMessage
+from pyrogram.types import InputMediaPhoto
 from bot import dp, SmartPyro
-from bot.helpers.utils import new_task, clean_download
+from bot.helpers.utils import new_task
 from bot.helpers.botutils import send_message, delete_messages, get_args
 from bot.helpers.commands import BotCommands
 from bot.helpers.logger import LOGGER
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.defend import SmartDefender
 from config import WEB_SS_KEY
-from urllib.parse import quote
+from urllib.parse import quote, urlsplit, urlunsplit
 
 logger = LOGGER
 MAX_FILE_SIZE = 5 * 1024 * 1024
+CACHE_TTL = 6 * 60 * 60
+MAX_CACHED = 512
+MAX_GROUP_SIZE = 10
 
 def validate_url(url: str) -> bool:
     return '.' in url and len(url) < 2048
 
 def normalize_url(url: str) -> str:
-    return url if url.startswith(('http://', 'https://')) else f"https://{url}"
+    url = url if url.lower().startswith(('http://', 'https://')) else f"https://{url}"
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
 
-async def fetch_screenshot(url: str, bot: Bot) -> bytes:
-    api_url = f"https://api.thumbnail.ws/api/{WEB_SS_KEY}/thumbnail/get?url={quote(url)}&width=1280"
-    timeout = aiohttp.ClientTimeout(total=10)
-    try:
-        async with aiohttp.ClientSession(timeout=timeout) as session:
+class ScreenshotClient:
+    def __init__(self):
+        self.session = None
+        self.cache = OrderedDict()
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        return self.session
+
+    async def close(self):
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    def cached(self, url: str):
+        entry = self.cache.get(url)
+        if entry is None:
+            return None
+        file_id, expires_at = entry
+        if expires_at < time.monotonic():
+            del self.cache[url]
+            return None
+        self.cache.move_to_end(url)
+        return file_id
+
+    def remember(self, url: str, file_id: str):
+        self.cache[url] = (file_id, time.monotonic() + CACHE_TTL)
+        self.cache.move_to_end(url)
+        while len(self.cache) > MAX_CACHED:
+            self.cache.popitem(last=False)
+
+    def forget(self, url: str):
+        self.cache.pop(url, None)
+
+    async def fetch(self, url: str, bot: Bot) -> bytes:
+        api_url = f"https://api.thumbnail.ws/api/{WEB_SS_KEY}/thumbnail/get?url={quote(url)}&width=1280"
+        try:
+            session = await self.get_session()
             async with session.get(api_url) as response:
                 response.raise_for_status()
                 content_type = response.headers.get('Content-Type', '')
@@ -44,27 +81,62 @@ async def fetch_screenshot(url: str, bot: Bot) -> bytes:
                 content_length = int(response.headers.get('Content-Length', 0))
                 if content_length > MAX_FILE_SIZE:
                     raise ValueError(f"Screenshot too large ({content_length / 1024 / 1024:.1f}MB)")
-                return await response.read()
-    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
-        logger.error(f"Failed to fetch screenshot for {url}: {e}")
-        await Smart_Notify(bot, f"{BotCommands}ss", e, None)
-        return None
-
-async def save_screenshot(url: str, timestamp: int, bot: Bot) -> str:
-    screenshot_bytes = await fetch_screenshot(url, bot)
-    if not screenshot_bytes:
-        return None
-    temp_file = f"screenshot_{timestamp}_{hash(url)}.jpg"
-    async with aiofiles.open(temp_file, 'wb') as file:
-        await file.write(screenshot_bytes)
-    file_size = os.path.getsize(temp_file)
-    if file_size > MAX_FILE_SIZE:
-        clean_download(temp_file)
-        return None
-    return temp_file
+                data = await response.read()
+                if len(data) > MAX_FILE_SIZE:
+                    raise ValueError(f"Screenshot too large ({len(data) / 1024 / 1024:.1f}MB)")
+                return data
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"Failed to fetch screenshot for {url}: {e}")
+            await Smart_Notify(bot, f"{BotCommands}ss", e, None)
+            return None
+
+    async def resolve(self, url: str, bot: Bot):
+        return self.cached(url) or await self.fetch(url, bot)
+
+smart_screenshot = ScreenshotClient()
+
+def screenshot_media(media, index: int):
+    if isinstance(media, str):
+        return media
+    photo = io.BytesIO(media)
+    photo.name = f"screenshot_{index}.jpg"
+    return photo
+
+async def send_group(chat_id: int, group: list) -> list:
+    if len(group) == 1:
+        return [await SmartPyro.send_photo(chat_id=chat_id, photo=screenshot_media(group[0][1], 0))]
+    return await SmartPyro.send_media_group(
+        chat_id=chat_id,
+        media=[InputMediaPhoto(screenshot_media(media, index)) for index, (_, media) in enumerate(group)]
+    )
+
+async def send_screenshots(chat_id: int, items: list, bot: Bot) -> int:
+    sent = 0
+    for start in range(0, len(items), MAX_GROUP_SIZE):
+        group = items[start:start + MAX_GROUP_SIZE]
+        try:
+            messages = await send_group(chat_id, group)
+        except Exception as e:
+            stale = [url for url, media in group if isinstance(media, str)]
+            if not stale:
+                raise
+            logger.warning(f"Cached screenshot file_id failed for {', '.join(stale)}: {e}")
+            for url in stale:
+                smart_screenshot.forget(url)
+            refreshed = await asyncio.gather(*(smart_screenshot.fetch(url, bot) for url in stale))
+            replacements = dict(zip(stale, refreshed))
+            group = [(url, replacements.get(url, media)) for url, media in group]
+            group = [(url, media) for url, media in group if media]
+            if not group:
+                continue
+            messages = await send_group(chat_id, group)
+        for (url, _), sent_message in zip(group, messages):
+            if sent_message and sent_message.photo:
+                smart_screenshot.remember(url, sent_message.photo.file_id)
+        sent += len(group)
+    return sent
 
 async def capture_screenshots(message: Message, bot: Bot, urls: list) -> None:
-    user_id = message.from_user.id if message.from_user else None
     if not urls:
         await send_message(
             chat_id=message.chat.id,
@@ -85,22 +157,19 @@ async def capture_screenshots(message: Message, bot: Bot, urls: list) -> None:
         text="<b>Capturing ScreenShots Please Wait</b>",
         parse_mode=ParseMode.HTML
     )
-    timestamp = int(time.time())
-    tasks = [save_screenshot(normalize_url(url), timestamp, bot) for url in urls]
-    temp_files = await asyncio.gather(*tasks, return_exceptions=True)
+    urls = list(dict.fromkeys(normalize_url(url) for url in urls))
+    results = await asyncio.gather(*(smart_screenshot.resolve(url, bot) for url in urls), return_exceptions=True)
+    items = []
+    for url, media in zip(urls, results):
+        if isinstance(media, Exception):
+            logger.error(f"Error processing {url}: {media}")
+            continue
+        if media:
+            items.append((url, media))
     try:
-        for i, temp_file in enumerate(temp_files):
-            if isinstance(temp_file, Exception):
-                logger.error(f"Error processing {urls[i]}: {temp_file}")
-                continue
-            if temp_file:
-                async with aiofiles.open(temp_file, 'rb'):
-                    await SmartPyro.send_photo(
-                        chat_id=message.chat.id,
-                        photo=temp_file,
-                        parse_mode=SmartParseMode.HTML
-                    )
-                clean_download(temp_file)
+        if not items or not await send_screenshots(message.chat.id, items, bot):
+            await processing_msg.edit_text("<b>Sorry Bro SS Capture API Dead</b>", parse_mode=ParseMode.HTML)
+            return
         await delete_messages(message.chat.id, [processing_msg.message_id])
     except Exception as e:
         logger.error(f"Error in capture_screenshots: {e}")
@@ -1,3 +1,5 @@
+import asyncio
+import html
 import json
 from pathlib import Path
 from aiogram import Bot, F
@@ -15,6 +17,13 @@ from bot.helpers.defend import SmartDefender
 
 FONTS_FILE = Path("bot/Assets/fonts.json")
 fonts = []
+font_tables = []
+page_keyboards = []
+BUTTONS_PER_PAGE = 21
+BUTTONS_PER_ROW = 3
+MAX_MESSAGE_LENGTH = 4096
+MAX_PREVIEW_CHUNKS = 8
+PREVIEW_SEND_INTERVAL = 1
 user_original_texts = {}
 user_current_pages = {}
 user_current_fonts = {}
@@ -34,6 +43,7 @@ def load_fonts():
             LOGGER.error(f"❌ Could Not Load Fonts Database - Expected non-empty list, got {type(fonts)}")
             raise ValueError("fonts.json must contain a non-empty list")
 
+        compile_fonts()
         return True
 
     except FileNotFoundError:
@@ -51,73 +61,27 @@ def load_fonts():
         LOGGER.error(f"Error type: {type(e).__name__}")
         return False
 
-load_fonts()
+def build_translation_table(font_data: dict) -> dict:
+    table = {}
+    for key, first, count in (("fontLower", 97, 26), ("fontUpper", 65, 26), ("fontDigits", 48, 10)):
+        chars = font_data.get(key, "")
+        for i in range(min(len(chars), count)):
+            table[first + i] = chars[i]
+    return str.maketrans(table)
 
-def convert_text(text: str, font_data: dict) -> str:
-    lower = font_data.get("fontLower", "")
-    upper = font_data.get("fontUpper", "")
-    digits = font_data.get("fontDigits", "")
-
-    lower_map = {}
-    upper_map = {}
-    digits_map = {}
-
-    if isinstance(lower, list):
-        for i in range(min(len(lower), 26)):
-            lower_map[chr(97 + i)] = lower[i]
-    elif lower:
-        for i in range(min(len(lower), 26)):
-            lower_map[chr(97 + i)] = lower[i]
-
-    if isinstance(upper, list):
-        for i in range(min(len(upper), 26)):
-            upper_map[chr(65 + i)] = upper[i]
-    elif upper:
-        for i in range(min(len(upper), 26)):
-            upper_map[chr(65 + i)] = upper[i]
-
-    if isinstance(digits, list):
-        for i in range(min(len(digits), 10)):
-            digits_map[chr(48 + i)] = digits[i]
-    elif digits:
-        for i in range(min(len(digits), 10)):
-            digits_map[chr(48 + i)] = digits[i]
-
-    result = []
-    for char in text:
-        if char.islower():
-            result.append(lower_map.get(char, char))
-        elif char.isupper():
-            result.append(upper_map.get(char, char))
-        elif char.isdigit():
-            result.append(digits_map.get(char, char))
-        else:
-            result.append(char)
-    return "".join(result)
-
-def get_button_text(font_data: dict) -> str:
-    font_name = font_data["fontName"]
-    return convert_text(font_name, font_data)
-
-def get_keyboard(page: int = 0):
-    buttons_per_page = 21
-    buttons_per_row = 3
-    start = page * buttons_per_page
-    end = start + buttons_per_page
-    current_fonts = fonts[start:end]
-
-    total_pages = (len(fonts) + buttons_per_page - 1) // buttons_per_page
+def build_keyboard(page: int, total_pages: int):
+    start = page * BUTTONS_PER_PAGE
+    end = start + BUTTONS_PER_PAGE
 
     buttons = SmartButtons()
 
-    for font in current_fonts:
-        font_idx = fonts.index(font)
-        btn_text = get_button_text(font)
+    for font_idx in range(start, min(end, len(fonts))):
+        font = fonts[font_idx]
+        btn_text = font["fontName"].translate(font_tables[font_idx])
         if not btn_text.strip():
             btn_text = font["fontName"]
         buttons.button(text=btn_text, callback_data=f"font_{font_idx}")
 
-    has_previous = page > 0
     has_next = end < len(fonts)
 
     if page == 0:
@@ -131,8 +95,62 @@ def get_keyboard(page: int = 0):
         buttons.button(text="Next »", callback_data=f"page_{page+1}", position="footer")
         buttons.button(text="« Previous", callback_data=f"page_{page-1}", position="footer")
         buttons.button(text="Close ❌", callback_data="close_style", position="footer")
+    buttons.button(text="👁 Preview All Fonts", callback_data="style_preview", position="footer")
 
-    return buttons.build_menu(b_cols=buttons_per_row, f_cols=2)
+    return buttons.build_menu(b_cols=BUTTONS_PER_ROW, f_cols=2)
+
+def compile_fonts():
+    global font_tables, page_keyboards
+    font_tables = [build_translation_table(font) for font in fonts]
+    total_pages = (len(fonts) + BUTTONS_PER_PAGE - 1) // BUTTONS_PER_PAGE
+    page_keyboards = [build_keyboard(page, total_pages) for page in range(total_pages)]
+
+load_fonts()
+
+def convert_text(text: str, font_idx: int) -> str:
+    return text.translate(font_tables[font_idx])
+
+def get_keyboard(page: int = 0):
+    return page_keyboards[min(max(page, 0), len(page_keyboards) - 1)]
+
+def utf16_length(text: str) -> int:
+    return len(text.encode("utf-16-le")) // 2
+
+def split_utf16(text: str, limit: int) -> list:
+    if utf16_length(text) <= limit:
+        return [text]
+    pieces = []
+    current = []
+    size = 0
+    for char in text:
+        width = 2 if ord(char) > 0xFFFF else 1
+        if size + width > limit:
+            pieces.append("".join(current))
+            current = []
+            size = 0
+        current.append(char)
+        size += width
+    pieces.append("".join(current))
+    return pieces
+
+def render_all_fonts(text: str) -> list:
+    chunks = []
+    current = ""
+    current_size = 0
+    for font_idx, font in enumerate(fonts):
+        label = f"{font['fontName']}: "
+        for piece in split_utf16(convert_text(text, font_idx), MAX_MESSAGE_LENGTH - utf16_length(label) - 1):
+            line = f"<b>{html.escape(font['fontName'])}:</b> <code>{html.escape(piece)}</code>\n"
+            size = utf16_length(label) + utf16_length(piece) + 1
+            if current and current_size + size > MAX_MESSAGE_LENGTH:
+                chunks.append(current)
+                current = ""
+                current_size = 0
+            current += line
+            current_size += size
+    if current:
+        chunks.append(current)
+    return chunks
 
 @dp.message(Command(commands=["style"], prefix=BotCommands))
 @new_task
@@ -263,7 +281,7 @@ async def process_font_selection(callback: CallbackQuery):
             await callback.answer("❌ Original text not found!", show_alert=True)
             return
 
-        converted = convert_text(original_text, font_data)
+        converted = convert_text(original_text, font_idx)
 
         kb = get_keyboard(current_page)
 
@@ -284,6 +302,42 @@ async def process_font_selection(callback: CallbackQuery):
         LOGGER.error(f"Error editing message: {e}")
         await callback.answer("❌ Sorry Failed to apply style!", show_alert=True)
 
+@dp.callback_query(F.data == "style_preview")
+async def process_preview_all(callback: CallbackQuery):
+    try:
+        user_key = f"{callback.message.chat.id}_{callback.message.message_id}"
+        original_text = user_original_texts.get(user_key)
+
+        if not original_text:
+            await callback.answer("❌ Original text not found!", show_alert=True)
+            return
+
+        chunks = render_all_fonts(original_text)
+        await callback.answer("✨ Sending All Font Styles...", show_alert=False)
+        for index, chunk in enumerate(chunks[:MAX_PREVIEW_CHUNKS]):
+            if index:
+                await asyncio.sleep(PREVIEW_SEND_INTERVAL)
+            await send_message(
+                chat_id=callback.message.chat.id,
+                text=chunk,
+                parse_mode=ParseMode.HTML
+            )
+
+        if len(chunks) > MAX_PREVIEW_CHUNKS:
+            await asyncio.sleep(PREVIEW_SEND_INTERVAL)
+            await send_message(
+                chat_id=callback.message.chat.id,
+                text=f"<b>⚠️ Preview stopped after {MAX_PREVIEW_CHUNKS} messages, use a shorter text to see every font.</b>",
+                parse_mode=ParseMode.HTML
+            )
+        LOGGER.info(f"User {callback.from_user.id} previewed all fonts")
+    except Exception as e:
+        LOGGER.error(f"Error in font preview: {e}")
+        try:
+            await callback.answer("❌ Sorry Failed To Preview Fonts!", show_alert=True)
+        except Exception:
+            pass
+
 @dp.callback_query(F.data == "close_style")
 async def process_close(callback: CallbackQuery):
     user_key = f"{callback.message.chat.id}_{callback.message.message_id}"
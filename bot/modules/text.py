@@ -1,14 +1,13 @@
 #Copyright @ISmartCoder
 #Updates Channel @abirxdhackz
 import os
+import shutil
 import asyncio
-import base64
-import binascii
-import codecs
-import urllib.parse
+import tempfile
+from collections import OrderedDict
 from aiogram import Bot
 from aiogram.filters import Command
-from aiogram.types import Message, CallbackQuery
+from aiogram.types import Message, CallbackQuery, FSInputFile
 from aiogram.enums import ParseMode
 from bot import dp
 from bot.helpers.utils import new_task
@@ -17,34 +16,40 @@ from bot.helpers.buttons import SmartButtons
 from bot.helpers.logger import LOGGER
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.defend import SmartDefender
-from config import COMMAND_PREFIX
+from bot.helpers.codec import transform_text, transform_file
+from config import COMMAND_PREFIX, MAX_TXT_SIZE
+
+DOWNLOADS_DIR = "./downloads"
+MAX_FILE_INPUTS = 512
 
 encoders = {
-    "base32": lambda text: base64.b32encode(text.encode()).decode(),
-    "base64": lambda text: base64.b64encode(text.encode()).decode(),
-    "base85": lambda text: base64.b85encode(text.encode()).decode(),
-    "ascii85": lambda text: base64.a85encode(text.encode()).decode(),
-    "binary": lambda text: ' '.join(format(ord(char), '08b') for char in text),
-    "hexadecimal": lambda text: binascii.hexlify(text.encode()).decode(),
-    "octal": lambda text: ' '.join(format(ord(char), '03o') for char in text),
-    "unicode": lambda text: ' '.join(f'U+{ord(char):04X}' for char in text),
-    "rot13": lambda text: codecs.encode(text, 'rot_13'),
-    "url": lambda text: urllib.parse.quote(text)
+    "base32": "b32en",
+    "base64": "b64en",
+    "base85": "b85en",
+    "ascii85": "a85en",
+    "binary": "binen",
+    "hexadecimal": "hexen",
+    "octal": "octen",
+    "unicode": "unien",
+    "rot13": "rot13",
+    "url": "urlen"
 }
 
 decoders = {
-    "base32": lambda text: base64.b32decode(text).decode(),
-    "base64": lambda text: base64.b64decode(text).decode(),
-    "base85": lambda text: base64.b85decode(text).decode(),
-    "ascii85": lambda text: base64.a85decode(text).decode(),
-    "binary": lambda text: ''.join(chr(int(b, 2)) for b in text.split()),
-    "hexadecimal": lambda text: binascii.unhexlify(text).decode(),
-    "octal": lambda text: ''.join(chr(int(o, 8)) for o in text.split()),
-    "unicode": lambda text: ''.join(chr(int(code.replace('U+', ''), 16)) for code in text.split()),
-    "rot13": lambda text: codecs.decode(text, 'rot_13'),
-    "url": lambda text: urllib.parse.unquote(text)
+    "base32": "b32de",
+    "base64": "b64de",
+    "base85": "b85de",
+    "ascii85": "a85de",
+    "binary": "binde",
+    "hexadecimal": "hexde",
+    "octal": "octde",
+    "unicode": "unide",
+    "rot13": "rot13",
+    "url": "urlde"
 }
 
+file_inputs = OrderedDict()
+
 text_transformers = {
     "uppercase": lambda text: text.upper(),
     "lowercase": lambda text: text.lower(),
@@ -109,6 +114,39 @@ def extract_input_text(message_text: str) -> str | None:
         return None
     return extracted
 
+def remember_file_input(message: Message, document):
+    file_inputs[(message.chat.id, message.message_id)] = document
+    while len(file_inputs) > MAX_FILE_INPUTS:
+        file_inputs.popitem(last=False)
+
+async def process_file_input(callback: CallbackQuery, bot: Bot, document, codec_name: str, label: str):
+    await callback.answer("Processing File...✨")
+    os.makedirs(DOWNLOADS_DIR, exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix=f"{codec_name}_{callback.from_user.id}_", dir=DOWNLOADS_DIR)
+    try:
+        input_path = os.path.join(workdir, "input.txt")
+        output_path = os.path.join(workdir, f"{codec_name}_result.txt")
+        await bot.download(document.file_id, destination=input_path)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, transform_file, codec_name, input_path, output_path)
+        await bot.send_document(
+            chat_id=callback.message.chat.id,
+            document=FSInputFile(path=output_path),
+            caption=f"<b>{label}:</b> <code>{document.file_name or 'input.txt'}</code>",
+            parse_mode=ParseMode.HTML,
+            reply_to_message_id=callback.message.message_id
+        )
+        LOGGER.info(f"Successfully processed file with {codec_name}")
+    except Exception as e:
+        LOGGER.warning(f"File processing failed for {codec_name}: {str(e)}")
+        await send_message(
+            chat_id=callback.message.chat.id,
+            text=f"<b>⚠️ This file is invalid for {label}</b>",
+            parse_mode=ParseMode.HTML
+        )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
 @dp.message(Command(commands=["en"], prefix=COMMAND_PREFIX))
 @new_task
 @SmartDefender
@@ -121,6 +159,23 @@ async def encode_command(message: Message, bot: Bot):
             text="<b>Processing Your Input...✨</b>",
             parse_mode=ParseMode.HTML
         )
+        if message.reply_to_message and message.reply_to_message.document:
+            document = message.reply_to_message.document
+            if document.file_size > MAX_TXT_SIZE:
+                await processing_msg.edit_text(
+                    text=f"<b>❌ File too large! Max size is {MAX_TXT_SIZE // 1024 // 1024}MB</b>",
+                    parse_mode=ParseMode.HTML
+                )
+                LOGGER.warning(f"File too large for /en by user {message.from_user.id}")
+                return
+            remember_file_input(processing_msg, document)
+            await processing_msg.edit_text(
+                text=f"<b>Inputed File:</b>\n\n<code>{document.file_name or 'input.txt'}</code>",
+                parse_mode=ParseMode.HTML,
+                reply_markup=get_encoder_keyboard()
+            )
+            LOGGER.info("File menu sent successfully for /en")
+            return
         text = None
         if message.reply_to_message and message.reply_to_message.text:
             text = message.reply_to_message.text
@@ -141,7 +196,7 @@ async def encode_command(message: Message, bot: Bot):
             parse_mode=ParseMode.HTML,
             reply_markup=get_encoder_keyboard()
         )
-        LOGGER.info(f"Encoder menu sent successfully for /en")
+        LOGGER.info("Encoder menu sent successfully for /en")
     except Exception as e:
         LOGGER.error(f"Error in /en command: {str(e)}", exc_info=True)
         if processing_msg:
@@ -166,6 +221,23 @@ async def decode_command(message: Message, bot: Bot):
             text="<b>Processing Your Input...✨</b>",
             parse_mode=ParseMode.HTML
         )
+        if message.reply_to_message and message.reply_to_message.document:
+            document = message.reply_to_message.document
+            if document.file_size > MAX_TXT_SIZE:
+                await processing_msg.edit_text(
+                    text=f"<b>❌ File too large! Max size is {MAX_TXT_SIZE // 1024 // 1024}MB</b>",
+                    parse_mode=ParseMode.HTML
+                )
+                LOGGER.warning(f"File too large for /de by user {message.from_user.id}")
+                return
+            remember_file_input(processing_msg, document)
+            await processing_msg.edit_text(
+                text=f"<b>Inputed File:</b>\n\n<code>{document.file_name or 'input.txt'}</code>",
+                parse_mode=ParseMode.HTML,
+                reply_markup=get_decoder_keyboard()
+            )
+            LOGGER.info("File menu sent successfully for /de")
+            return
         text = None
         if message.reply_to_message and message.reply_to_message.text:
             text = message.reply_to_message.text
@@ -186,7 +258,7 @@ async def decode_command(message: Message, bot: Bot):
             parse_mode=ParseMode.HTML,
             reply_markup=get_decoder_keyboard()
         )
-        LOGGER.info(f"Decoder menu sent successfully for /de")
+        LOGGER.info("Decoder menu sent successfully for /de")
     except Exception as e:
         LOGGER.error(f"Error in /de command: {str(e)}", exc_info=True)
         if processing_msg:
@@ -231,7 +303,7 @@ async def text_command(message: Message, bot: Bot):
             parse_mode=ParseMode.HTML,
             reply_markup=get_text_keyboard()
         )
-        LOGGER.info(f"Text transformer menu sent successfully for /text")
+        LOGGER.info("Text transformer menu sent successfully for /text")
     except Exception as e:
         LOGGER.error(f"Error in /text command: {str(e)}", exc_info=True)
         if processing_msg:
@@ -250,6 +322,10 @@ async def handle_encoder_callback(callback: CallbackQuery, bot: Bot):
     if method not in encoders:
         await callback.answer("Invalid method ❌", show_alert=True)
         return
+    document = file_inputs.get((callback.message.chat.id, callback.message.message_id))
+    if document:
+        await process_file_input(callback, bot, document, encoders[method], f"Encoded ({method.upper()})")
+        return
     current_text = callback.message.html_text or callback.message.text or ""
     LOGGER.debug(f"Current message HTML text: {current_text[:300]}...")
     if "<b>Inputed Text:</b>" not in current_text:
@@ -263,7 +339,7 @@ async def handle_encoder_callback(callback: CallbackQuery, bot: Bot):
         return
     LOGGER.info(f"Extracted input text ({len(input_text)} chars) for encoding {method}")
     try:
-        result = encoders[method](input_text)
+        result = transform_text(encoders[method], input_text)
         response_text = f"<b>Encoded ({method.upper()}):</b>\n\n<code>{result}</code>"
         await callback.message.edit_text(
             text=response_text,
@@ -288,6 +364,10 @@ async def handle_decoder_callback(callback: CallbackQuery, bot: Bot):
     if method not in decoders:
         await callback.answer("Invalid method ❌", show_alert=True)
         return
+    document = file_inputs.get((callback.message.chat.id, callback.message.message_id))
+    if document:
+        await process_file_input(callback, bot, document, decoders[method], f"Decoded ({method.upper()})")
+        return
     current_text = callback.message.html_text or callback.message.text or ""
     LOGGER.debug(f"Current message HTML text: {current_text[:300]}...")
     if "<b>Inputed Text:</b>" not in current_text:
@@ -301,7 +381,7 @@ async def handle_decoder_callback(callback: CallbackQuery, bot: Bot):
         return
     LOGGER.info(f"Extracted input text ({len(input_text)} chars) for decoding {method}")
     try:
-        result = decoders[method](input_text)
+        result = transform_text(decoders[method], input_text)
         response_text = f"<b>Decoded ({method.upper()}):</b>\n\n<code>{result}</code>"
         await callback.message.edit_text(
             text=response_text,
@@ -362,6 +442,7 @@ async def handle_text_callback(callback: CallbackQuery, bot: Bot):
 async def handle_close_callback(callback: CallbackQuery):
     try:
         LOGGER.info(f"Close menu requested by user {callback.from_user.id}")
+        file_inputs.pop((callback.message.chat.id, callback.message.message_id), None)
         await callback.message.delete()
         await callback.answer("Closed ✅")
         LOGGER.info("Menu closed and message deleted")
@@ -2,19 +2,22 @@ import pytz
 import pycountry
 from datetime import datetime
 import calendar
-from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
+from PIL import Image, ImageDraw
 from aiogram import Bot
 from aiogram.filters import Command
-from aiogram.types import Message, FSInputFile, InputMediaPhoto
+from aiogram.types import Message, InputMediaPhoto
 from aiogram.enums import ParseMode
 from bot import dp
-from bot.helpers.utils import new_task, clean_download
+from bot.helpers.utils import new_task
 from bot.helpers.botutils import send_message, delete_messages, get_args
 from bot.helpers.commands import BotCommands
 from bot.helpers.logger import LOGGER
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.buttons import SmartButtons
 from bot.helpers.defend import SmartDefender
+from bot.helpers.cards import FONT_REGULAR, FONT_BOLD, get_font, encode_card
+from bot.helpers.artifacts import artifact_key, smart_artifacts
 import asyncio
 
 def get_flag(country_code):
@@ -31,57 +34,63 @@ def get_flag(country_code):
         LOGGER.error(f"Error in get_flag: {str(e)}")
         return None, "🏳️"
 
-async def create_clock_image(country_name, time_str, date_str, day_str, output_path):
-    width, height = 1240, 740
-    bg_color = (8, 12, 18)
-    card_color = (19, 26, 34)
-    accent_color = (0, 230, 255)
-    white = (255, 255, 255)
-    gray = (168, 177, 186)
-    font_time = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 110)
-    font_date = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 48)
-    font_day = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 42)
-    font_country = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 48)
-    img = Image.new("RGB", (width, height), bg_color)
+CLOCK_SIZE = (1240, 740)
+CLOCK_ACCENT = (0, 230, 255)
+CLOCK_WHITE = (255, 255, 255)
+CLOCK_GRAY = (168, 177, 186)
+
+@lru_cache(maxsize=1)
+def clock_template():
+    width, height = CLOCK_SIZE
+    img = Image.new("RGB", CLOCK_SIZE, (8, 12, 18))
     draw = ImageDraw.Draw(img)
     margin = 60
     card_rect = [margin, margin, width - margin, height - margin]
-    draw.rounded_rectangle(card_rect, radius=30, fill=card_color, outline=accent_color, width=4)
+    draw.rounded_rectangle(card_rect, radius=30, fill=(19, 26, 34), outline=CLOCK_ACCENT, width=4)
     line_margin = 100
     line_width = width - 2 * (margin + line_margin)
     top_line_y = 180
     bottom_line_y = height - margin - line_margin
-    draw.line([(margin + line_margin, top_line_y), (margin + line_margin + line_width, top_line_y)], fill=accent_color, width=3)
-    draw.line([(margin + line_margin, bottom_line_y), (margin + line_margin + line_width, bottom_line_y)], fill=accent_color, width=3)
+    draw.line([(margin + line_margin, top_line_y), (margin + line_margin + line_width, top_line_y)], fill=CLOCK_ACCENT, width=3)
+    draw.line([(margin + line_margin, bottom_line_y), (margin + line_margin + line_width, bottom_line_y)], fill=CLOCK_ACCENT, width=3)
     dot_radius = 6
     side_dot_x_left = margin + 10
     side_dot_x_right = width - margin - 10
     dot_y_positions = [260, 310, 360]
     for y in dot_y_positions:
-        draw.ellipse((side_dot_x_left - dot_radius, y - dot_radius, side_dot_x_left + dot_radius, y + dot_radius), fill=accent_color)
-        draw.ellipse((side_dot_x_right - dot_radius, y - dot_radius, side_dot_x_right + dot_radius, y + dot_radius), fill=accent_color)
+        draw.ellipse((side_dot_x_left - dot_radius, y - dot_radius, side_dot_x_left + dot_radius, y + dot_radius), fill=CLOCK_ACCENT)
+        draw.ellipse((side_dot_x_right - dot_radius, y - dot_radius, side_dot_x_right + dot_radius, y + dot_radius), fill=CLOCK_ACCENT)
+    return img
+
+def render_clock_image(country_name, time_str, date_str, day_str):
+    width = CLOCK_SIZE[0]
+    font_time = get_font(FONT_BOLD, 110)
+    font_date = get_font(FONT_REGULAR, 48)
+    font_day = get_font(FONT_BOLD, 42)
+    font_country = get_font(FONT_BOLD, 48)
+    img = clock_template().copy()
+    draw = ImageDraw.Draw(img)
     time_bbox = draw.textbbox((0, 0), time_str, font=font_time)
     time_x = (width - (time_bbox[2] - time_bbox[0])) // 2
     time_y = 220
-    draw.text((time_x, time_y), time_str, font=font_time, fill=white)
+    draw.text((time_x, time_y), time_str, font=font_time, fill=CLOCK_WHITE)
     date_bbox = draw.textbbox((0, 0), date_str, font=font_date)
     date_x = (width - (date_bbox[2] - date_bbox[0])) // 2
     date_y = time_y + 120
-    draw.text((date_x, date_y), date_str, font=font_date, fill=gray)
+    draw.text((date_x, date_y), date_str, font=font_date, fill=CLOCK_GRAY)
     day_spacing = 30
     day_bbox = draw.textbbox((0, 0), day_str, font=font_day)
     day_x = (width - (day_bbox[2] - day_bbox[0])) // 2
     day_y = date_y + 55 + day_spacing
-    draw.text((day_x, day_y), day_str, font=font_day, fill=white)
+    draw.text((day_x, day_y), day_str, font=font_day, fill=CLOCK_WHITE)
     country_spacing = 25
     country_bbox = draw.textbbox((0, 0), country_name, font=font_country)
     country_x = (width - (country_bbox[2] - country_bbox[0])) // 2
     country_y = day_y + 55 + country_spacing
-    draw.text((country_x, country_y), country_name, font=font_country, fill=accent_color)
-    img.save(output_path)
-    return output_path
+    draw.text((country_x, country_y), country_name, font=font_country, fill=CLOCK_ACCENT)
+    return encode_card(img)
 
-async def create_calendar_image(country_code):
+async def send_calendar_image(country_code, send):
     try:
         country = pycountry.countries.get(alpha_2=country_code)
         country_name = country.name if country else "Unknown"
@@ -92,19 +101,18 @@ async def create_calendar_image(country_code):
         if time_zones:
             tz = pytz.timezone(time_zones[0])
             now = datetime.now(tz)
-            time_str = now.strftime("%I:%M:%S %p")
+            time_str = now.strftime("%I:%M %p")
             date_str = now.strftime("%d %b, %Y")
             day_str = now.strftime("%A")
         else:
-            time_str = "00:00:00 AM"
+            time_str = "00:00 AM"
             date_str = "Unknown Date"
             day_str = "Unknown Day"
-        output_path = f"calendar_{country_code}.png"
-        await create_clock_image(country_name, time_str, date_str, day_str, output_path)
-        return output_path
+        card_key = artifact_key("clock", country_name, time_str, date_str, day_str)
+        return await smart_artifacts.deliver(card_key, f"calendar_{country_code}.jpg", send, render_clock_image, country_name, time_str, date_str, day_str)
     except Exception as e:
         LOGGER.error(f"Error creating calendar image: {str(e)}")
-        return None
+        raise
 
 async def get_calendar_markup(year, month, country_code):
     cal = calendar.Calendar()
@@ -200,21 +208,15 @@ async def handle_time_command(message: Message, bot: Bot):
         )
         return
     country_input = args[0].lower().strip()
-    temp_files = []
     try:
         header_text, calendar_markup, country_code, year, month = await get_time_and_calendar(country_input)
-        output_path = await create_calendar_image(country_code)
-        if not output_path:
-            raise Exception("Failed to create calendar image")
-        temp_files.append(output_path)
-        await bot.send_photo(
+        await send_calendar_image(country_code, lambda card: bot.send_photo(
             chat_id=chat_id,
-            photo=FSInputFile(output_path),
+            photo=card,
             caption=header_text,
             parse_mode=ParseMode.HTML,
             reply_markup=calendar_markup
-        )
-        clean_download(*temp_files)
+        ))
     except ValueError as e:
         LOGGER.error(f"ValueError in handle_time_command: {str(e)}")
         await send_message(
@@ -222,7 +224,6 @@ async def handle_time_command(message: Message, bot: Bot):
             text="<b>❌ Ensure you provide a valid country code or name.</b>",
             parse_mode=ParseMode.HTML
         )
-        clean_download(*temp_files)
     except Exception as e:
         LOGGER.error(f"Exception in handle_time_command: {str(e)}")
         await Smart_Notify(bot, "/time", e, message)
@@ -231,7 +232,6 @@ async def handle_time_command(message: Message, bot: Bot):
             text="<b>The Country Is Not In My Database</b>",
             parse_mode=ParseMode.HTML
         )
-        clean_download(*temp_files)
 
 @dp.callback_query(lambda c: c.data.startswith('nav_'))
 async def handle_calendar_nav(callback_query):
@@ -239,22 +239,16 @@ async def handle_calendar_nav(callback_query):
         _, country_code, year, month = callback_query.data.split('_')
         year = int(year)
         month = int(month)
-        temp_files = []
         try:
             header_text, calendar_markup, country_code, _, _ = await get_time_and_calendar(country_code, year, month)
-            output_path = await create_calendar_image(country_code)
-            if not output_path:
-                raise Exception("Failed to create calendar image")
-            temp_files.append(output_path)
-            await callback_query.message.edit_media(
+            await send_calendar_image(country_code, lambda card: callback_query.message.edit_media(
                 media=InputMediaPhoto(
-                    media=FSInputFile(output_path),
+                    media=card,
                     caption=header_text,
                     parse_mode=ParseMode.HTML
                 ),
                 reply_markup=calendar_markup
-            )
-            clean_download(*temp_files)
+            ))
             await callback_query.answer()
         except Exception as e:
             LOGGER.error(f"Exception in handle_calendar_nav: {str(e)}")
@@ -264,7 +258,6 @@ async def handle_calendar_nav(callback_query):
                 text="<b>Sorry, failed to update calendar</b>",
                 parse_mode=ParseMode.HTML
             )
-            clean_download(*temp_files)
     except Exception as e:
         LOGGER.error(f"Exception in handle_calendar_nav: {str(e)}")
         await callback_query.answer("Sorry Invalid Button Query", show_alert=True)
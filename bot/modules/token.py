@@ -1,27 +1,36 @@
 # Copyright @ISmartCoder
 #  SmartUtilBot - Telegram Utility Bot for Smart Features Bot 
 #  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack> 
-import os
 import aiohttp
-import asyncio
-from PIL import Image, ImageDraw, ImageFont, ImageEnhance
+from functools import lru_cache
+from PIL import ImageDraw
 from aiogram import Bot
 from aiogram.filters import Command, BaseFilter
-from aiogram.types import Message, CallbackQuery, FSInputFile
+from aiogram.types import Message, CallbackQuery, InputMediaPhoto
 from aiogram.enums import ParseMode
 from bot import dp
-from bot.helpers.utils import new_task, clean_download
+from bot.helpers.utils import new_task
 from bot.helpers.botutils import send_message, delete_messages
 from bot.helpers.commands import BotCommands
 from bot.helpers.buttons import SmartButtons
 from bot.helpers.logger import LOGGER
 from bot.helpers.notify import Smart_Notify
 from bot.helpers.defend import SmartDefender
+from bot.helpers.market import smart_market
+from bot.helpers.cards import FONT_REGULAR, FONT_BOLD, get_font, vertical_gradient, encode_card
+from bot.helpers.artifacts import artifact_key, smart_artifacts
 from config import A360APIBASEURL
 
 BASE_URL = f"{A360APIBASEURL}/binance/price"
 
 async def fetch_crypto_data(token=None):
+    try:
+        snapshot = await smart_market.snapshot()
+        data = snapshot.find(token)
+        if data:
+            return data
+    except Exception as e:
+        LOGGER.error(f"Market snapshot unavailable for {token}: {e}")
     try:
         url = f"{BASE_URL}?token={token}"
         async with aiohttp.ClientSession() as session:
@@ -37,50 +46,42 @@ async def fetch_crypto_data(token=None):
         LOGGER.error(f"Error fetching data for {token}: {e}")
         raise Exception("<b>❌ Data unavailable or invalid token symbol </b>")
 
-async def create_crypto_info_card(
-    symbol: str,
-    change: str,
-    last_price: str,
-    high: str,
-    low: str,
-    volume: str,
-    quote_volume: str,
-    output_path: str = "crypto_card.png"
-):
-    if not output_path.lower().endswith(".png"):
-        output_path += ".png"
-    outer_width, outer_height = 1200, 800
-    inner_width, inner_height = 1160, 760
-    background_color = (20, 20, 30)
+CARD_SIZE = (1200, 800)
+CARD_INNER_WIDTH = 1160
+CARD_TEXT_WHITE = (240, 240, 250)
+CARD_TEXT_NEON = (0, 255, 150)
+CARD_GAP = 35
+
+@lru_cache(maxsize=1)
+def crypto_card_template():
+    outer_width, outer_height = CARD_SIZE
+    inner_width, inner_height = CARD_INNER_WIDTH, 760
     inner_color = (30, 30, 40)
     border_color = (0, 255, 150)
-    text_white = (240, 240, 250)
-    text_neon = (0, 255, 150)
-    gradient_start = (0, 50, 100)
-    gradient_end = (0, 20, 40)
-    gap = 35
-    try:
-        font_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 70)
-        font_text = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 50)
-        font_credit = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 40)
-    except IOError:
-        raise RuntimeError("Fonts not found. Please install DejaVu Sans or update font paths.")
-    img = Image.new("RGB", (outer_width, outer_height), color=background_color)
+    img = vertical_gradient(CARD_SIZE, (0, 50, 100), (0, 20, 40))
     draw = ImageDraw.Draw(img)
-    for y in range(outer_height):
-        r = int(gradient_start[0] + (gradient_end[0] - gradient_start[0]) * y / outer_height)
-        g = int(gradient_start[1] + (gradient_end[1] - gradient_start[1]) * y / outer_height)
-        b = int(gradient_start[2] + (gradient_end[2] - gradient_start[2]) * y / outer_height)
-        draw.line([(0, y), (outer_width, y)], fill=(r, g, b))
     draw.rectangle([(20, 20), (20 + inner_width - 1, 20 + inner_height - 1)], fill=inner_color)
     draw.rectangle([(20, 20), (20 + inner_width - 1, 20 + inner_height - 1)], outline=border_color, width=6)
     draw.rectangle([(22, 22), (22 + inner_width - 5, 22 + inner_height - 5)], outline=(0, 200, 120), width=2)
+    font_credit = get_font(FONT_REGULAR, 40)
+    credit_text = "Powered By @ISmartCoder"
+    bbox_credit = draw.textbbox((0, 0), credit_text, font=font_credit)
+    x_credit = (inner_width - (bbox_credit[2] - bbox_credit[0])) // 2 + 20
+    draw.text((x_credit + 2, outer_height - 80), credit_text, font=font_credit, fill=(0, 200, 120))
+    draw.text((x_credit, outer_height - 82), credit_text, font=font_credit, fill=CARD_TEXT_NEON)
+    return img
+
+def render_crypto_card(symbol, change, last_price, high, low, volume, quote_volume):
+    font_title = get_font(FONT_BOLD, 70)
+    font_text = get_font(FONT_REGULAR, 50)
+    img = crypto_card_template().copy()
+    draw = ImageDraw.Draw(img)
     title_text = f"Price Info for {symbol.split('USDT')[0]}"
     bbox_title = draw.textbbox((0, 0), title_text, font=font_title)
-    x_title = (inner_width - (bbox_title[2] - bbox_title[0])) // 2 + 20
+    x_title = (CARD_INNER_WIDTH - (bbox_title[2] - bbox_title[0])) // 2 + 20
     y = 40
-    draw.text((x_title, y), title_text, font=font_title, fill=text_neon)
-    y += (bbox_title[3] - bbox_title[1]) + gap
+    draw.text((x_title, y), title_text, font=font_title, fill=CARD_TEXT_NEON)
+    y += (bbox_title[3] - bbox_title[1]) + CARD_GAP
     info_lines = [
         f"Symbol: {symbol}",
         f"Change: {change}",
@@ -92,16 +93,25 @@ async def create_crypto_info_card(
     ]
     for line in info_lines:
         bbox = draw.textbbox((0, 0), line, font=font_text)
-        x = (inner_width - (bbox[2] - bbox[0])) // 2 + 20
-        draw.text((x, y), line, font=font_text, fill=text_white)
-        y += (bbox[3] - bbox[1]) + gap
-    credit_text = "Powered By @ISmartCoder"
-    bbox_credit = draw.textbbox((0, 0), credit_text, font=font_credit)
-    x_credit = (inner_width - (bbox_credit[2] - bbox_credit[0])) // 2 + 20
-    draw.text((x_credit + 2, outer_height - 80), credit_text, font=font_credit, fill=(0, 200, 120))
-    draw.text((x_credit, outer_height - 82), credit_text, font=font_credit, fill=text_neon)
-    img.save(output_path, format="PNG")
-    return output_path
+        x = (CARD_INNER_WIDTH - (bbox[2] - bbox[0])) // 2 + 20
+        draw.text((x, y), line, font=font_text, fill=CARD_TEXT_WHITE)
+        y += (bbox[3] - bbox[1]) + CARD_GAP
+    return encode_card(img)
+
+def crypto_card_args(data):
+    return (
+        data['symbol'],
+        f"{data['priceChangePercent']}%",
+        data['lastPrice'],
+        data['highPrice'],
+        data['lowPrice'],
+        data['volume'],
+        data['quoteVolume']
+    )
+
+async def send_crypto_info_card(data, send):
+    args = crypto_card_args(data)
+    return await smart_artifacts.deliver(artifact_key("price", *args), "crypto_card.jpg", send, render_crypto_card, *args)
 
 def format_crypto_info(data):
     result = (
@@ -181,27 +191,17 @@ async def handle_price_command(message: Message, bot: Bot):
         data = await fetch_crypto_data(token)
         formatted_info = format_crypto_info(data)
         response_message = f"📈 <b>Price Info for {token}:</b>\n\n{formatted_info}"
-        image_path = await create_crypto_info_card(
-            symbol=data['symbol'],
-            change=f"{data['priceChangePercent']}%",
-            last_price=data['lastPrice'],
-            high=data['highPrice'],
-            low=data['lowPrice'],
-            volume=data['volume'],
-            quote_volume=data['quoteVolume']
-        )
         buttons = SmartButtons()
         buttons.button(text="📊 Data Insight", url=f"https://www.binance.com/en/trading_insight/glass?id=44&token={token}")
         buttons.button(text="🔄 Refresh", callback_data=f"refresh_{token}")
-        await bot.send_photo(
+        await send_crypto_info_card(data, lambda card: bot.send_photo(
             chat_id=message.chat.id,
-            photo=FSInputFile(path=image_path),
+            photo=card,
             caption=response_message,
             parse_mode=ParseMode.HTML,
             reply_markup=buttons.build_menu(b_cols=2)
-        )
+        ))
         await delete_messages(message.chat.id, [fetching_message.message_id])
-        asyncio.create_task(delete_file_after_delay(image_path))
         LOGGER.info(f"Sent price info with image for {token} to chat {message.chat.id}")
     except Exception as e:
         await delete_messages(message.chat.id, [fetching_message.message_id])
@@ -213,14 +213,6 @@ async def handle_price_command(message: Message, bot: Bot):
         LOGGER.error(f"Error processing /price for {token}: {e}")
         await Smart_Notify(bot, "/price", e, message)
 
-async def delete_file_after_delay(image_path):
-    await asyncio.sleep(600)
-    if os.path.exists(image_path):
-        os.remove(image_path)
-        LOGGER.info(f"Deleted image file {image_path}")
-    clean_download()
-    LOGGER.info("Downloads folder cleaned after delay")
-
 @dp.callback_query(RefreshCallbackFilter())
 @new_task
 @SmartDefender
@@ -234,31 +226,20 @@ async def handle_refresh_callback(callback_query: CallbackQuery, bot: Bot):
             await callback_query.answer("No price changes since last update", show_alert=True)
             LOGGER.info(f"No price changes detected for {token} in chat {callback_query.message.chat.id}")
             return
-        image_path = await create_crypto_info_card(
-            symbol=data['symbol'],
-            change=f"{data['priceChangePercent']}%",
-            last_price=data['lastPrice'],
-            high=data['highPrice'],
-            low=data['lowPrice'],
-            volume=data['volume'],
-            quote_volume=data['quoteVolume']
-        )
         new_formatted_info = format_crypto_info(data)
         response_message = f"📈 <b>Price Info for {token}:</b>\n\n{new_formatted_info}"
         buttons = SmartButtons()
         buttons.button(text="📊 Data Insight", url=f"https://www.binance.com/en/trading_insight/glass?id=44&token={token}")
         buttons.button(text="🔄 Refresh", callback_data=f"refresh_{token}")
-        from aiogram.types import InputMediaPhoto
-        await callback_query.message.edit_media(
+        await send_crypto_info_card(data, lambda card: callback_query.message.edit_media(
             media=InputMediaPhoto(
-                media=FSInputFile(path=image_path),
+                media=card,
                 caption=response_message,
                 parse_mode=ParseMode.HTML
             ),
             reply_markup=buttons.build_menu(b_cols=2)
-        )
+        ))
         await callback_query.answer("Price Updated Successfully!")
-        asyncio.create_task(delete_file_after_delay(image_path))
         LOGGER.info(f"Updated price info with image for {token} in chat {callback_query.message.chat.id}")
     except Exception as e:
         await callback_query.answer("No price changes since last update")
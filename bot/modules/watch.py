@@ -0,0 +1,215 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+from aiogram import Bot
+from aiogram.filters import Command
+from aiogram.types import Message
+from aiogram.enums import ParseMode
+from bot import dp
+from bot.helpers.utils import new_task
+from bot.helpers.botutils import send_message
+from bot.helpers.commands import BotCommands
+from bot.helpers.logger import LOGGER
+from bot.helpers.notify import Smart_Notify
+from bot.helpers.defend import SmartDefender
+from bot.helpers.market import smart_market
+from bot.helpers.watcher import smart_watcher
+
+def parse_number(value):
+    return float(value.replace(",", "").replace("$", ""))
+
+async def resolve_symbol(token):
+    snapshot = await smart_market.snapshot()
+    ticker = snapshot.find(token)
+    if ticker is None:
+        return None, None
+    return ticker['symbol'], snapshot.price(ticker['symbol'])
+
+def format_subscription(position, doc):
+    if doc["kind"] == "watch":
+        return f"{position}. <code>{doc['symbol']}</code> moves ±{doc['percent']:g}% from ${doc['base_price']:,.8g}"
+    sign = ">" if doc["direction"] == "above" else "<"
+    return f"{position}. <code>{doc['symbol']}</code> {sign} ${doc['threshold']:,.8g}"
+
+def sorted_subscriptions(user_id):
+    return sorted(smart_watcher.user_subscriptions(user_id), key=lambda doc: doc["created_at"])
+
+@dp.message(Command(commands=["watch"], prefix=BotCommands))
+@new_task
+@SmartDefender
+async def watch_command(message: Message, bot: Bot):
+    args = message.text.split()
+    if len(args) != 3:
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>Invalid format. Use <code>/watch BTC 5%</code></b>",
+            parse_mode=ParseMode.HTML
+        )
+        return
+    try:
+        percent = parse_number(args[2].rstrip("%"))
+        if not 0 < percent < 100:
+            raise ValueError("Percent out of range")
+    except ValueError:
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>❌ Percent must be between 0 and 100, e.g. <code>/watch BTC 5%</code></b>",
+            parse_mode=ParseMode.HTML
+        )
+        return
+    try:
+        symbol, price = await resolve_symbol(args[1])
+        if symbol is None:
+            await send_message(
+                chat_id=message.chat.id,
+                text="<b>❌ Data unavailable or invalid token symbol </b>",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        await smart_watcher.subscribe({
+            "user_id": message.from_user.id,
+            "chat_id": message.chat.id,
+            "symbol": symbol,
+            "kind": "watch",
+            "percent": percent,
+            "base_price": price
+        })
+        await send_message(
+            chat_id=message.chat.id,
+            text=(
+                f"<b>✅ Watching {symbol}</b>\n"
+                f"<b>You will be notified when it moves ±{percent:g}% from ${price:,.8g}</b>"
+            ),
+            parse_mode=ParseMode.HTML
+        )
+        LOGGER.info(f"User {message.from_user.id} watching {symbol} at ±{percent}%")
+    except ValueError as e:
+        await send_message(chat_id=message.chat.id, text=f"<b>❌ {e}</b>", parse_mode=ParseMode.HTML)
+    except Exception as e:
+        LOGGER.error(f"Error processing /watch for {args[1]}: {e}")
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>❌ Sorry, failed to create the watch.</b>",
+            parse_mode=ParseMode.HTML
+        )
+        await Smart_Notify(bot, "/watch", e, message)
+
+@dp.message(Command(commands=["alert"], prefix=BotCommands))
+@new_task
+@SmartDefender
+async def alert_command(message: Message, bot: Bot):
+    args = message.text.split()
+    if len(args) != 4 or args[2] not in (">", "<"):
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>Invalid format. Use <code>/alert ETH > 4000</code></b>",
+            parse_mode=ParseMode.HTML
+        )
+        return
+    try:
+        threshold = parse_number(args[3])
+        if threshold <= 0:
+            raise ValueError("Threshold must be greater than 0")
+    except ValueError:
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>Invalid format. Use <code>/alert ETH > 4000</code></b>",
+            parse_mode=ParseMode.HTML
+        )
+        return
+    direction = "above" if args[2] == ">" else "below"
+    try:
+        symbol, price = await resolve_symbol(args[1])
+        if symbol is None:
+            await send_message(
+                chat_id=message.chat.id,
+                text="<b>❌ Data unavailable or invalid token symbol </b>",
+                parse_mode=ParseMode.HTML
+            )
+            return
+        await smart_watcher.subscribe({
+            "user_id": message.from_user.id,
+            "chat_id": message.chat.id,
+            "symbol": symbol,
+            "kind": "alert",
+            "direction": direction,
+            "threshold": threshold
+        })
+        await send_message(
+            chat_id=message.chat.id,
+            text=(
+                f"<b>✅ Alert set: {symbol} {args[2]} ${threshold:,.8g}</b>\n"
+                f"<b>Current Price:</b> ${price:,.8g}"
+            ),
+            parse_mode=ParseMode.HTML
+        )
+        LOGGER.info(f"User {message.from_user.id} set alert {symbol} {direction} {threshold}")
+    except ValueError as e:
+        await send_message(chat_id=message.chat.id, text=f"<b>❌ {e}</b>", parse_mode=ParseMode.HTML)
+    except Exception as e:
+        LOGGER.error(f"Error processing /alert for {args[1]}: {e}")
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>❌ Sorry, failed to create the alert.</b>",
+            parse_mode=ParseMode.HTML
+        )
+        await Smart_Notify(bot, "/alert", e, message)
+
+@dp.message(Command(commands=["alerts"], prefix=BotCommands))
+@new_task
+@SmartDefender
+async def alerts_command(message: Message, bot: Bot):
+    subscriptions = sorted_subscriptions(message.from_user.id)
+    if not subscriptions:
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>You have no active watches or alerts.</b>",
+            parse_mode=ParseMode.HTML
+        )
+        return
+    lines = [format_subscription(position, doc) for position, doc in enumerate(subscriptions, start=1)]
+    await send_message(
+        chat_id=message.chat.id,
+        text=(
+            "<b>🔔 Your Price Subscriptions</b>\n"
+            "<b>━━━━━━━━━━━━━━━━</b>\n"
+            + "\n".join(lines) +
+            "\n<b>━━━━━━━━━━━━━━━━</b>\n"
+            "<b>Remove one with <code>/unalert 1</code></b>"
+        ),
+        parse_mode=ParseMode.HTML
+    )
+
+@dp.message(Command(commands=["unalert", "unwatch"], prefix=BotCommands))
+@new_task
+@SmartDefender
+async def unalert_command(message: Message, bot: Bot):
+    args = message.text.split()
+    subscriptions = sorted_subscriptions(message.from_user.id)
+    try:
+        position = int(args[1])
+        if not 1 <= position <= len(subscriptions):
+            raise ValueError("Position out of range")
+    except (IndexError, ValueError):
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>Invalid number. Check <code>/alerts</code> and use <code>/unalert 1</code></b>",
+            parse_mode=ParseMode.HTML
+        )
+        return
+    try:
+        doc = subscriptions[position - 1]
+        await smart_watcher.unsubscribe(message.from_user.id, str(doc["_id"]))
+        await send_message(
+            chat_id=message.chat.id,
+            text=f"<b>✅ Removed subscription for {doc['symbol']}</b>",
+            parse_mode=ParseMode.HTML
+        )
+    except Exception as e:
+        LOGGER.error(f"Error removing subscription for user {message.from_user.id}: {e}")
+        await send_message(
+            chat_id=message.chat.id,
+            text="<b>❌ Sorry, failed to remove the subscription.</b>",
+            parse_mode=ParseMode.HTML
+        )
+        await Smart_Notify(bot, "/unalert", e, message)
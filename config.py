@@ -54,6 +54,9 @@ VIDEO_RESOLUTION = get_env_or_default("VIDEO_RESOLUTION", "1280x720", lambda x:
 IMAGE_UPLOAD_KEY = get_env_or_default("IMAGE_UPLOAD_KEY", "Your_IMAGE_UPLOAD_KEY_Here")
 IPINFO_API_TOKEN = get_env_or_default("IPINFO_API_TOKEN", "Your_IPINFO_API_TOKEN_Here")
 WEB_SS_KEY = get_env_or_default("WEB_SS_KEY", "Your_WEB_SS_KEY_Here")
+LOG_JSON = get_env_or_default("LOG_JSON", False, lambda x: x.strip().lower() in ("1", "true", "yes"))
+LOG_RATE_LIMIT = get_env_or_default("LOG_RATE_LIMIT", 0, int)
+LOG_RATE_WINDOW = get_env_or_default("LOG_RATE_WINDOW", 60, int)
 
 required_vars = {
     "API_ID": API_ID,
@@ -0,0 +1,43 @@
+# Copyright @ISmartCoder
+#  SmartUtilBot - Telegram Utility Bot for Smart Features Bot
+#  Copyright (C) 2024-present Abir Arafat Chawdhury <https://github.com/abirxdhack>
+import random
+import pytest
+from bot.modules import sptxt
+
+def sample_text(seed=7, lines=400):
+    rng = random.Random(seed)
+    text = b"".join(b"x" * rng.randrange(0, 40) + b"\n" for _ in range(lines))
+    return text + b"y" * 150 + b"\n" + b"tail without newline"
+
+def split(tmp_path, data, mode, amount):
+    source = tmp_path / "input.txt"
+    source.write_bytes(data)
+    output_dir = tmp_path / f"{mode}_{amount}"
+    output_dir.mkdir()
+    count, paths = sptxt.split_file(str(source), mode, amount, str(output_dir), "input")
+    assert count == len(paths)
+    parts = [open(path, "rb").read() for path in paths]
+    assert b"".join(parts) == data
+    return parts
+
+@pytest.mark.parametrize("block_size", [7, 16, 64, 1024])
+@pytest.mark.parametrize("amount", [1, 16, 32, 41, 64, 100, 128])
+def test_bytes_parts_never_exceed_limit(tmp_path, monkeypatch, block_size, amount):
+    monkeypatch.setattr(sptxt, "BLOCK_SIZE", block_size)
+    parts = split(tmp_path, sample_text(), "bytes", amount)
+    assert max(len(part) for part in parts) <= amount
+    assert all(part.endswith(b"\n") or len(part) == amount for part in parts[:-1])
+
+@pytest.mark.parametrize("block_size", [7, 64])
+def test_lines_parts_hold_requested_lines(tmp_path, monkeypatch, block_size):
+    monkeypatch.setattr(sptxt, "BLOCK_SIZE", block_size)
+    parts = split(tmp_path, sample_text(), "lines", 25)
+    assert all(part.count(b"\n") == 25 for part in parts[:-1])
+    assert len(parts) == sptxt.estimate_parts(str(tmp_path / "input.txt"), "lines", 25)
+
+def test_parts_mode_splits_on_newlines(tmp_path, monkeypatch):
+    monkeypatch.setattr(sptxt, "BLOCK_SIZE", 64)
+    parts = split(tmp_path, sample_text(), "parts", 4)
+    assert len(parts) <= 4
+    assert all(part.endswith(b"\n") for part in parts[:-1])